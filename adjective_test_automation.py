@@ -2,97 +2,75 @@
 形容词排序测试自动化模块
 专门处理北森性格测试中的形容词排序题目
 """
-import time
 from typing import Dict, List, Optional, Tuple
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 
 from config import Config
 from utils import Utils
+from command_counter import CommandCounter
+from browser_session import BrowserSession
+from page_load import PageLoadProfile
+from page_probe import PageProbe
+from group_answer import GroupAnswer
+from element_cache import ElementCache
+from locator_registry import LocatorRegistry
 from button_handler import ButtonHandler
+from dom_snapshot import DomSnapshot
+from question_waiter import QuestionTransitionWaiter
+from snapshot_recorder import SnapshotRecorder
+from checkpoint import Checkpoint
+from profiler import profiler, profiled
+from wait_engine import waits
 
 class AdjectiveTestAutomation:
     """形容词排序测试自动化类"""
     
+    # 形容词选项选择器（实际有效的选择器）
+    OPTION_SELECTOR = "div[data-cls='tuozhuai-content'] span[class*='I6Yvw']"
+    # 调试时探测的页面结构
+    STRUCTURE_PROBES = {
+        "tuozhuai-content": "[data-cls*='tuozhuai-content'], [class*='tuozhuai-content']",
+        "I6Yvw": "[class*='I6Yvw']",
+    }
+    # 测试完成页面的关键词
+    COMPLETION_KEYWORDS = ["测试完成", "提交", "完成", "结束", "submit"]
+    
     def __init__(self, config_file: str = "answers.json"):
         self.config = Config(config_file)
         self.driver = None
+        self.command_counter = None
         self.button_handler = None
+        self.group_answer = None
+        self.element_cache = None
+        self.transition_waiter = None
         self.adjective_ranking = self.config.get_adjective_ranking()
         self.test_selectors = self.config.get_test_selectors()
         self.wait_time = self.config.get_wait_time()
         self.retry_count = self.config.get_retry_count()
         self.wait_timeout = self.config.get_wait_timeout()
+        # 显式等待模式下预期存在的元素最多等待的秒数（默认取 implicit_wait）
+        settings = self.config.get_settings()
+        self.lookup_timeout = settings.get("lookup_timeout", settings.get("implicit_wait", 5))
+        self.locators = LocatorRegistry.shared(self.config.get_settings().get("locator_stats_file"))
+        self.recorder = SnapshotRecorder.from_settings(self.config.get_settings(), "adjective")
+        self.checkpoint = Checkpoint.from_settings(self.config.get_settings(), "adjective", self.config.get_test_url())
+        self.last_answer = {}  # 最近一道题的形容词和选择结果，写入检查点
+        waits.configure(self.config.get_settings())
+        # 一次脚本调用完成整组选择和确定（settings.batch_answer 设为 false 时逐步点击）
+        self.batch_answer = self.config.get_settings().get("batch_answer", True)
     
     def setup_driver(self):
         """设置浏览器驱动"""
         try:
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.chrome.options import Options
-            from webdriver_manager.chrome import ChromeDriverManager
-            import platform
-            import os
-            
-            chrome_options = Options()
-            
-            # 根据配置设置无头模式
-            if self.config.is_headless():
-                chrome_options.add_argument("--headless")
-            
-            # 添加常用选项
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-            
-            # 检测操作系统并设置正确的ChromeDriver
-            system = platform.system().lower()
-            print(f"检测到操作系统: {system}")
-            
-            try:
-                # 使用工具函数获取ChromeDriver路径
-                driver_path = Utils.get_chromedriver_path()
-                
-                if driver_path and os.path.exists(driver_path):
-                    print(f"ChromeDriver路径: {driver_path}")
-                    service = Service(driver_path)
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                else:
-                    raise FileNotFoundError("无法获取有效的ChromeDriver路径")
-                
-            except Exception as e:
-                print(f"自动下载ChromeDriver失败: {e}")
-                print("尝试清理缓存后重新下载...")
-                
-                # 清理缓存后重试
-                Utils.clear_webdriver_cache()
-                try:
-                    driver_path = Utils.get_chromedriver_path()
-                    if driver_path and os.path.exists(driver_path):
-                        print(f"重新下载ChromeDriver成功: {driver_path}")
-                        service = Service(driver_path)
-                        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                    else:
-                        raise Exception("重新下载失败")
-                except Exception as e2:
-                    print(f"重新下载ChromeDriver失败: {e2}")
-                    print("尝试使用系统PATH中的ChromeDriver...")
-                    
-                    # 最后备用方案：使用系统PATH中的ChromeDriver
-                    service = Service()  # 不指定路径，让Selenium在PATH中查找
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            # 创建浏览器会话（配置了 debugger_address 时连接已打开的浏览器）
+            self.driver = BrowserSession.create(self.config.get_settings())
             
-            # 初始化按钮处理器
-            self.button_handler = ButtonHandler(self.driver, {
-                "button_selectors": self.config.get_button_selectors(),
-                "wait_timeout": self.wait_timeout,
-                "retry_count": self.retry_count
-            })
+            # 初始化依赖浏览器驱动的组件
+            self.attach_driver(self.driver)
             
             print("浏览器驱动设置成功")
             return True
@@ -101,6 +79,40 @@ class AdjectiveTestAutomation:
             print(f"浏览器驱动设置失败: {e}")
             return False
     
+    def attach_driver(self, driver):
+        """使用已创建的浏览器驱动初始化按钮处理器等组件（也可以传入 FakeWebDriver 离线运行）"""
+        self.driver = driver
+        
+        # 统计WebDriver命令往返次数
+        self.command_counter = CommandCounter.install(driver, self.config.get_command_budget())
+        
+        # 初始化按钮处理器
+        self.button_handler = ButtonHandler(driver, {
+            "button_selectors": self.config.get_button_selectors(),
+            "wait_timeout": self.wait_timeout,
+            "lookup_timeout": self.lookup_timeout,
+            "retry_count": self.retry_count,
+            "locator_registry": self.locators
+        })
+        
+        # 初始化题目切换检测器
+        self.transition_waiter = QuestionTransitionWaiter(
+            driver,
+            self.OPTION_SELECTOR,
+            timeout=self.config.get_transition_timeout(),
+            poll_interval=self.config.get_transition_poll_interval()
+        )
+        
+        # 页面结构探测（调试模式下才保存完整页面源码）
+        self.probe = PageProbe.from_settings(driver, self.config.get_settings())
+        
+        # 整组作答
+        self.group_answer = GroupAnswer(driver, self.OPTION_SELECTOR)
+        
+        # 同一道题内复用已定位的元素（题目切换时自动清空）
+        self.element_cache = ElementCache.of(driver)
+    
+    @profiled("navigation")
     def open_test_page(self) -> bool:
         """打开测试页面"""
         try:
@@ -110,10 +122,11 @@ class AdjectiveTestAutomation:
                 return False
             
             print(f"正在打开测试页面: {test_url}")
-            self.driver.get(test_url)
+            page_load = PageLoadProfile.of(self.driver)
+            page_load.get(test_url)
             
-            # 等待页面加载
-            Utils.random_delay(2, 4)
+            # 等待页面加载（lean 配置只等到页面可操作）
+            page_load.settle()
             
             print("测试页面打开成功")
             return True
@@ -131,12 +144,13 @@ class AdjectiveTestAutomation:
         return self.button_handler.navigate_to_test_area()
     
     def find_adjective_elements(self) -> List[WebElement]:
+        """获取当前题目的形容词元素（同一道题内复用已定位的元素）"""
+        return self.element_cache.get("adjective_options", self.locate_adjective_elements)
+    
+    @profiled("locate")
+    def locate_adjective_elements(self) -> List[WebElement]:
         """查找形容词元素"""
         try:
-            # 首先等待页面加载完成
-            print("等待页面加载...")
-            time.sleep(2)
-            
             # 等待形容词容器出现
             print("等待形容词容器...")
             container_selectors = [
@@ -146,48 +160,20 @@ class AdjectiveTestAutomation:
                 # "div[class*='jWOM6']"
             ]
             
-            container = None
-            for container_selector in container_selectors:
-                try:
-                    container = Utils.wait_for_element(self.driver, container_selector, timeout=5)
-                    if container:
-                        print(f"找到容器: {container_selector}")
-                        break
-                except:
-                    continue
-            
-            if not container:
+            container_selector, container = self.locators.find_first(
+                "adjective_container",
+                container_selectors,
+                lambda selector: Utils.wait_for_element(self.driver, selector, timeout=5)
+            )
+            if container:
+                print(f"找到容器: {container_selector}")
+            else:
                 print("未找到形容词容器")
                 return []
             
-            # 等待形容词选项出现
-            print("等待形容词选项...")
-            time.sleep(1)
-            
-            # 调试：检查页面HTML结构
-            print("调试：检查页面HTML结构...")
-            try:
-                page_source = self.driver.page_source
-                if "tuozhuai-content" in page_source:
-                    print("页面包含 'tuozhuai-content'")
-                else:
-                    print("页面不包含 'tuozhuai-content'")
-                
-                if "I6Yvw" in page_source:
-                    print("页面包含 'I6Yvw'")
-                else:
-                    print("页面不包含 'I6Yvw'")
-                
-                if "善解人意的" in page_source:
-                    print("页面包含 '善解人意的'")
-                else:
-                    print("页面不包含 '善解人意的'")
-            except Exception as e:
-                print(f"检查页面结构失败: {e}")
-            
             # 根据实际测试结果优化形容词选择器
             option_selectors = [
-                "div[data-cls='tuozhuai-content'] span[class*='I6Yvw']",  # 实际有效的选择器
+                self.OPTION_SELECTOR,  # 实际有效的选择器
                 # 以下选择器暂时注释，根据测试结果它们无效
                 # "div[class*='eMsyU'] span[class*='I6Yvw']",               # 根据截图的容器class
                 # "span[class*='I6Yvw']",                                   # 根据截图的span class
@@ -196,25 +182,39 @@ class AdjectiveTestAutomation:
                 # "div[class*='qupWj'] span[class*='I6Yvw']",               # 根据截图的选项结构
             ]
             
-            for selector in option_selectors:
-                try:
-                    items = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    print(f"选择器 {selector} 找到 {len(items)} 个元素")
-                    
-                    if items:
-                        print(f"找到 {len(items)} 个形容词项")
-                        return items
-                except Exception as e:
-                    print(f"选择器 {selector} 查找失败: {e}")
-                    continue
+            def find_options(selector: str) -> List[WebElement]:
+                # 选项是预期存在的元素，显式等待模式下最多等待 lookup_timeout 秒
+                items = Utils.find_elements(self.driver, selector, timeout=self.lookup_timeout)
+                print(f"选择器 {selector} 找到 {len(items)} 个元素")
+                return items
+            
+            _, items = self.locators.find_first("adjective_option", option_selectors, find_options)
+            if items:
+                print(f"找到 {len(items)} 个形容词项")
+                return items
             
             print("未找到形容词元素")
+            self.report_page_structure("adjective_elements")
             return []
             
         except Exception as e:
             print(f"查找形容词元素失败: {e}")
             return []
     
+    def report_page_structure(self, label: str):
+        """调试：检查页面结构（一次小脚本调用），调试模式下保存完整页面源码"""
+        print("调试：检查页面结构...")
+        self.probe.report(self.STRUCTURE_PROBES, self.adjective_ranking[:1])
+        self.probe.dump(label)
+    
+    def adjective_question_present(self) -> bool:
+        """检查是否已出现形容词题目：只探测选项是否存在，找到即返回，最长等待 lookup 上限"""
+        return bool(waits.until(
+            "lookup",
+            lambda: self.probe.probe({"options": self.OPTION_SELECTOR}).get("options")
+        ))
+    
+    @profiled("extract")
     def extract_adjective_text(self, element: WebElement) -> str:
         """提取形容词文本"""
         try:
@@ -255,6 +255,11 @@ class AdjectiveTestAutomation:
             return ""
     
     def find_most_least_buttons(self) -> Tuple[Optional[WebElement], Optional[WebElement]]:
+        """获取最符合和最不符合选框（同一道题内复用已定位的元素）"""
+        return self.element_cache.get("most_least_buttons", self.locate_most_least_buttons)
+    
+    @profiled("locate")
+    def locate_most_least_buttons(self) -> Tuple[Optional[WebElement], Optional[WebElement]]:
         """查找最符合和最不符合选框"""
         try:
             # 根据截图，查找包含"最符合"和"最不符合"文本的选框
@@ -285,7 +290,7 @@ class AdjectiveTestAutomation:
                     if ":contains" in selector:
                         # 使用XPath查找包含文本的元素
                         xpath = f"//div[contains(text(), '最符合')]"
-                        elements = self.driver.find_elements(By.XPATH, xpath)
+                        elements = Utils.find_elements(self.driver, xpath, timeout=self.lookup_timeout, by=By.XPATH)
                         if elements:
                             most_button = elements[0]
                             print(f"找到最符合选框: {xpath}")
@@ -304,7 +309,7 @@ class AdjectiveTestAutomation:
                     if ":contains" in selector:
                         # 使用XPath查找包含文本的元素
                         xpath = f"//div[contains(text(), '最不符合')]"
-                        elements = self.driver.find_elements(By.XPATH, xpath)
+                        elements = Utils.find_elements(self.driver, xpath, timeout=self.lookup_timeout, by=By.XPATH)
                         if elements:
                             least_button = elements[0]
                             print(f"找到最不符合选框: {xpath}")
@@ -323,15 +328,17 @@ class AdjectiveTestAutomation:
             print(f"查找最符合/最不符合选框失败: {e}")
             return None, None
     
-    def select_adjective(self, adjective: str, elements: List[WebElement], is_most: bool) -> bool:
-        """选择形容词"""
+    @profiled("click")
+    def select_adjective(self, adjective: str, elements: List[WebElement], is_most: bool,
+                         texts: Optional[List[str]] = None) -> bool:
+        """选择形容词（texts 为快照中已提取的文本，提供时不再逐个读取元素文本）"""
         try:
             print(f"正在选择{'最符合' if is_most else '最不符合'}的形容词: {adjective}")
             
             # 查找匹配的形容词元素
             target_element = None
-            for element in elements:
-                text = self.extract_adjective_text(element)
+            for i, element in enumerate(elements):
+                text = texts[i] if texts else self.extract_adjective_text(element)
                 if adjective in text or text in adjective:
                     target_element = element
                     break
@@ -346,74 +353,120 @@ class AdjectiveTestAutomation:
                 print(f"点击形容词失败: {adjective}")
                 return False
             
-            Utils.random_delay(0.5, 1.0)
-            
-            # 查找并点击最符合/最不符合按钮
-            most_button, least_button = self.find_most_least_buttons()
-            target_button = most_button if is_most else least_button
-            
-            if target_button:
-                success = Utils.safe_click(self.driver, target_button, self.retry_count)
-                if success:
-                    print(f"成功选择{adjective}为{'最符合' if is_most else '最不符合'}")
-                    Utils.random_delay(1, 2)
-                    return True
-                else:
-                    print(f"点击{'最符合' if is_most else '最不符合'}按钮失败")
-                    return False
-            else:
+            waits.pause("between_selections")
+            
+            # 查找并点击最符合/最不符合按钮（缓存的选框失效时重新定位）
+            def click_box(buttons: Tuple[Optional[WebElement], Optional[WebElement]]) -> Optional[bool]:
+                target_button = buttons[0] if is_most else buttons[1]
+                if not target_button:
+                    return None
+                return Utils.safe_click(self.driver, target_button, self.retry_count, raise_stale=True)
+            
+            success = self.element_cache.use("most_least_buttons", self.locate_most_least_buttons, click_box)
+            if success:
+                print(f"成功选择{adjective}为{'最符合' if is_most else '最不符合'}")
+                # 等待选框内出现该形容词，最多等待 settings.wait_time 秒
+                box_index = 0 if is_most else 1
+                waits.until("after_selection", lambda: Utils.has_text(self.find_most_least_buttons()[box_index], adjective))
+                return True
+            elif success is None:
                 print(f"未找到{'最符合' if is_most else '最不符合'}按钮")
                 return False
+            else:
+                print(f"点击{'最符合' if is_most else '最不符合'}按钮失败")
+                return False
                 
         except Exception as e:
             print(f"选择形容词失败: {e}")
             return False
     
-    def answer_adjective_question(self, question_num: int) -> bool:
-        """回答一道形容词题目"""
+    def plan_adjective_answer(self, question_num: int) -> Optional[Tuple[List[str], Tuple[str, WebElement], Tuple[str, WebElement]]]:
+        """定位当前题目的形容词并确定最符合/最不符合，返回 (页面形容词, 最符合, 最不符合)，失败返回 None"""
         try:
-            print(f"\n开始回答第 {question_num} 题...")
-            
             # 查找形容词元素
             elements = self.find_adjective_elements()
             if not elements:
                 print(f"未找到第 {question_num} 题的形容词元素")
-                return False
+                return None
             
-            # 提取页面上的形容词
-            page_adjectives = []
-            for i, elem in enumerate(elements):
-                text = self.extract_adjective_text(elem)
-                print(f"元素 {i}: 文本='{text}'")
-                if text:
-                    page_adjectives.append((text, elem))
-                else:
-                    print(f"元素 {i} 文本为空，跳过")
+            # 一次脚本调用提取页面上的形容词（缓存的元素失效时重新定位）
+            snapshot = self.element_cache.use(
+                "adjective_options",
+                self.locate_adjective_elements,
+                lambda items: DomSnapshot.snapshot_options(self.driver, elements=items),
+                accept=bool
+            )
+            page_adjectives = DomSnapshot.text_pairs(snapshot)
             
             print(f"提取到的形容词: {[adj[0] for adj in page_adjectives]}")
             
             if len(page_adjectives) < 3:
                 print(f"第 {question_num} 题找到的形容词数量不足: {len(page_adjectives)}")
-                return False
+                return None
             
             print(f"页面形容词: {[adj[0] for adj in page_adjectives]}")
             
-            # 根据统一排序选择最符合和最不符合的形容词
-            most_suitable, least_suitable = self.select_most_and_least_suitable(page_adjectives)
+            # 根据统一排序选择最符合和最不符合的形容词（恢复时检查点中已有的题目直接使用记录的选择）
+            answered = self.checkpoint.find("options", [adj[0] for adj in page_adjectives]) if self.checkpoint.resuming else None
+            if answered:
+                by_text = dict(page_adjectives)
+                most_suitable = (answered["most"], by_text[answered["most"]])
+                least_suitable = (answered["least"], by_text[answered["least"]])
+                print("使用检查点中的选择")
+            else:
+                most_suitable, least_suitable = self.select_most_and_least_suitable(page_adjectives)
             
             if not most_suitable or not least_suitable:
                 print(f"第 {question_num} 题无法确定最符合/最不符合的形容词")
-                return False
+                return None
             
             print(f"最符合: {most_suitable[0]}, 最不符合: {least_suitable[0]}")
             
+            return [adj[0] for adj in page_adjectives], most_suitable, least_suitable
+            
+        except Exception as e:
+            print(f"分析第 {question_num} 题失败: {e}")
+            return None
+    
+    @profiled("answer")
+    def answer_adjective_question(self, question_num: int) -> bool:
+        """回答一道形容词题目"""
+        try:
+            print(f"\n开始回答第 {question_num} 题...")
+            
+            # 定位形容词并确定最符合/最不符合
+            plan = self.plan_adjective_answer(question_num)
+            if not plan:
+                # 保留失败时的页面，便于离线复现
+                self.recorder.record(self.driver, question_num, {"failed": True})
+                return False
+            page_texts, most_suitable, least_suitable = plan
+            
+            # 录制页面快照和选择结果（未启用时不做任何事）
+            self.last_answer = {"options": page_texts, "most": most_suitable[0], "least": least_suitable[0]}
+            self.recorder.record(self.driver, question_num, self.last_answer)
+            
+            # 一次调用完成 形容词 → 选框 → 形容词 → 选框 → 确定，并在同一次调用中检查结果
+            result = {}
+            if self.batch_answer:
+                result = self.group_answer.answer(most_suitable, least_suitable)
+                if result.get("confirmed"):
+                    print(f"第 {question_num} 题回答完成（整组作答）")
+                    return True
+                print("整组作答未通过检查，对未完成的步骤逐步点击")
+                # 脚本已定位到的选框和确定按钮放入缓存，逐步点击时不再重新查找
+                self.element_cache.put("most_least_buttons", (result.get("most_box"), result.get("least_box")))
+                self.element_cache.put("confirm_button", result.get("confirm"))
+            
             # 选择最符合的形容词
-            if not self.select_adjective(most_suitable[0], [most_suitable[1]], is_most=True):
+            if not result.get("most_placed") and not self.select_adjective(
+                    most_suitable[0], [most_suitable[1]], is_most=True, texts=[most_suitable[0]]):
                 print(f"选择最符合形容词失败: {most_suitable[0]}")
                 return False
             
             # 选择最不符合的形容词
-            if not self.select_adjective(least_suitable[0], [least_suitable[1]], is_most=False):
+            if not result.get("least_placed") and not self.select_adjective(
+                    least_suitable[0], [least_suitable[1]], is_most=False, texts=[least_suitable[0]]):
                 print(f"选择最不符合形容词失败: {least_suitable[0]}")
                 return False
             
@@ -422,10 +475,6 @@ class AdjectiveTestAutomation:
                 print("点击确定按钮失败")
                 return False
             
-            # 等待页面响应确定按钮点击
-            print("等待页面响应...")
-            Utils.random_delay(2, 3)
-            
             print(f"第 {question_num} 题回答完成")
             return True
             
@@ -433,14 +482,16 @@ class AdjectiveTestAutomation:
             print(f"回答第 {question_num} 题失败: {e}")
             return False
     
+    @profiled("match")
     def select_most_and_least_suitable(self, page_adjectives: List[Tuple[str, WebElement]]) -> Tuple[Optional[Tuple[str, WebElement]], Optional[Tuple[str, WebElement]]]:
         """根据统一排序选择最符合和最不符合的形容词"""
         try:
-            # 计算每个形容词的优先级
-            adjective_priorities = []
-            for text, element in page_adjectives:
-                priority = self.config.get_adjective_priority(text)
-                adjective_priorities.append((text, element, priority))
+            # 一次批量计算整组形容词的优先级
+            priorities = self.config.get_adjective_priorities([text for text, _ in page_adjectives])
+            adjective_priorities = [
+                (text, element, priority)
+                for (text, element), priority in zip(page_adjectives, priorities)
+            ]
             
             # 按优先级排序（数字越小优先级越高）
             adjective_priorities.sort(key=lambda x: x[2])
@@ -459,19 +510,17 @@ class AdjectiveTestAutomation:
             print(f"选择最符合/最不符合形容词失败: {e}")
             return None, None
     
+    @profiled("navigation")
     def click_next_question(self) -> bool:
         """点击下一题按钮"""
         try:
             print("正在寻找下一题按钮...")
             
-            # 首先检查页面状态，看是否已经完成所有题目
-            try:
-                page_source = self.driver.page_source
-                if any(keyword in page_source for keyword in ["测试完成", "提交", "完成", "结束", "submit"]):
-                    print("检测到测试完成标识，无需点击下一题按钮")
-                    return False
-            except:
-                pass
+            # 首先检查页面状态，看是否已经完成所有题目（只探测关键词，不读取整个页面源码）
+            if self.probe.any_text(self.COMPLETION_KEYWORDS):
+                print("检测到测试完成标识，无需点击下一题按钮")
+                self.probe.dump("completion")
+                return False
             
             next_selector = self.test_selectors.get("next_question", ".next-question, .continue, .next")
             print(f"使用选择器: {next_selector}")
@@ -482,7 +531,7 @@ class AdjectiveTestAutomation:
                 success = Utils.safe_click(self.driver, next_button, self.retry_count)
                 if success:
                     print("成功点击下一题按钮")
-                    Utils.random_delay(2, 3)
+                    waits.until("after_next", lambda: Utils.is_gone(next_button))
                     return True
             else:
                 print("未找到专门的下一题按钮")
@@ -502,6 +551,7 @@ class AdjectiveTestAutomation:
             print(f"点击下一题按钮失败: {e}")
             return False
     
+    @profiled("navigation")
     def submit_test(self) -> bool:
         """提交测试"""
         try:
@@ -517,7 +567,7 @@ class AdjectiveTestAutomation:
                         print("点击提交按钮")
                         success = Utils.safe_click(self.driver, submit_button, self.retry_count)
                         if success:
-                            Utils.random_delay(3, 5)
+                            waits.pause("after_submit")
                             return True
                 except Exception:
                     continue
@@ -529,11 +579,24 @@ class AdjectiveTestAutomation:
             print(f"提交测试失败: {e}")
             return False
     
+    @profiled("click")
     def click_confirm_button(self) -> bool:
-        """点击确定按钮"""
+        """点击确定按钮（同一道题内复用已定位的按钮，失效时重新定位）"""
         try:
             print("正在点击确定按钮...")
-            
+            return self.element_cache.use(
+                "confirm_button",
+                self.locate_confirm_button,
+                lambda button: bool(button) and self._click_confirm(button)
+            )
+        except Exception as e:
+            print(f"点击确定按钮失败: {e}")
+            return False
+    
+    @profiled("locate")
+    def locate_confirm_button(self) -> Optional[WebElement]:
+        """查找确定按钮"""
+        try:
             # 根据截图，确定按钮的选择器
             confirm_selectors = [
                 "div.phoenix-button.content",  # 根据截图的class
@@ -547,7 +610,7 @@ class AdjectiveTestAutomation:
                     if ":contains" in selector:
                         # 使用XPath查找包含文本的元素
                         xpath = f"//div[contains(text(), '确定')]"
-                        elements = self.driver.find_elements(By.XPATH, xpath)
+                        elements = Utils.find_elements(self.driver, xpath, timeout=self.lookup_timeout, by=By.XPATH)
                         if elements:
                             confirm_button = elements[0]
                             print(f"找到确定按钮: {xpath}")
@@ -561,46 +624,54 @@ class AdjectiveTestAutomation:
                     continue
             else:
                 print("未找到确定按钮")
-                return False
+                return None
             
-            # 点击确定按钮
-            try:
-                confirm_button.click()
-                print("成功点击确定按钮")
-                time.sleep(2)  # 等待页面跳转
-                return True
-            except Exception as e:
-                print(f"点击确定按钮失败: {e}")
-                # 尝试JavaScript点击
-                try:
-                    self.driver.execute_script("arguments[0].click();", confirm_button)
-                    print("使用JavaScript成功点击确定按钮")
-                    time.sleep(2)
-                    return True
-                except Exception as e2:
-                    print(f"JavaScript点击确定按钮也失败: {e2}")
-                    return False
+            return confirm_button
             
+        except Exception as e:
+            print(f"查找确定按钮失败: {e}")
+            return None
+    
+    def _click_confirm(self, confirm_button: WebElement) -> bool:
+        """点击确定按钮，失败时改用JavaScript点击；按钮失效时抛出异常，由元素缓存重新定位"""
+        try:
+            confirm_button.click()
+            print("成功点击确定按钮")
+            return True
+        except StaleElementReferenceException:
+            raise
         except Exception as e:
             print(f"点击确定按钮失败: {e}")
-            return False
+            # 尝试JavaScript点击
+            try:
+                self.driver.execute_script("arguments[0].click();", confirm_button)
+                print("使用JavaScript成功点击确定按钮")
+                return True
+            except Exception as e2:
+                print(f"JavaScript点击确定按钮也失败: {e2}")
+                return False
 
     def run_automation(self) -> bool:
         """运行自动化测试"""
         try:
             print("开始北森形容词排序测试自动化...")
             
+            # 根据配置启用性能分析
+            profiler.configure(self.config.get_settings())
+            
             # 设置浏览器驱动
             if not self.setup_driver():
                 return False
             
-            # 打开测试页面
-            if not self.open_test_page():
-                return False
-            
-            # 导航到答题区域
-            if not self.navigate_to_test_area():
-                print("导航到答题区域失败，尝试继续...")
+            # 恢复模式下已经停在题目页时不再打开链接和导航
+            if not self.checkpoint.resume_here(self.button_handler.page_classifier):
+                # 打开测试页面
+                if not self.open_test_page():
+                    return False
+                
+                # 导航到答题区域
+                if not self.navigate_to_test_area():
+                    print("导航到答题区域失败，尝试继续...")
             
             # 检查形容词排序配置
             if not self.adjective_ranking:
@@ -609,14 +680,20 @@ class AdjectiveTestAutomation:
             
             print("开始答题，程序将根据排序自动选择最符合和最不符合的形容词...")
             
-            # 开始答题
-            question_num = 1
+            # 开始答题（恢复时从检查点的下一题继续编号）
+            question_num = self.checkpoint.last_number + 1
             max_questions = 50  # 设置一个合理的最大题目数
             failed_questions = []
             
             while question_num <= max_questions:
                 print(f"\n{'='*60}")
                 print(f"当前进度: 第 {question_num} 题")
+                profiler.begin_question(question_num)
+                self.command_counter.begin_question(question_num)
+                
+                # 记录答题前的题目指纹，用于检测题目切换
+                previous_fingerprint = self.transition_waiter.fingerprint()
+                self.element_cache.begin_question(previous_fingerprint)
                 
                 # 回答题目
                 success = self.answer_adjective_question(question_num)
@@ -627,17 +704,18 @@ class AdjectiveTestAutomation:
                         print("连续失败多次，可能已完成所有题目")
                         break
                 
-                # 题目回答成功后，等待页面跳转并检查是否已进入下一题
+                # 题目回答成功后，等待页面跳转并检查是否已进入下一题（指纹变化即返回）
                 print("等待页面跳转...")
-                Utils.random_delay(3, 5)  # 给页面时间跳转
+                next_fingerprint = self.transition_waiter.wait_for_change(previous_fingerprint)
+                if success:
+                    self.checkpoint.record(question_num, previous_fingerprint, self.last_answer, next_fingerprint)
                 
                 # 检查是否还有下一题（通过尝试查找形容词元素）
                 question_num += 1
                 print(f"检查是否已进入第 {question_num} 题...")
                 
-                # 尝试查找下一题的形容词元素
-                next_elements = self.find_adjective_elements()
-                if next_elements:
+                # 只探测下一题的选项是否出现，完整查找留给下一轮答题
+                if self.adjective_question_present():
                     print(f"成功检测到第 {question_num} 题，继续答题")
                     continue
                 else:
@@ -645,10 +723,9 @@ class AdjectiveTestAutomation:
                     print("未检测到新题目，尝试点击下一题按钮...")
                     if self.click_next_question():
                         print("成功点击下一题按钮，等待新题目加载...")
-                        Utils.random_delay(3, 5)
+                        self.transition_waiter.wait_for_change(previous_fingerprint)
                         # 再次检查是否有新题目
-                        next_elements = self.find_adjective_elements()
-                        if next_elements:
+                        if self.adjective_question_present():
                             print(f"成功进入第 {question_num} 题")
                             continue
                     
@@ -661,6 +738,7 @@ class AdjectiveTestAutomation:
             print(f"\n{'='*60}")
             print("所有题目回答完成，正在提交...")
             self.submit_test()
+            self.checkpoint.finish()
             
             # 显示结果
             print(f"\n{'='*60}")
@@ -677,11 +755,19 @@ class AdjectiveTestAutomation:
             return False
         
         finally:
+            # 导出性能 trace 并打印汇总（未启用时不做任何事）
+            profiler.finish()
+            if self.command_counter:
+                self.command_counter.print_report()
+            if self.group_answer:
+                self.group_answer.print_report()
+            if self.element_cache:
+                self.element_cache.print_report()
+            
             if self.driver:
-                print("关闭浏览器...")
-                self.driver.quit()
+                PageLoadProfile.of(self.driver).print_report()
+            BrowserSession.release(self.driver)
     
     def close(self):
         """关闭浏览器"""
-        if self.driver:
-            self.driver.quit()
+        BrowserSession.release(self.driver)
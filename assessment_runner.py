@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+混合测评自动化程序
+同时加载形容词和单选题配置，只启动一个浏览器、只导航一次；
+每道题先识别页面上的题型（形容词拖选 / 单选量表），再交给对应的答题引擎
+"""
+import argparse
+import json
+import os
+from typing import Any, Dict, Optional
+
+from colorama import init, Fore
+
+import page_state
+from adjective_test_automation import AdjectiveTestAutomation
+from browser_session import BrowserSession
+from button_handler import ButtonHandler
+from checkpoint import Checkpoint
+from command_counter import CommandCounter
+from element_cache import ElementCache
+from page_load import PageLoadProfile
+from page_state import PageStateClassifier
+from profiler import profiler
+from question_waiter import QuestionTransitionWaiter
+from single_choice_main import SingleChoiceAutomation
+from wait_engine import waits
+
+# 初始化colorama
+init(autoreset=True)
+
+
+class AssessmentRunner:
+    """混合测评自动化类"""
+
+    # 两种题型的选项，任一种出现即可计算题目指纹
+    OPTION_SELECTOR = f"{AdjectiveTestAutomation.OPTION_SELECTOR}, {SingleChoiceAutomation.OPTION_SELECTOR}"
+
+    def __init__(self, adjective_config: str = "answers.json",
+                 single_choice_config: str = "single_choice_answers.json", driver=None, resume: bool = False,
+                 checkpoint_file: Optional[str] = None):
+        """加载两份配置，传入 driver 时不再启动浏览器；传入 checkpoint_file 时记录检查点，resume 为 True 时从检查点继续答题"""
+        self.adjective_config = adjective_config
+        self.single_choice_config = single_choice_config
+        self.settings = self.load_settings()
+        if checkpoint_file:
+            self.settings["checkpoint_file"] = checkpoint_file
+        if resume:
+            self.settings["resume"] = True
+        self.checkpoint = Checkpoint.from_settings(self.settings, "assessment", self.test_url())
+        self.driver = driver
+        self.adjective: Optional[AdjectiveTestAutomation] = None
+        self.single_choice: Optional[SingleChoiceAutomation] = None
+        self.button_handler = None
+        self.page_classifier = None
+        self.transition_waiter = None
+        self.command_counter = None
+        self.answered = {page_state.ADJECTIVE: 0, page_state.SINGLE_CHOICE: 0}  # 各题型已回答的题数
+        for question in self.checkpoint.questions:
+            if question.get("type") in self.answered:
+                self.answered[question["type"]] += 1
+        self.failed_questions = []
+
+    def _read_json(self, path: str) -> Dict[str, Any]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"{Fore.RED}读取配置文件失败: {path} ({e})")
+            return {}
+
+    def load_settings(self) -> Dict[str, Any]:
+        """合并两份配置的 settings（单选题配置优先），用于启动浏览器和全局等待"""
+        settings = {}
+        for path in (self.adjective_config, self.single_choice_config):
+            if os.path.exists(path):
+                settings.update(self._read_json(path).get("settings", {}))
+        return settings
+
+    def test_url(self) -> str:
+        """测试链接：取第一份配置了 test_url 的配置"""
+        for path in (self.adjective_config, self.single_choice_config):
+            if os.path.exists(path):
+                url = self._read_json(path).get("test_url")
+                if url:
+                    return url
+        return ""
+
+    def setup(self) -> bool:
+        """启动（或复用）浏览器，并把两个答题引擎挂到同一个浏览器上"""
+        try:
+            if self.driver is None:
+                self.driver = BrowserSession.create(
+                    self.settings,
+                    page_load_timeout=self.settings.get("page_load_timeout", 30),
+                    implicit_wait=self.settings.get("implicit_wait", 5)
+                )
+
+            # 同一个浏览器只统计一次WebDriver命令，两个引擎共用
+            self.command_counter = CommandCounter.install(self.driver, self.settings.get("command_budget"))
+
+            if os.path.exists(self.adjective_config):
+                self.adjective = AdjectiveTestAutomation(self.adjective_config)
+                self.adjective.attach_driver(self.driver)
+                print(f"{Fore.GREEN}已加载形容词配置: {self.adjective_config}")
+            if os.path.exists(self.single_choice_config):
+                self.single_choice = SingleChoiceAutomation(self.single_choice_config, driver=self.driver)
+                # 网络数据中混有形容词组等其他带选项的内容，按顺序取题会错位，只按题目内容匹配
+                if self.single_choice.question_source:
+                    self.single_choice.question_source.positional = False
+                print(f"{Fore.GREEN}已加载单选题配置: {self.single_choice_config}")
+            if not self.adjective and not self.single_choice:
+                print(f"{Fore.RED}形容词和单选题配置文件都不存在")
+                return False
+
+            # 两个引擎共用混合测评的检查点，恢复时按题目查找已记录的答案
+            for engine in (self.adjective, self.single_choice):
+                if engine:
+                    engine.checkpoint = self.checkpoint
+
+            # 两个引擎各自配置过全局等待，这里按合并后的 settings 统一配置
+            waits.configure(self.settings)
+
+            self.button_handler = ButtonHandler(self.driver, {
+                "lookup_timeout": self.settings.get("lookup_timeout", self.settings.get("implicit_wait", 5))
+            })
+            self.page_classifier = PageStateClassifier(self.driver)
+            self.transition_waiter = QuestionTransitionWaiter(
+                self.driver,
+                self.OPTION_SELECTOR,
+                timeout=self.settings.get("transition_timeout", 10),
+                poll_interval=self.settings.get("transition_poll_interval")
+            )
+            return True
+
+        except Exception as e:
+            print(f"{Fore.RED}浏览器驱动初始化失败: {e}")
+            return False
+
+    def open_test_page(self) -> bool:
+        """打开测试页面"""
+        test_url = self.test_url()
+        if not test_url:
+            print("测试链接未配置，请在配置文件中设置 test_url")
+            return False
+        try:
+            print(f"正在打开测试页面: {test_url}")
+            page_load = PageLoadProfile.of(self.driver)
+            page_load.get(test_url)
+            page_load.settle()
+            return True
+        except Exception as e:
+            print(f"打开测试页面失败: {e}")
+            return False
+
+    def answer_adjective(self, question_num: int) -> bool:
+        """用形容词引擎回答当前题目"""
+        if not self.adjective:
+            print(f"{Fore.YELLOW}当前是形容词题，但没有加载形容词配置")
+            return False
+        return self.adjective.answer_adjective_question(question_num)
+
+    def answer_single_choice(self, question_num: int) -> bool:
+        """用单选题引擎回答当前题目（网络题目数据按页面上的题目文本匹配，不按题号）"""
+        if not self.single_choice:
+            print(f"{Fore.YELLOW}当前是单选题，但没有加载单选题配置")
+            return False
+        page = self.single_choice.detect_question_page()
+        return self.single_choice.answer_current_question(question_num, page["question_text"])
+
+    def run_questions(self, max_questions: int = 300):
+        """答题循环：识别题型 → 交给对应引擎 → 等待题目切换；离开题目页时重新导航"""
+        question_num = self.checkpoint.last_number
+        misses = 0  # 连续无法进入题目页的次数
+        handlers = {
+            page_state.ADJECTIVE: self.answer_adjective,
+            page_state.SINGLE_CHOICE: self.answer_single_choice,
+        }
+        engines = {
+            page_state.ADJECTIVE: self.adjective,
+            page_state.SINGLE_CHOICE: self.single_choice,
+        }
+
+        while question_num < max_questions:
+            result = self.page_classifier.wait_for_state_change(None, timeout=self.settings.get("wait_timeout", 10))
+            kind = self.page_classifier.question_type(result)
+
+            if kind is None:
+                if result["state"] == page_state.FINISHED:
+                    print(f"\n{Fore.GREEN}检测到测试已完成")
+                    self.checkpoint.finish()
+                    return
+                # 题型之间的说明页、目录页等，按页面状态继续导航
+                misses += 1
+                if misses > 3 or not self.button_handler.navigate_to_test_area():
+                    print(f"{Fore.YELLOW}无法进入下一道题目，停止答题")
+                    return
+                continue
+
+            misses = 0
+            question_num += 1
+            print(f"\n{'='*60}")
+            print(f"当前进度: 第 {question_num} 题（{kind}）")
+            profiler.begin_question(question_num)
+            self.command_counter.begin_question(question_num)
+
+            # 记录答题前的题目指纹，用于检测题目切换
+            previous_fingerprint = self.transition_waiter.fingerprint()
+            ElementCache.of(self.driver).begin_question(previous_fingerprint)
+
+            success = handlers[kind](question_num)
+            if success:
+                self.answered[kind] += 1
+            else:
+                print(f"第 {question_num} 题回答失败")
+                self.failed_questions.append(question_num)
+                if len(self.failed_questions) >= 3 and self.failed_questions[-3] == question_num - 2:
+                    print("连续失败多次，停止答题")
+                    return
+
+            print("等待页面跳转...")
+            next_fingerprint = self.transition_waiter.wait_for_change(previous_fingerprint)
+            if success:
+                answer = {"type": kind, **engines[kind].last_answer}
+                self.checkpoint.record(question_num, previous_fingerprint, answer, next_fingerprint)
+
+    def run_automation(self) -> bool:
+        """运行混合测评自动化"""
+        try:
+            print("开始北森混合测评自动化...")
+            profiler.configure(self.settings)
+
+            if not self.setup():
+                return False
+            # 恢复模式下已经停在题目页时不再打开链接和导航
+            if not self.checkpoint.resume_here(self.page_classifier):
+                if not self.open_test_page():
+                    return False
+                if not self.button_handler.navigate_to_test_area():
+                    print("导航到答题区域失败，尝试继续...")
+
+            self.run_questions()
+
+            print(f"\n{'='*60}")
+            print(f"自动化测试完成！形容词题 {self.answered[page_state.ADJECTIVE]} 道，"
+                  f"单选题 {self.answered[page_state.SINGLE_CHOICE]} 道")
+            if self.failed_questions:
+                print(f"失败的题目: {self.failed_questions}")
+            return True
+
+        except Exception as e:
+            print(f"自动化测试运行失败: {e}")
+            return False
+
+        finally:
+            profiler.finish()
+            if self.command_counter:
+                self.command_counter.print_report()
+            if self.adjective and self.adjective.group_answer:
+                self.adjective.group_answer.print_report()
+            if self.driver:
+                ElementCache.of(self.driver).print_report()
+            if self.single_choice:
+                self.single_choice._show_unmatched_summary()
+                self.single_choice.save_unmatched_questions()
+                if self.single_choice.question_source:
+                    self.single_choice.question_source.print_report()
+            if self.driver:
+                PageLoadProfile.of(self.driver).print_report()
+            BrowserSession.release(self.driver)
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="北森混合测评自动化（形容词 + 单选题，一个浏览器完成）")
+    parser.add_argument("--adjective-config", default="answers.json", help="形容词配置文件")
+    parser.add_argument("--single-choice-config", default="single_choice_answers.json", help="单选题配置文件")
+    parser.add_argument("--checkpoint", help="检查点文件，每答完一道题写入一次（默认不记录）")
+    parser.add_argument("--resume", action="store_true", help="从检查点继续答题（连接浏览器需配置 debugger_address）")
+    args = parser.parse_args()
+
+    try:
+        runner = AssessmentRunner(args.adjective_config, args.single_choice_config,
+                                  resume=args.resume, checkpoint_file=args.checkpoint)
+        if runner.run_automation():
+            print(f"\n{Fore.GREEN}✓ 自动化测试完成！")
+        else:
+            print(f"\n{Fore.RED}✗ 自动化测试失败！")
+    except KeyboardInterrupt:
+        print(f"\n{Fore.YELLOW}用户中断程序")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,19 @@
 """
 北森性格测试自动化模块
 """
-import time
 from typing import Dict, List, Optional
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 from config import Config
 from utils import Utils
+from command_counter import CommandCounter
+from browser_session import BrowserSession
+from page_load import PageLoadProfile
+from page_state import PageStateClassifier
+from wait_engine import waits
 
 class BeisenAutomation:
     """北森性格测试自动化类"""
@@ -21,66 +21,21 @@ class BeisenAutomation:
     def __init__(self, config_file: str = "answers.json"):
         self.config = Config(config_file)
         self.driver = None
+        self.command_counter = None
         self.answers = self.config.get_answers()
         self.selectors = self.config.get_selectors()
         self.wait_time = self.config.get_wait_time()
         self.retry_count = self.config.get_retry_count()
+        waits.configure(self.config.get_settings())
     
     def setup_driver(self):
         """设置浏览器驱动"""
         try:
-            import platform
-            import os
+            # 创建浏览器会话（配置了 debugger_address 时连接已打开的浏览器）
+            self.driver = BrowserSession.create(self.config.get_settings())
             
-            chrome_options = Options()
-            
-            # 根据配置设置无头模式
-            if self.config.is_headless():
-                chrome_options.add_argument("--headless")
-            
-            # 添加常用选项
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-            
-            # 检测操作系统并设置正确的ChromeDriver
-            system = platform.system().lower()
-            print(f"检测到操作系统: {system}")
-            
-            try:
-                # 使用工具函数获取ChromeDriver路径
-                driver_path = Utils.get_chromedriver_path()
-                
-                if driver_path and os.path.exists(driver_path):
-                    print(f"ChromeDriver路径: {driver_path}")
-                    service = Service(driver_path)
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                else:
-                    raise FileNotFoundError("无法获取有效的ChromeDriver路径")
-                
-            except Exception as e:
-                print(f"自动下载ChromeDriver失败: {e}")
-                print("尝试清理缓存后重新下载...")
-                
-                # 清理缓存后重试
-                Utils.clear_webdriver_cache()
-                try:
-                    driver_path = Utils.get_chromedriver_path()
-                    if driver_path and os.path.exists(driver_path):
-                        print(f"重新下载ChromeDriver成功: {driver_path}")
-                        service = Service(driver_path)
-                        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                    else:
-                        raise Exception("重新下载失败")
-                except Exception as e2:
-                    print(f"重新下载ChromeDriver失败: {e2}")
-                    print("尝试使用系统PATH中的ChromeDriver...")
-                    
-                    # 最后备用方案：使用系统PATH中的ChromeDriver
-                    service = Service()  # 不指定路径，让Selenium在PATH中查找
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            # 统计WebDriver命令往返次数
+            self.command_counter = CommandCounter.install(self.driver, self.config.get_command_budget())
             
             print("浏览器驱动设置成功")
             return True
@@ -98,10 +53,11 @@ class BeisenAutomation:
                 return False
             
             print(f"正在打开测试页面: {test_url}")
-            self.driver.get(test_url)
+            page_load = PageLoadProfile.of(self.driver)
+            page_load.get(test_url)
             
-            # 等待页面加载
-            Utils.random_delay(2, 4)
+            # 等待页面加载（lean 配置只等到页面可操作）
+            page_load.settle()
             
             print("测试页面打开成功")
             return True
@@ -224,7 +180,10 @@ class BeisenAutomation:
             
             if success:
                 print(f"第 {question_num} 题回答成功")
-                Utils.random_delay(1, 2)  # 等待页面响应
+                # 等待选项被选中（或页面已跳转）
+                option = selected_option['element']
+                waits.until("after_answer", lambda: Utils.is_gone(option) or option.is_selected()
+                            or "selected" in (option.get_attribute("class") or ""))
                 return True
             else:
                 print(f"第 {question_num} 题回答失败")
@@ -253,15 +212,20 @@ class BeisenAutomation:
                         print("点击下一题按钮")
                         success = Utils.safe_click(self.driver, next_button, self.retry_count)
                         if success:
-                            Utils.random_delay(2, 3)
+                            waits.until("after_next", lambda: Utils.is_gone(next_button))
                             return True
                 except Exception:
                     continue
             
             print("未找到下一题按钮，尝试按回车键")
             from selenium.webdriver.common.keys import Keys
-            self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.RETURN)
-            Utils.random_delay(2, 3)
+            classifier = PageStateClassifier(self.driver)
+            before = classifier.classify()
+            body = self.driver.find_element(By.TAG_NAME, "body")
+            body.send_keys(Keys.RETURN)
+            # body 不会消失，等待页面状态或页面内容指纹变化
+            classifier.wait_for_state_change(before["state"], timeout=self.wait_time,
+                                             previous_fingerprint=before.get("fingerprint"))
             return True
             
         except Exception as e:
@@ -287,7 +251,7 @@ class BeisenAutomation:
                         print("点击提交按钮")
                         success = Utils.safe_click(self.driver, submit_button, self.retry_count)
                         if success:
-                            Utils.random_delay(3, 5)
+                            waits.pause("after_submit")
                             return True
                 except Exception:
                     continue
@@ -320,6 +284,7 @@ class BeisenAutomation:
             while question_num <= max_questions:
                 print(f"\n{'='*60}")
                 print(f"当前进度: {question_num}/{max_questions}")
+                self.command_counter.begin_question(question_num)
                 
                 # 回答题目
                 success = self.answer_question(question_num)
@@ -332,7 +297,7 @@ class BeisenAutomation:
                         print("无法进入下一题，尝试继续...")
                 
                 question_num += 1
-                Utils.random_delay(2, 4)  # 题目间延迟
+                waits.until("between_questions", self.find_question_elements)  # 等待下一题的题目元素
             
             # 提交测试
             print(f"\n{'='*60}")
@@ -354,11 +319,13 @@ class BeisenAutomation:
             return False
         
         finally:
+            if self.command_counter:
+                self.command_counter.print_report()
+            
             if self.driver:
-                print("关闭浏览器...")
-                self.driver.quit()
+                PageLoadProfile.of(self.driver).print_report()
+            BrowserSession.release(self.driver)
     
     def close(self):
         """关闭浏览器"""
-        if self.driver:
-            self.driver.quit()
+        BrowserSession.release(self.driver)
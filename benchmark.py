@@ -0,0 +1,151 @@
+"""
+端到端基准测试
+启动本地模拟北森站点，用无头 Chrome 分别运行形容词和单选题自动化，报告每题平均耗时
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from locator_registry import LocatorRegistry
+from mock_beisen_site import ADJECTIVE, ADJECTIVE_POOL, SINGLE_CHOICE, MockBeisenSite
+from profiler import profiler
+from wait_engine import TIMING_PROFILES
+
+
+def write_config(directory: str, name: str, data: Dict[str, Any]) -> str:
+    """写入临时配置文件"""
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def build_settings(kind: str, workdir: str, headless: bool, timing_profile: str = "normal") -> Dict[str, Any]:
+    """基准测试使用的运行设置"""
+    return {
+        "headless": headless,
+        "timing_profile": timing_profile,
+        "profile": True,
+        "trace_file": os.path.join(workdir, f"trace_{kind}.json"),
+        "locator_stats_file": os.path.join(workdir, "locator_stats.json"),
+        "keep_browser_open": False,
+        "wait_timeout": 10,
+        "page_load_timeout": 30,
+        "implicit_wait": 5,
+    }
+
+
+def run_adjective(site: MockBeisenSite, workdir: str, headless: bool, timing_profile: str = "normal") -> bool:
+    """运行形容词三选二自动化"""
+    from adjective_test_automation import AdjectiveTestAutomation
+
+    config_file = write_config(workdir, "answers.json", {
+        "test_url": site.url,
+        "adjective_ranking": ADJECTIVE_POOL,
+        "settings": build_settings(ADJECTIVE, workdir, headless, timing_profile),
+    })
+    return AdjectiveTestAutomation(config_file).run_automation()
+
+
+def run_single_choice(site: MockBeisenSite, workdir: str, headless: bool, timing_profile: str = "normal") -> bool:
+    """运行单选题自动化"""
+    from single_choice_main import SingleChoiceAutomation
+
+    answer_categories: Dict[str, List[str]] = {}
+    for question, answer in site.expected_answers.items():
+        answer_categories.setdefault(answer, []).append(question)
+
+    config_file = write_config(workdir, "single_choice_answers.json", {
+        "test_url": site.url,
+        "answer_categories": answer_categories,
+        "default_answer": "非常不符合",
+        "settings": build_settings(SINGLE_CHOICE, workdir, headless, timing_profile),
+    })
+    automation = SingleChoiceAutomation(config_file)
+    automation.unmatched_file = os.path.join(workdir, "unmatched_questions.json")
+    return automation.run_automation()
+
+
+RUNNERS = {
+    ADJECTIVE: run_adjective,
+    SINGLE_CHOICE: run_single_choice,
+}
+
+
+def benchmark(kind: str, args: argparse.Namespace, workdir: str) -> Dict[str, Any]:
+    """对一种题型运行一次端到端测试，返回耗时统计"""
+    site = MockBeisenSite(kind, args.questions, args.page_delay, args.render_delay, args.advance_delay)
+    site.start()
+    start = time.perf_counter()
+    try:
+        success = RUNNERS[kind](site, workdir, not args.headful, args.timing_profile)
+    finally:
+        wall_time = time.perf_counter() - start
+        site.stop()
+
+    # 每题耗时取自性能分析器的题目统计（不含浏览器启动、导航和提交）
+    totals = [q["total"] for q in profiler.question_totals.values() if "total" in q]
+    answered = len(totals)
+    return {
+        "kind": kind,
+        "questions": args.questions,
+        "answered": answered,
+        "success": bool(success) and answered >= args.questions,
+        "wall_time": wall_time,
+        "per_question": sum(totals) / answered if answered else None,
+        "slowest": max(totals) if totals else None,
+    }
+
+
+def print_report(results: List[Dict[str, Any]], args: argparse.Namespace):
+    """打印基准测试结果"""
+    print(f"\n{'=' * 60}")
+    print(f"基准测试结果（页面延迟 {args.page_delay}s，渲染延迟 {args.render_delay}s，跳转延迟 {args.advance_delay}s，"
+          f"等待速度 {args.timing_profile}）")
+    print(f"{'=' * 60}")
+    print(f"{'题型':<16}{'完成':>8}{'总耗时(秒)':>12}{'每题(秒)':>10}{'最慢(秒)':>10}")
+    for result in results:
+        per_question = f"{result['per_question']:.2f}" if result["per_question"] is not None else "-"
+        slowest = f"{result['slowest']:.2f}" if result["slowest"] is not None else "-"
+        done = f"{result['answered']}/{result['questions']}"
+        print(f"{result['kind']:<16}{done:>8}{result['wall_time']:>12.2f}{per_question:>10}{slowest:>10}")
+    print(f"{'=' * 60}")
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="北森自动化端到端基准测试")
+    parser.add_argument("--kind", choices=[ADJECTIVE, SINGLE_CHOICE, "all"], default="all", help="题型")
+    parser.add_argument("--questions", type=int, default=10, help="题目数量")
+    parser.add_argument("--page-delay", type=float, default=0.0, help="服务端响应延迟（秒）")
+    parser.add_argument("--render-delay", type=float, default=0.0, help="页面渲染延迟（秒）")
+    parser.add_argument("--advance-delay", type=float, default=0.2, help="点击后跳转延迟（秒）")
+    parser.add_argument("--headful", action="store_true", help="显示浏览器窗口")
+    parser.add_argument("--timing-profile", choices=list(TIMING_PROFILES), default="normal", help="等待速度配置")
+    parser.add_argument("--output", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    kinds = [ADJECTIVE, SINGLE_CHOICE] if args.kind == "all" else [args.kind]
+    results = []
+    with tempfile.TemporaryDirectory(prefix="beisen_benchmark_") as workdir:
+        for kind in kinds:
+            print(f"\n>>> 基准测试: {kind}")
+            results.append(benchmark(kind, args, workdir))
+        # 统计文件位于临时目录，退出前落盘，避免进程退出时目录已被删除
+        LocatorRegistry.shared(os.path.join(workdir, "locator_stats.json")).save()
+
+    print_report(results, args)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到: {args.output}")
+
+    if not all(result["success"] for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
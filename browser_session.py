@@ -0,0 +1,172 @@
+"""
+浏览器会话模块
+三个自动化类共用的 Chrome 会话工厂：统一启动参数和 ChromeDriver 解析，
+并支持通过调试地址连接已经打开的 Chrome，重复运行时省去浏览器冷启动
+"""
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+from typing import Any, Dict, Optional
+
+from selenium.webdriver.chrome.options import Options
+
+from driver_resolver import DEFAULT_CACHE_FILE, LINUX_CHROME_COMMANDS, MAC_CHROME_PLIST, WINDOWS_CHROME_DIRS, \
+    ChromeDriverResolver
+from network_question_source import NETWORK, NetworkQuestionSource
+from page_load import LEAN, PageLoadProfile
+from profiler import profiled
+
+DEFAULT_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+DEFAULT_DEBUGGER_PORT = 9222
+
+
+class BrowserSession:
+    """浏览器会话工厂类"""
+
+    @staticmethod
+    def build_options(settings: Dict[str, Any]) -> Options:
+        """根据 settings 构建启动参数"""
+        options = Options()
+        if settings.get("load_profile") == LEAN:
+            # DOMContentLoaded 后即返回，不等待图片等资源
+            options.page_load_strategy = "eager"
+        if settings.get("question_source") == NETWORK:
+            # 性能日志由 chromedriver 记录，连接已有浏览器时同样可用
+            NetworkQuestionSource.enable_logging(options)
+        debugger_address = settings.get("debugger_address")
+        if debugger_address:
+            # 连接已有浏览器时启动参数不会生效，只需要调试地址
+            options.add_experimental_option("debuggerAddress", debugger_address)
+            return options
+
+        if settings.get("headless", False):
+            options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument(f"--user-agent={settings.get('user_agent', DEFAULT_USER_AGENT)}")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option("useAutomationExtension", False)
+        return options
+
+    @staticmethod
+    @profiled("navigation", "create_browser_session")
+    def create(settings: Dict[str, Any], page_load_timeout: Optional[float] = None,
+               implicit_wait: Optional[float] = None):
+        """创建浏览器会话：配置了 debugger_address 时优先连接已有浏览器，连接失败再启动新浏览器"""
+        resolver = ChromeDriverResolver(settings.get("chromedriver_cache_file", DEFAULT_CACHE_FILE))
+        driver = None
+
+        debugger_address = settings.get("debugger_address")
+        if debugger_address:
+            try:
+                print(f"正在连接已打开的浏览器: {debugger_address}")
+                # 连接失败通常是浏览器没有打开，不应作废驱动缓存
+                driver = resolver.create_chrome(BrowserSession.build_options(settings), retry=False)
+                driver.attached_session = True
+                print(f"已连接到浏览器，当前页面: {driver.current_url}")
+            except Exception as e:
+                print(f"连接已打开的浏览器失败: {e}")
+                print("改为启动新的浏览器...")
+                settings = {key: value for key, value in settings.items() if key != "debugger_address"}
+
+        if driver is None:
+            driver = resolver.create_chrome(BrowserSession.build_options(settings))
+            driver.attached_session = False
+
+        # 页面加载配置（lean 配置下屏蔽重资源）
+        PageLoadProfile.install(driver, settings)
+        # 网络题目数据（question_source 为 network 时启用）
+        NetworkQuestionSource.install(driver, settings)
+
+        if page_load_timeout is not None:
+            driver.set_page_load_timeout(page_load_timeout)
+        if settings.get("explicit_waits", False):
+            # 显式等待模式：找不到元素时立即返回，每次查找自行指定等待上限
+            driver.avoided_implicit_wait = implicit_wait or 0
+            implicit_wait = 0
+            print("已启用显式等待模式：隐式等待设为 0")
+        if implicit_wait is not None:
+            driver.implicitly_wait(implicit_wait)
+        driver.implicit_wait_seconds = implicit_wait or 0
+        return driver
+
+    @staticmethod
+    def is_attached(driver) -> bool:
+        """是否为连接到已有浏览器的会话"""
+        return bool(getattr(driver, "attached_session", False))
+
+    @staticmethod
+    def release(driver):
+        """结束会话：自己启动的浏览器直接关闭，连接的浏览器只断开 chromedriver，浏览器保持打开供下次复用"""
+        if driver is None:
+            return
+        try:
+            if BrowserSession.is_attached(driver):
+                print("断开与浏览器的连接（浏览器保持打开）")
+                driver.service.stop()
+            else:
+                print("关闭浏览器...")
+                driver.quit()
+        except Exception as e:
+            print(f"关闭浏览器失败: {e}")
+
+    @staticmethod
+    def find_chrome_binary() -> Optional[str]:
+        """查找本机 Chrome 可执行文件"""
+        system = platform.system().lower()
+        if system == "windows":
+            for directory in WINDOWS_CHROME_DIRS:
+                path = os.path.join(directory, "chrome.exe")
+                if os.path.exists(path):
+                    return path
+        elif system == "darwin":
+            path = os.path.join(os.path.dirname(MAC_CHROME_PLIST), "MacOS", "Google Chrome")
+            if os.path.exists(path):
+                return path
+        else:
+            for command in LINUX_CHROME_COMMANDS:
+                path = shutil.which(command)
+                if path:
+                    return path
+        return None
+
+    @staticmethod
+    def launch_debug_browser(port: int = DEFAULT_DEBUGGER_PORT, user_data_dir: Optional[str] = None,
+                             headless: bool = False) -> Optional[str]:
+        """启动一个开启远程调试的 Chrome（独立于本程序运行），返回调试地址"""
+        binary = BrowserSession.find_chrome_binary()
+        if not binary:
+            print("未找到Chrome可执行文件")
+            return None
+        user_data_dir = user_data_dir or os.path.join(tempfile.gettempdir(), "beisen_chrome_profile")
+        args = [binary, f"--remote-debugging-port={port}", f"--user-data-dir={user_data_dir}",
+                "--no-first-run", "--no-default-browser-check"]
+        if headless:
+            args.append("--headless")
+        subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        address = f"127.0.0.1:{port}"
+        print(f"已启动调试浏览器: {address}（用户目录: {user_data_dir}）")
+        print(f'在配置文件的 settings 中加入 "debugger_address": "{address}" 即可复用该浏览器')
+        return address
+
+
+def main():
+    """命令行启动一个可复用的调试浏览器"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="启动开启远程调试的 Chrome，供自动化程序通过 debugger_address 复用")
+    parser.add_argument("--port", type=int, default=DEFAULT_DEBUGGER_PORT, help="远程调试端口")
+    parser.add_argument("--user-data-dir", help="浏览器用户目录")
+    parser.add_argument("--headless", action="store_true", help="无头模式")
+    args = parser.parse_args()
+    BrowserSession.launch_debug_browser(args.port, args.user_data_dir, args.headless)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,10 +9,68 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.keys import Keys
 
 from utils import Utils
+from command_counter import CommandCounter
+from profiler import profiled
+from locator_registry import LocatorRegistry
+from page_load import PageLoadProfile
+from element_cache import ElementCache
+from wait_engine import waits
+import page_state
+from page_state import PageStateClassifier
+
+# 按文本查找按钮的合并查询脚本
+# 原实现对每个文本依次尝试6种 XPath，每种最多等待2秒；这里一次联合查询后在浏览器内排序
+FIND_BUTTON_BY_TEXT_SCRIPT = """
+var texts = arguments[0];
+function literal(s) {
+    if (s.indexOf("'") < 0) { return "'" + s + "'"; }
+    if (s.indexOf('"') < 0) { return '"' + s + '"'; }
+    return "concat('" + s.split("'").join("', \\"'\\", '") + "')";
+}
+var textConditions = [], valueConditions = [];
+for (var i = 0; i < texts.length; i++) {
+    textConditions.push('contains(., ' + literal(texts[i]) + ')');
+    valueConditions.push('@value=' + literal(texts[i]));
+}
+var xpath = '//*[not(self::script) and not(self::style)][text()[' + textConditions.join(' or ') + ']]'
+    + ' | //input[' + valueConditions.join(' or ') + ']';
+var nodes = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var tagPriority = {BUTTON: 0, INPUT: 1, A: 2, DIV: 3, SPAN: 4};
+
+function usable(el) {
+    if (el.disabled || el.getAttribute('aria-disabled') === 'true') { return false; }
+    var rect = el.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden' && style.pointerEvents !== 'none';
+}
+
+function textRank(el) {
+    for (var t = 0; t < texts.length; t++) {
+        if (el.tagName === 'INPUT' && el.value === texts[t]) { return t; }
+        for (var c = el.firstChild; c; c = c.nextSibling) {
+            if (c.nodeType === 3 && c.nodeValue.indexOf(texts[t]) >= 0) { return t; }
+        }
+    }
+    return texts.length;
+}
+
+var best = null, bestRank = Infinity;
+for (var n = 0; n < nodes.snapshotLength; n++) {
+    var el = nodes.snapshotItem(n);
+    var tag = el.tagName.toUpperCase();
+    var rank = textRank(el) * 6 + (tag in tagPriority ? tagPriority[tag] : 5);
+    if (rank < bestRank && usable(el)) {
+        best = el;
+        bestRank = rank;
+    }
+}
+return best;
+"""
 
 class ButtonHandler:
     """按钮处理类"""
@@ -22,50 +80,60 @@ class ButtonHandler:
         self.config = config or {}
         self.button_selectors = self.config.get("button_selectors", {})
         self.wait_timeout = self.config.get("wait_timeout", 10)
+        # 显式等待模式下预期存在的元素最多等待的秒数（隐式等待为 0 时查找不会自动等待）
+        self.lookup_timeout = self.config.get("lookup_timeout", 5)
         self.retry_count = self.config.get("retry_count", 3)
+        # 定位器命中统计，优先尝试上次命中的选择器
+        self.locators = self.config.get("locator_registry") or LocatorRegistry.shared()
+        # 页面状态识别，用于导航状态机
+        self.page_classifier = PageStateClassifier(driver)
+        # 同一道题内复用已定位的元素（题目切换时自动清空）
+        self.element_cache = ElementCache.of(driver)
     
-    def find_button_by_text(self, text_variations: List[str], timeout: int = 5) -> Optional[WebElement]:
-        """根据文本内容查找按钮"""
-        for text in text_variations:
+    def find_elements(self, selector: str, timeout: Optional[float] = None) -> List[WebElement]:
+        """按 CSS 选择器查找元素，显式等待模式下最多等待 timeout 秒（默认 lookup_timeout）"""
+        return Utils.find_elements(self.driver, selector, timeout=self.lookup_timeout if timeout is None else timeout)
+    
+    @profiled("locate")
+    def find_button_by_text(self, text_variations: List[str], timeout: float = 0) -> Optional[WebElement]:
+        """根据文本内容查找按钮
+
+        所有文本和标签模式合并为一次 XPath 联合查询，在浏览器内按原有优先级排序
+        （先按文本顺序，再按 button → input → a → div → span → 其他），返回第一个可见且可用的候选。
+        页面上没有候选时立即返回；timeout 大于0时在该时间内重试。
+        """
+        if not text_variations:
+            return None
+        
+        def find_once() -> Optional[WebElement]:
             try:
-                # 尝试多种XPath模式
-                xpath_patterns = [
-                    f"//button[contains(text(), '{text}')]",
-                    f"//input[@value='{text}']",
-                    f"//a[contains(text(), '{text}')]",
-                    f"//div[contains(text(), '{text}')]",
-                    f"//span[contains(text(), '{text}')]",
-                    f"//*[contains(text(), '{text}')]"
-                ]
-                
-                for pattern in xpath_patterns:
-                    try:
-                        element = WebDriverWait(self.driver, 2).until(
-                            EC.element_to_be_clickable((By.XPATH, pattern))
-                        )
-                        if element and element.is_displayed():
-                            return element
-                    except TimeoutException:
-                        continue
-                        
-            except Exception:
-                continue
+                return self.driver.execute_script(FIND_BUTTON_BY_TEXT_SCRIPT, list(text_variations))
+            except Exception as e:
+                print(f"按文本查找按钮失败: {e}")
+                return None
         
-        return None
+        return waits.until("find_button", find_once, timeout=timeout)
     
-    def find_button_by_selector(self, selectors: List[str], timeout: int = 5) -> Optional[WebElement]:
-        """根据CSS选择器查找按钮"""
-        for selector in selectors:
-            try:
-                element = WebDriverWait(self.driver, 2).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                )
-                if element and element.is_displayed():
-                    return element
-            except TimeoutException:
-                continue
-        return None
+    @profiled("locate")
+    def find_button_by_selector(self, selectors: List[str], timeout: float = 5) -> Optional[WebElement]:
+        """根据CSS选择器查找按钮
+
+        每轮按顺序检查全部选择器（每个选择器取第一个元素，可见且可用即返回），
+        整个查找共用 timeout 秒的上限，而不是每个选择器各等一次。
+        """
+        def find_once() -> Optional[WebElement]:
+            for selector in selectors:
+                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                if elements and elements[0].is_displayed() and elements[0].is_enabled():
+                    return elements[0]
+            return None
+        
+        if timeout <= 0:
+            return waits.until("lookup", find_once, timeout=0)
+        with CommandCounter.timed_lookup(self.driver):
+            return waits.until("lookup", find_once, timeout=timeout)
     
+    @profiled("click")
     def click_button(self, element: WebElement, button_name: str = "按钮") -> bool:
         """安全点击按钮"""
         try:
@@ -73,7 +141,7 @@ class ButtonHandler:
             
             # 滚动到元素可见
             self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-            Utils.random_delay(0.5, 1.0)
+            waits.pause("after_scroll")
             
             # 等待元素可点击
             WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable(element))
@@ -86,13 +154,25 @@ class ButtonHandler:
                 self.driver.execute_script("arguments[0].click();", element)
             
             print(f"{button_name} 点击成功")
-            Utils.random_delay(1, 2)
+            # 等待按钮消失（页面跳转或重新渲染），最多等待 settings.wait_time 秒
+            waits.until("after_click", lambda: Utils.is_gone(element))
             return True
             
         except Exception as e:
             print(f"点击 {button_name} 失败: {e}")
             return False
     
+    def wait_until_clickable(self, button: WebElement, button_name: str = "按钮") -> bool:
+        """等待按钮可见且可用，超时返回 False"""
+        print(f"等待{button_name}可点击...")
+        start = time.perf_counter()
+        if waits.until("button_clickable", lambda: button.is_enabled() and button.is_displayed()):
+            print(f"{button_name}在 {time.perf_counter() - start:.1f} 秒后变为可点击")
+            return True
+        print(f"{button_name}等待超时，尝试强制点击")
+        return False
+    
+    @profiled("navigation")
     def click_next_button(self) -> bool:
         """点击下一步按钮"""
         next_texts = [
@@ -121,6 +201,7 @@ class ButtonHandler:
         print("未找到下一步按钮")
         return False
     
+    @profiled("navigation")
     def click_start_button(self) -> bool:
         """点击开始答题按钮"""
         start_texts = [
@@ -147,6 +228,7 @@ class ButtonHandler:
         print("未找到开始答题按钮")
         return False
     
+    @profiled("navigation")
     def click_enter_test_button(self) -> bool:
         """点击进入试卷按钮（带5秒等待）"""
         print("查找进入试卷按钮...")
@@ -163,22 +245,16 @@ class ButtonHandler:
             # "div[class*='phoenix-button'][class*='primary']",  # 组合选择器
         ]
         
+        def find_enter_button(selector: str) -> Optional[WebElement]:
+            print(f"尝试选择器: {selector}")
+            for element in self.find_elements(selector):
+                if element.is_displayed() and "进入试卷" in element.text:
+                    print(f"找到进入试卷按钮: {element.text}")
+                    return element
+            return None
+        
         # 尝试按选择器查找按钮
-        button = None
-        for selector in enter_test_selectors:
-            try:
-                print(f"尝试选择器: {selector}")
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    if element.is_displayed() and "进入试卷" in element.text:
-                        button = element
-                        print(f"找到进入试卷按钮: {element.text}")
-                        break
-                if button:
-                    break
-            except Exception as e:
-                print(f"选择器 {selector} 查找失败: {e}")
-                continue
+        _, button = self.locators.find_first("enter_test", enter_test_selectors, find_enter_button)
         
         # 如果按选择器没找到，尝试按文本查找
         if not button:
@@ -189,42 +265,13 @@ class ButtonHandler:
             print("未找到进入试卷按钮")
             return False
         
-        # 智能等待按钮可点击
-        print("等待按钮可点击...")
-        max_wait_time = 10  # 最大等待10秒
-        wait_interval = 0.5  # 每0.5秒检查一次
-        waited_time = 0
-        
-        while waited_time < max_wait_time:
-            try:
-                # 检查按钮是否可点击
-                if button.is_enabled() and button.is_displayed():
-                    # 尝试点击，如果成功就跳出循环
-                    try:
-                        WebDriverWait(self.driver, 1).until(EC.element_to_be_clickable(button))
-                        print(f"按钮在 {waited_time:.1f} 秒后变为可点击")
-                        break
-                    except TimeoutException:
-                        pass
-                
-                time.sleep(wait_interval)
-                waited_time += wait_interval
-                
-                # 每2秒打印一次进度
-                if int(waited_time) % 2 == 0 and waited_time > 0:
-                    print(f"已等待 {waited_time:.1f} 秒...")
-                    
-            except Exception as e:
-                print(f"检查按钮状态时出错: {e}")
-                time.sleep(wait_interval)
-                waited_time += wait_interval
-        
-        if waited_time >= max_wait_time:
-            print("按钮等待超时，尝试强制点击")
+        # 智能等待按钮可点击（超时后仍尝试强制点击）
+        self.wait_until_clickable(button, "进入试卷按钮")
         
         # 点击按钮
         return self.click_button(button, "进入试卷按钮")
     
+    @profiled("navigation")
     def click_continue_button(self) -> bool:
         """点击继续答题或去答题按钮"""
         print("查找继续答题/去答题按钮...")
@@ -239,25 +286,19 @@ class ButtonHandler:
             # "div[class*='part-item']",                  # 包含part-item的div
         ]
         
+        def find_continue_button(selector: str) -> Optional[WebElement]:
+            print(f"尝试选择器: {selector}")
+            for element in self.find_elements(selector):
+                if element.is_displayed():
+                    # 检查元素内部是否包含"继续答题"或"去答题"文本（只含"继续"的外层容器不算）
+                    text = element.text.strip()
+                    if "继续答题" in text or "去答题" in text:
+                        print(f"找到继续答题按钮: {text}")
+                        return element
+            return None
+        
         # 尝试按选择器查找按钮
-        button = None
-        for selector in continue_selectors:
-            try:
-                print(f"尝试选择器: {selector}")
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    if element.is_displayed():
-                        # 检查元素内部是否包含"继续答题"或"去答题"文本
-                        text = element.text.strip()
-                        if "继续答题" in text or "去答题" in text or "继续" in text:
-                            button = element
-                            print(f"找到继续答题按钮: {text}")
-                            break
-                if button:
-                    break
-            except Exception as e:
-                print(f"选择器 {selector} 查找失败: {e}")
-                continue
+        _, button = self.locators.find_first("continue", continue_selectors, find_continue_button)
         
         # 如果按选择器没找到，尝试按文本查找
         if not button:
@@ -268,42 +309,13 @@ class ButtonHandler:
             print("未找到继续答题/去答题按钮")
             return False
         
-        # 智能等待按钮可点击
-        print("等待继续答题按钮可点击...")
-        max_wait_time = 10  # 最大等待10秒
-        wait_interval = 0.5  # 每0.5秒检查一次
-        waited_time = 0
-        
-        while waited_time < max_wait_time:
-            try:
-                # 检查按钮是否可点击
-                if button.is_enabled() and button.is_displayed():
-                    # 尝试点击，如果成功就跳出循环
-                    try:
-                        WebDriverWait(self.driver, 1).until(EC.element_to_be_clickable(button))
-                        print(f"继续答题按钮在 {waited_time:.1f} 秒后变为可点击")
-                        break
-                    except TimeoutException:
-                        pass
-                
-                time.sleep(wait_interval)
-                waited_time += wait_interval
-                
-                # 每2秒打印一次进度
-                if int(waited_time) % 2 == 0 and waited_time > 0:
-                    print(f"已等待 {waited_time:.1f} 秒...")
-                    
-            except Exception as e:
-                print(f"检查按钮状态时出错: {e}")
-                time.sleep(wait_interval)
-                waited_time += wait_interval
-        
-        if waited_time >= max_wait_time:
-            print("继续答题按钮等待超时，尝试强制点击")
+        # 智能等待按钮可点击（超时后仍尝试强制点击）
+        self.wait_until_clickable(button, "继续答题按钮")
         
         # 点击按钮
         return self.click_button(button, "继续答题按钮")
     
+    @profiled("navigation")
     def click_next_step_button(self) -> bool:
         """点击下一步按钮（答题说明页面）"""
         print("查找下一步按钮...")
@@ -323,7 +335,7 @@ class ButtonHandler:
         for selector in next_step_selectors:
             try:
                 print(f"尝试选择器: {selector}")
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                elements = self.find_elements(selector)
                 for element in elements:
                     if element.is_displayed():
                         # 检查元素内部是否包含"下一步"文本
@@ -347,42 +359,13 @@ class ButtonHandler:
             print("未找到下一步按钮")
             return False
         
-        # 智能等待按钮可点击
-        print("等待下一步按钮可点击...")
-        max_wait_time = 10  # 最大等待10秒
-        wait_interval = 0.5  # 每0.5秒检查一次
-        waited_time = 0
-        
-        while waited_time < max_wait_time:
-            try:
-                # 检查按钮是否可点击
-                if button.is_enabled() and button.is_displayed():
-                    # 尝试点击，如果成功就跳出循环
-                    try:
-                        WebDriverWait(self.driver, 1).until(EC.element_to_be_clickable(button))
-                        print(f"下一步按钮在 {waited_time:.1f} 秒后变为可点击")
-                        break
-                    except TimeoutException:
-                        pass
-                
-                time.sleep(wait_interval)
-                waited_time += wait_interval
-                
-                # 每2秒打印一次进度
-                if int(waited_time) % 2 == 0 and waited_time > 0:
-                    print(f"已等待 {waited_time:.1f} 秒...")
-                    
-            except Exception as e:
-                print(f"检查按钮状态时出错: {e}")
-                time.sleep(wait_interval)
-                waited_time += wait_interval
-        
-        if waited_time >= max_wait_time:
-            print("下一步按钮等待超时，尝试强制点击")
+        # 智能等待按钮可点击（超时后仍尝试强制点击）
+        self.wait_until_clickable(button, "下一步按钮")
         
         # 点击按钮
         return self.click_button(button, "下一步按钮")
     
+    @profiled("navigation")
     def click_practice_next_step_button(self) -> bool:
         """点击练习题页面的下一步按钮"""
         print("查找练习题页面的下一步按钮...")
@@ -402,7 +385,7 @@ class ButtonHandler:
         for selector in practice_next_step_selectors:
             try:
                 print(f"尝试选择器: {selector}")
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                elements = self.find_elements(selector)
                 for element in elements:
                     if element.is_displayed():
                         # 检查元素内部是否包含"下一步"文本
@@ -426,42 +409,13 @@ class ButtonHandler:
             print("未找到练习题下一步按钮")
             return False
         
-        # 智能等待按钮可点击
-        print("等待练习题下一步按钮可点击...")
-        max_wait_time = 10  # 最大等待10秒
-        wait_interval = 0.5  # 每0.5秒检查一次
-        waited_time = 0
-        
-        while waited_time < max_wait_time:
-            try:
-                # 检查按钮是否可点击
-                if button.is_enabled() and button.is_displayed():
-                    # 尝试点击，如果成功就跳出循环
-                    try:
-                        WebDriverWait(self.driver, 1).until(EC.element_to_be_clickable(button))
-                        print(f"练习题下一步按钮在 {waited_time:.1f} 秒后变为可点击")
-                        break
-                    except TimeoutException:
-                        pass
-                
-                time.sleep(wait_interval)
-                waited_time += wait_interval
-                
-                # 每2秒打印一次进度
-                if int(waited_time) % 2 == 0 and waited_time > 0:
-                    print(f"已等待 {waited_time:.1f} 秒...")
-                    
-            except Exception as e:
-                print(f"检查按钮状态时出错: {e}")
-                time.sleep(wait_interval)
-                waited_time += wait_interval
-        
-        if waited_time >= max_wait_time:
-            print("练习题下一步按钮等待超时，尝试强制点击")
+        # 智能等待按钮可点击（超时后仍尝试强制点击）
+        self.wait_until_clickable(button, "练习题下一步按钮")
         
         # 点击按钮
         return self.click_button(button, "练习题下一步按钮")
     
+    @profiled("navigation")
     def click_formal_answer_button(self) -> bool:
         """点击正式答题按钮（练习完成页面）"""
         print("查找正式答题按钮...")
@@ -481,7 +435,7 @@ class ButtonHandler:
         for selector in formal_answer_selectors:
             try:
                 print(f"尝试选择器: {selector}")
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                elements = self.find_elements(selector)
                 for element in elements:
                     if element.is_displayed():
                         # 检查元素内部是否包含"正式答题"文本
@@ -505,42 +459,13 @@ class ButtonHandler:
             print("未找到正式答题按钮")
             return False
         
-        # 智能等待按钮可点击
-        print("等待正式答题按钮可点击...")
-        max_wait_time = 10  # 最大等待10秒
-        wait_interval = 0.5  # 每0.5秒检查一次
-        waited_time = 0
-        
-        while waited_time < max_wait_time:
-            try:
-                # 检查按钮是否可点击
-                if button.is_enabled() and button.is_displayed():
-                    # 尝试点击，如果成功就跳出循环
-                    try:
-                        WebDriverWait(self.driver, 1).until(EC.element_to_be_clickable(button))
-                        print(f"正式答题按钮在 {waited_time:.1f} 秒后变为可点击")
-                        break
-                    except TimeoutException:
-                        pass
-                
-                time.sleep(wait_interval)
-                waited_time += wait_interval
-                
-                # 每2秒打印一次进度
-                if int(waited_time) % 2 == 0 and waited_time > 0:
-                    print(f"已等待 {waited_time:.1f} 秒...")
-                    
-            except Exception as e:
-                print(f"检查按钮状态时出错: {e}")
-                time.sleep(wait_interval)
-                waited_time += wait_interval
-        
-        if waited_time >= max_wait_time:
-            print("正式答题按钮等待超时，尝试强制点击")
+        # 智能等待按钮可点击（超时后仍尝试强制点击）
+        self.wait_until_clickable(button, "正式答题按钮")
         
         # 点击按钮
         return self.click_button(button, "正式答题按钮")
     
+    @profiled("locate")
     def find_adjective_options(self, adjective_list: List[str] = None) -> List[WebElement]:
         """查找页面上的形容词选项"""
         try:
@@ -564,7 +489,7 @@ class ButtonHandler:
             options = []
             for selector in option_selectors:
                 try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    elements = self.find_elements(selector)
                     print(f"选择器 {selector} 找到 {len(elements)} 个元素")
                     
                     for element in elements:
@@ -592,6 +517,11 @@ class ButtonHandler:
             return []
     
     def find_most_least_boxes(self) -> Tuple[Optional[WebElement], Optional[WebElement]]:
+        """获取最符合和最不符合的选框（同一道题内复用已定位的元素）"""
+        return self.element_cache.get("most_least_boxes", self.locate_most_least_boxes)
+    
+    @profiled("locate")
+    def locate_most_least_boxes(self) -> Tuple[Optional[WebElement], Optional[WebElement]]:
         """查找最符合和最不符合的选框"""
         try:
             # 根据截图分析，选框的选择器
@@ -605,9 +535,10 @@ class ButtonHandler:
             most_box = None
             least_box = None
             
-            for selector in box_selectors:
+            for index, selector in enumerate(box_selectors):
                 try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    # 只有第一个选择器等待选框出现，备用选择器只查一次
+                    elements = self.find_elements(selector, None if index == 0 else 0)
                     for element in elements:
                         if element.is_displayed():
                             text = element.text.strip()
@@ -629,6 +560,7 @@ class ButtonHandler:
             print(f"查找最符合/最不符合选框失败: {e}")
             return None, None
     
+    @profiled("answer")
     def answer_question(self, adjective_ranking: List[str]) -> bool:
         """回答一道题目"""
         try:
@@ -676,19 +608,20 @@ class ButtonHandler:
                 print("未找到最符合/最不符合选框")
                 return False
             
-            # 选择最符合的形容词
-            if not self.select_adjective_for_box(most_suitable, options, most_box):
+            # 选择最符合的形容词（缓存的选框失效时重新定位）
+            if not self.select_adjective_for_box(most_suitable, options, 0):
                 print(f"选择最符合形容词失败: {most_suitable}")
                 return False
             
-            Utils.random_delay(1, 2)
+            # 等待选框内出现该形容词
+            waits.until("after_selection", lambda: Utils.has_text(self.find_most_least_boxes()[0], most_suitable))
             
             # 选择最不符合的形容词
-            if not self.select_adjective_for_box(least_suitable, options, least_box):
+            if not self.select_adjective_for_box(least_suitable, options, 1):
                 print(f"选择最不符合形容词失败: {least_suitable}")
                 return False
             
-            Utils.random_delay(1, 2)
+            waits.until("after_selection", lambda: Utils.has_text(self.find_most_least_boxes()[1], least_suitable))
             
             # 点击确定按钮
             if not self.click_confirm_button():
@@ -702,6 +635,7 @@ class ButtonHandler:
             print(f"回答题目失败: {e}")
             return False
     
+    @profiled("match")
     def select_most_and_least_suitable(self, page_options: List[str], adjective_ranking: List[str]) -> Tuple[Optional[str], Optional[str]]:
         """根据排序选择最符合和最不符合的形容词"""
         try:
@@ -732,8 +666,9 @@ class ButtonHandler:
             print(f"选择最符合/最不符合形容词失败: {e}")
             return None, None
     
-    def select_adjective_for_box(self, adjective: str, options: List[WebElement], target_box: WebElement) -> bool:
-        """将形容词点击到指定选框"""
+    @profiled("click")
+    def select_adjective_for_box(self, adjective: str, options: List[WebElement], box_index: int) -> bool:
+        """将形容词点击到指定选框（box_index 为 0 表示最符合，1 表示最不符合）"""
         try:
             print(f"正在将 '{adjective}' 点击到选框...")
             
@@ -757,11 +692,15 @@ class ButtonHandler:
                     print(f"点击形容词选项失败: {adjective}")
                     return False
                 
-                Utils.random_delay(0.5, 1.0)
+                waits.pause("between_selections")
                 
-                # 点击目标选框
+                # 点击目标选框（只有选框点击在缓存中重试：缓存的选框失效时重新定位，不会重复点击形容词）
                 print(f"点击目标选框")
-                success = Utils.safe_click(self.driver, target_box, self.retry_count)
+                success = self.element_cache.use(
+                    "most_least_boxes",
+                    self.locate_most_least_boxes,
+                    lambda boxes: Utils.safe_click(self.driver, boxes[box_index], self.retry_count, raise_stale=True)
+                )
                 if not success:
                     print(f"点击目标选框失败")
                     return False
@@ -777,6 +716,7 @@ class ButtonHandler:
             print(f"选择形容词到选框失败: {e}")
             return False
     
+    @profiled("click")
     def click_confirm_button(self) -> bool:
         """点击确认按钮"""
         confirm_texts = [
@@ -803,6 +743,7 @@ class ButtonHandler:
         print("未找到确认按钮")
         return False
     
+    @profiled("navigation")
     def click_skip_button(self) -> bool:
         """点击跳过按钮"""
         skip_texts = [
@@ -827,185 +768,97 @@ class ButtonHandler:
         print("未找到跳过按钮")
         return False
     
+    @profiled("wait")
     def wait_for_page_load(self, timeout: int = 10) -> bool:
         """等待页面加载完成"""
         try:
-            # 等待页面基本元素加载
-            WebDriverWait(self.driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
-            )
+            page_load = PageLoadProfile.of(self.driver)
             
-            # 额外等待一下，确保动态内容加载
-            Utils.random_delay(2, 3)
+            # 等待页面基本元素加载（lean 配置下 interactive 即可）
+            if not waits.until("page_ready", page_load.is_ready, timeout=timeout):
+                print("页面加载超时")
+                return False
+            
+            # 等待动态内容渲染到可以识别页面状态（lean 配置由后续的元素等待负责）
+            if not page_load.lean:
+                waits.until("dynamic_content", lambda: self.page_classifier.classify()["state"] != page_state.UNKNOWN)
             return True
             
-        except TimeoutException:
-            print("页面加载超时")
+        except Exception as e:
+            print(f"等待页面加载失败: {e}")
             return False
     
+    @profiled("navigation")
     def navigate_to_test_area(self) -> bool:
-        """导航到答题区域"""
+        """导航到答题区域
+
+        每一步先识别当前页面状态，再执行该状态对应的唯一操作：
+        进入试卷 → 继续答题 → 下一步（答题说明）→ 下一步（练习）→ 正式答题 → 题目页。
+        无法识别的页面才退回通用按钮尝试。
+        """
         print("开始导航到答题区域...")
         
-        max_attempts = 10  # 最多尝试10次按钮点击
-        attempt = 0
+        transitions = {
+            page_state.LANDING: self.click_enter_test_button,
+            page_state.OUTLINE: self.click_continue_button,
+            page_state.INSTRUCTIONS: self.click_next_step_button,
+            page_state.PRACTICE: self.click_practice_next_step_button,
+            page_state.FORMAL_START: self.click_formal_answer_button,
+        }
         
-        while attempt < max_attempts:
-            attempt += 1
-            print(f"\n第 {attempt} 次尝试导航...")
-            
-            # 等待页面加载
-            if not self.wait_for_page_load():
-                print("页面加载失败，继续尝试...")
-                continue
-            
-            # 尝试点击各种可能的按钮
-            buttons_clicked = False
+        max_attempts = 10  # 最多执行10次状态转换
+        state = self.page_classifier.wait_for_state_change(None, timeout=self.wait_timeout)
+        
+        for attempt in range(1, max_attempts + 1):
+            current = state["state"]
+            print(f"\n第 {attempt} 次导航，当前页面: {current}")
             
-            # 1. 优先尝试点击进入试卷按钮（带5秒等待）
-            if self.click_enter_test_button():
-                buttons_clicked = True
-                # 点击进入试卷后，等待页面加载，然后尝试点击继续答题按钮
-                print("等待页面加载...")
-                Utils.random_delay(3, 5)
-                
-                # 尝试点击继续答题按钮
-                if self.click_continue_button():
-                    print("成功点击继续答题按钮")
-                    Utils.random_delay(2, 3)
-                    
-                    # 点击继续答题后，等待页面加载，然后尝试点击下一步按钮
-                    print("等待页面加载...")
-                    Utils.random_delay(3, 5)
-                    
-                    # 尝试点击下一步按钮（答题说明页面）
-                    if self.click_next_step_button():
-                        print("成功点击下一步按钮")
-                        Utils.random_delay(2, 3)
-                        
-                        # 点击答题说明下一步后，等待页面加载，然后尝试点击练习题下一步按钮
-                        print("等待页面加载...")
-                        Utils.random_delay(3, 5)
-                        
-                        # 尝试点击练习题下一步按钮
-                        if self.click_practice_next_step_button():
-                            print("成功点击练习题下一步按钮")
-                            Utils.random_delay(2, 3)
-                            
-                            # 点击练习题下一步后，等待页面加载，然后尝试点击正式答题按钮
-                            print("等待页面加载...")
-                            Utils.random_delay(3, 5)
-                            
-                            # 尝试点击正式答题按钮
-                            if self.click_formal_answer_button():
-                                print("成功点击正式答题按钮，进入答题区域")
-                                return True  # 直接返回，不再继续尝试其他按钮
-                            else:
-                                print("未找到正式答题按钮，可能已经进入答题区域")
-                        else:
-                            print("未找到练习题下一步按钮，可能已经进入答题区域")
-                    else:
-                        print("未找到下一步按钮，可能已经进入答题区域")
-                else:
-                    print("未找到继续答题按钮，可能已经进入答题区域")
-                continue
+            if current == page_state.QUESTION:
+                print("已到达答题区域！")
+                return True
             
-            # 2. 尝试点击继续答题/去答题按钮
-            if self.click_continue_button():
-                buttons_clicked = True
-                # 点击继续答题后，尝试点击下一步按钮
-                Utils.random_delay(2, 3)
-                if self.click_next_step_button():
-                    print("成功点击下一步按钮")
-                    Utils.random_delay(2, 3)
-                    
-                    # 点击答题说明下一步后，尝试点击练习题下一步按钮
-                    Utils.random_delay(2, 3)
-                    if self.click_practice_next_step_button():
-                        print("成功点击练习题下一步按钮")
-                        Utils.random_delay(2, 3)
-                        
-                        # 点击练习题下一步后，尝试点击正式答题按钮
-                        Utils.random_delay(2, 3)
-                        if self.click_formal_answer_button():
-                            print("成功点击正式答题按钮，进入答题区域")
-                            return True  # 直接返回，不再继续尝试其他按钮
-                continue
+            if current == page_state.FINISHED:
+                print("测试已完成，无需导航")
+                return False
             
-            # 3. 尝试点击下一步按钮（答题说明页面）
-            if self.click_next_step_button():
-                buttons_clicked = True
-                # 点击答题说明下一步后，尝试点击练习题下一步按钮
-                Utils.random_delay(2, 3)
-                if self.click_practice_next_step_button():
-                    print("成功点击练习题下一步按钮")
-                    Utils.random_delay(2, 3)
+            action = transitions.get(current)
+            if action:
+                if not action():
+                    # 操作没有执行，页面不会变化，立即重新识别而不是等到超时
+                    print(f"页面 {current} 的操作执行失败，重新识别页面...")
+                    state = self.page_classifier.classify()
+                    continue
+            else:
+                # 无法识别的页面，退回通用按钮尝试
+                print(f"无法识别当前页面，尝试通用按钮: {state.get('buttons')}")
+                if not (self.click_start_button() or self.click_next_button() or self.click_confirm_button()):
+                    try:
+                        print("尝试按回车键...")
+                        self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.RETURN)
+                    except Exception:
+                        pass
                     
-                    # 点击练习题下一步后，尝试点击正式答题按钮
-                    Utils.random_delay(2, 3)
-                    if self.click_formal_answer_button():
-                        print("成功点击正式答题按钮，进入答题区域")
-                        return True  # 直接返回，不再继续尝试其他按钮
-                continue
-            
-            # 4. 尝试点击练习题下一步按钮
-            if self.click_practice_next_step_button():
-                buttons_clicked = True
-                # 点击练习题下一步后，尝试点击正式答题按钮
-                Utils.random_delay(2, 3)
-                if self.click_formal_answer_button():
-                    print("成功点击正式答题按钮，进入答题区域")
-                    return True  # 直接返回，不再继续尝试其他按钮
-                continue
-            
-            # 5. 尝试点击正式答题按钮
-            if self.click_formal_answer_button():
-                buttons_clicked = True
-                print("成功点击正式答题按钮，进入答题区域")
-                return True  # 直接返回，不再继续尝试其他按钮
-            
-            # 4. 尝试点击开始答题按钮
-            if self.click_start_button():
-                buttons_clicked = True
-                continue
-            
-            # 5. 尝试点击通用下一步按钮
-            if self.click_next_button():
-                buttons_clicked = True
-                continue
-            
-            # 5. 尝试点击确认按钮
-            if self.click_confirm_button():
-                buttons_clicked = True
-                continue
-            
-            # 6. 尝试按回车键
-            try:
-                print("尝试按回车键...")
-                self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.RETURN)
-                buttons_clicked = True
-                Utils.random_delay(2, 3)
-                continue
-            except Exception:
-                pass
+                    # 检查是否已经到达答题区域
+                    if self.is_in_test_area():
+                        print("已到达答题区域！")
+                        return True
             
-            if not buttons_clicked:
-                print(f"第 {attempt} 次尝试未找到可点击的按钮")
-                
-                # 检查是否已经到达答题区域
-                if self.is_in_test_area():
-                    print("已到达答题区域！")
-                    return True
-                
-                # 等待一下再继续
-                Utils.random_delay(3, 5)
+            # 等待页面离开当前状态，或同一状态的页面内容已更新（多页说明、多道练习题）
+            state = self.page_classifier.wait_for_state_change(
+                current, timeout=self.wait_timeout, previous_fingerprint=state.get("fingerprint")
+            )
         
         print("导航到答题区域失败")
         return False
     
+    @profiled("locate")
     def is_in_test_area(self) -> bool:
-        """检查是否已进入答题区域"""
-        # 检查答题区域的特征元素
+        """检查是否已进入答题区域：先用页面状态识别，识别不是题目页时再用一次合并查询检查通用特征元素"""
+        if self.page_classifier.classify()["state"] == page_state.QUESTION:
+            print("检测到答题区域: 题目页")
+            return True
+        
+        # 答题区域的通用特征元素，合并为一个选择器，只发一次查找请求
         test_indicators = [
             ".question", ".test-question", ".question-item",
             ".option", ".choice", ".answer-option",
@@ -1014,17 +867,16 @@ class ButtonHandler:
             ".test-content", ".quiz-content", ".assessment-content"
         ]
         
-        for indicator in test_indicators:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, indicator)
-                if elements:
-                    print(f"检测到答题区域特征元素: {indicator}")
-                    return True
-            except Exception:
-                continue
+        try:
+            if self.driver.find_elements(By.CSS_SELECTOR, ", ".join(test_indicators)):
+                print("检测到答题区域特征元素")
+                return True
+        except Exception:
+            pass
         
         return False
     
+    @profiled("navigation")
     def handle_modal_dialogs(self) -> bool:
         """处理可能出现的模态对话框"""
         modal_selectors = [
@@ -1056,7 +908,7 @@ class ButtonHandler:
                     # 如果找不到关闭按钮，尝试按ESC键
                     try:
                         self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
-                        Utils.random_delay(1, 2)
+                        waits.until("dismiss_modal", lambda: Utils.is_gone(modal))
                         return True
                     except Exception:
                         pass
@@ -0,0 +1,127 @@
+"""
+断点续答模块
+配置 settings.checkpoint_file 后，每答完一道题就把题目指纹、选择的答案和答题后的页面状态写入检查点文件；
+浏览器崩溃或网络中断后再设置 settings.resume（或 assessment_runner.py --resume）重新运行，
+程序会连接浏览器、识别当前页面，在题目页上直接从下一题继续，不再重复导航，已答过的题目也不再重新匹配
+"""
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import page_state
+from profiler import profiled
+
+
+class Checkpoint:
+    """断点续答类"""
+
+    def __init__(self, path: Optional[str], kind: str, test_url: str = "", resume: bool = False):
+        self.path = path  # 检查点文件，None 表示不记录
+        self.kind = kind  # adjective / single_choice / assessment
+        self.test_url = test_url
+        self.questions: List[Dict[str, Any]] = []  # 已回答的题目，按题号排列
+        self.last_page: Dict[str, Any] = {}  # 最近一次答题后的页面状态
+        self.resuming = False
+        if resume:
+            self.resuming = self.load()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], kind: str, test_url: str = "") -> "Checkpoint":
+        """根据 settings 创建：配置了 checkpoint_file 时才记录（默认不记录）；
+        resume 为 true 时读取已有的检查点"""
+        return cls(settings.get("checkpoint_file") or None, kind, test_url, bool(settings.get("resume")))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    @property
+    def last_number(self) -> int:
+        """最后一道已回答题目的题号，没有时为 0"""
+        return self.questions[-1]["number"] if self.questions else 0
+
+    def load(self) -> bool:
+        """读取检查点，文件不存在、测试链接不同或测评已完成时返回 False"""
+        if not self.enabled:
+            print("未配置 checkpoint_file，无法恢复，从头开始答题")
+            return False
+        if not os.path.exists(self.path):
+            print("没有可恢复的检查点，从头开始答题")
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"读取检查点失败，从头开始答题: {e}")
+            return False
+        if data.get("kind") != self.kind or (self.test_url and data.get("test_url") != self.test_url):
+            print("检查点与当前测评不一致，从头开始答题")
+            return False
+        if data.get("completed"):
+            print("检查点记录的测评已完成，从头开始答题")
+            return False
+        self.questions = data.get("questions", [])
+        self.last_page = data.get("last_page", {})
+        print(f"已读取检查点: 已回答 {len(self.questions)} 道题，最后一题为第 {self.last_number} 题")
+        return True
+
+    def _save(self, completed: bool = False):
+        """先写临时文件再替换，中途崩溃也不会留下损坏的检查点"""
+        data = {
+            "kind": self.kind,
+            "test_url": self.test_url,
+            "updated_at": time.time(),
+            "completed": completed,
+            "questions": self.questions,
+            "last_page": self.last_page,
+        }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+    @profiled("record")
+    def record(self, number: int, fingerprint: str, answer: Dict[str, Any], next_fingerprint: Optional[str]):
+        """记录一道已回答的题目：答题前的题目指纹、选择的答案，以及答题后页面的指纹"""
+        if not self.enabled:
+            return
+        self.questions.append({"number": number, "fingerprint": fingerprint, **answer})
+        self.last_page = {
+            "state": "question" if next_fingerprint else "unknown",
+            "fingerprint": next_fingerprint or "",
+            "next_number": number + 1,
+        }
+        try:
+            self._save()
+        except Exception as e:
+            print(f"写入检查点失败: {e}")
+
+    def resume_here(self, classifier) -> bool:
+        """恢复模式下识别当前页面，已经停在题目页时返回 True（调用方跳过打开链接和导航）"""
+        if not self.resuming:
+            return False
+        state = classifier.classify()["state"]
+        if state != page_state.QUESTION:
+            print(f"当前页面为 {state}，重新打开测试链接并导航后从第 {self.last_number + 1} 题继续")
+            return False
+        print(f"当前页面是题目页，跳过导航，从第 {self.last_number + 1} 题继续")
+        return True
+
+    def find(self, key: str, value: Any) -> Optional[Dict[str, Any]]:
+        """查找已回答题目中 key 等于 value 的记录（最近的优先），用于恢复后不再重新匹配"""
+        if not value:
+            return None
+        for question in reversed(self.questions):
+            if question.get(key) == value:
+                return question
+        return None
+
+    def finish(self):
+        """测评完成，标记检查点，之后的 resume 不再使用它"""
+        if not self.enabled or not self.questions:
+            return
+        try:
+            self._save(completed=True)
+        except Exception as e:
+            print(f"写入检查点失败: {e}")
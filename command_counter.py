@@ -0,0 +1,252 @@
+"""
+WebDriver命令统计模块
+每个 WebDriver 调用都是一次发往 chromedriver 的 HTTP 请求，这里按命令类型统计调用次数，
+并按题目和调用方法汇总，支持单题往返次数预算告警
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional
+
+from selenium.common.exceptions import NoSuchElementException
+
+# 项目目录，用于在调用栈中定位发起命令的项目方法
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 统计时跳过的包装层文件
+_SKIP_FILES = {os.path.join(PROJECT_DIR, name) for name in ("command_counter.py", "profiler.py")}
+
+# 文件名 -> 是否为项目顶层模块（项目目录下的 venv、.venv 中的第三方包不算）
+_PROJECT_FILES: Dict[str, bool] = {}
+
+# WebDriver 命令名 -> 统计类别
+COMMAND_CATEGORIES = {
+    "findElement": "find_element",
+    "findChildElement": "find_element",
+    "findElements": "find_elements",
+    "findChildElements": "find_elements",
+    "w3cExecuteScript": "execute_script",
+    "w3cExecuteScriptAsync": "execute_script",
+    "getElementText": "text",
+    "clickElement": "click",
+    "get": "navigate",
+    "getPageSource": "page_source",
+    "getElementProperty": "get_property",
+    "isElementEnabled": "is_enabled",
+    "sendKeysToElement": "send_keys",
+}
+
+# 查找元素的命令（空结果会被隐式等待阻塞）
+FIND_COMMANDS = {"findElement", "findChildElement", "findElements", "findChildElements"}
+
+
+class CommandCounter:
+    """WebDriver命令统计类"""
+
+    def __init__(self, budget: Optional[int] = None):
+        self.budget = budget  # 单题往返次数预算，None 表示不检查
+        self.total = 0
+        self.by_type: Dict[str, int] = {}
+        self.by_method: Dict[str, Dict[str, int]] = {}
+        self.by_question: Dict[int, Dict[str, int]] = {}
+        self.current_question: Optional[int] = None
+        self.over_budget = []  # 超出预算的题号
+        # 没有找到元素的查找：隐式等待下每次都会阻塞到超时
+        self.empty_lookups = 0
+        self.empty_by_method: Dict[str, int] = {}
+        self.implicit_wait = 0.0          # 当前会话的隐式等待（秒）
+        self.polling = 0                  # 正在进行的带等待上限的查找，轮询中的空结果不单独计数
+        self.avoided_implicit_wait = 0.0  # 显式等待模式下原本配置的隐式等待（秒）
+        # 带等待上限的查找（显式等待、WebDriverWait）：次数、等到上限仍为空的次数、实际等待时间
+        self.timed_lookups = 0
+        self.timed_empty = 0
+        self.timed_seconds = 0.0
+        self.last_find_empty = False
+
+    @classmethod
+    def install(cls, driver, budget: Optional[int] = None) -> "CommandCounter":
+        """包装 driver.execute，所有 WebDriver 命令（包括元素命令）都会经过这里；
+        同一个 driver 只安装一次，多个自动化实例共用一个浏览器时共用同一个统计"""
+        existing = getattr(driver, "command_counter", None)
+        if isinstance(existing, cls):
+            if budget and not existing.budget:
+                existing.budget = budget
+            return existing
+        counter = cls(budget)
+        counter.implicit_wait = getattr(driver, "implicit_wait_seconds", 0) or 0
+        counter.avoided_implicit_wait = getattr(driver, "avoided_implicit_wait", 0) or 0
+        original_execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            counter.record(driver_command, params)
+            if driver_command not in FIND_COMMANDS:
+                return original_execute(driver_command, params)
+            try:
+                response = original_execute(driver_command, params)
+            except NoSuchElementException:
+                counter.record_empty()
+                raise
+            if not (response or {}).get("value"):
+                counter.record_empty()
+            else:
+                counter.last_find_empty = False
+            return response
+
+        driver.execute = counted_execute
+        driver.command_counter = counter
+        if budget:
+            print(f"已启用WebDriver命令统计，单题预算: {budget} 次往返")
+        return counter
+
+    @staticmethod
+    def categorize(driver_command: str, params: Optional[dict]) -> str:
+        """确定命令类别"""
+        category = COMMAND_CATEGORIES.get(driver_command, driver_command)
+        if category == "execute_script" and params:
+            # Selenium 4 的 get_attribute / is_displayed 通过带标记的脚本实现
+            script = params.get("script", "")
+            if script.startswith("/* getAttribute */"):
+                return "get_attribute"
+            if script.startswith("/* isDisplayed */"):
+                return "is_displayed"
+        return category
+
+    @staticmethod
+    def _is_project_file(filename: str) -> bool:
+        """是否为项目顶层模块"""
+        result = _PROJECT_FILES.get(filename)
+        if result is None:
+            path = os.path.abspath(filename)
+            result = os.path.dirname(path) == PROJECT_DIR and path not in _SKIP_FILES
+            _PROJECT_FILES[filename] = result
+        return result
+
+    @staticmethod
+    def _caller() -> str:
+        """查找发起命令的项目方法"""
+        frame = sys._getframe(2)
+        while frame is not None:
+            if CommandCounter._is_project_file(frame.f_code.co_filename):
+                code = frame.f_code
+                return getattr(code, "co_qualname", code.co_name)
+            frame = frame.f_back
+        return "<unknown>"
+
+    def record(self, driver_command: str, params: Optional[dict] = None):
+        """记录一次命令"""
+        category = self.categorize(driver_command, params)
+        self.total += 1
+        self.by_type[category] = self.by_type.get(category, 0) + 1
+
+        method = self.by_method.setdefault(self._caller(), {})
+        method[category] = method.get(category, 0) + 1
+
+        if self.current_question is not None:
+            question = self.by_question.setdefault(self.current_question, {})
+            question[category] = question.get(category, 0) + 1
+
+    @staticmethod
+    def of(driver) -> Optional["CommandCounter"]:
+        """获取 driver（或元素所属 driver）上安装的命令统计，没有安装时返回 None"""
+        counter = getattr(driver, "command_counter", None)
+        if counter is None:
+            counter = getattr(getattr(driver, "parent", None), "command_counter", None)
+        return counter if isinstance(counter, CommandCounter) else None
+
+    @contextmanager
+    def lookup(self):
+        """一次带等待上限的逻辑查找（内部多次轮询）：轮询中的空结果不计为隐式等待阻塞，
+        只统计查找次数、最后一次轮询仍为空的次数和实际等待时间；嵌套的查找只按最外层统计"""
+        outermost = not self.polling
+        if outermost:
+            self.last_find_empty = False
+        self.polling += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.polling -= 1
+            if outermost:
+                self.timed_lookups += 1
+                self.timed_seconds += time.perf_counter() - start
+                if self.last_find_empty:
+                    self.timed_empty += 1
+
+    @staticmethod
+    def timed_lookup(driver):
+        """driver 上安装了命令统计时返回 lookup()，否则返回空的上下文管理器"""
+        counter = CommandCounter.of(driver)
+        return counter.lookup() if counter else nullcontext()
+
+    def record_empty(self):
+        """记录一次没有找到元素的查找；带等待上限的查找中只记录最后一次轮询的结果"""
+        if self.polling:
+            self.last_find_empty = True
+            return
+        self.empty_lookups += 1
+        caller = self._caller()
+        self.empty_by_method[caller] = self.empty_by_method.get(caller, 0) + 1
+
+    def print_stall_report(self):
+        """打印空查询统计：显式等待模式下为避免的隐式等待阻塞（只计不带等待上限的空查询），
+        否则为隐式等待造成的阻塞；带等待上限的查找单独报告实际等待时间"""
+        if self.timed_lookups:
+            print(f"\n带等待上限的查找: {self.timed_lookups} 次，其中 {self.timed_empty} 次等到上限仍未找到，"
+                  f"实际等待共约 {self.timed_seconds:.1f} 秒")
+        if not self.empty_lookups:
+            return
+        if self.avoided_implicit_wait:
+            print(f"\n显式等待模式避免了 {self.empty_lookups} 次隐式等待阻塞（只计立即返回的空查询，"
+                  f"每次 {self.avoided_implicit_wait} 秒，共约 {self.empty_lookups * self.avoided_implicit_wait:.1f} 秒）")
+        elif self.implicit_wait:
+            print(f"\n{self.empty_lookups} 次空查询各被隐式等待阻塞 {self.implicit_wait} 秒"
+                  f"（共约 {self.empty_lookups * self.implicit_wait:.1f} 秒），可在 settings 中启用 explicit_waits")
+        else:
+            print(f"\n空查询: {self.empty_lookups} 次（未设置隐式等待，没有阻塞）")
+        rows = sorted(self.empty_by_method.items(), key=lambda x: -x[1])
+        for method, count in rows[:5]:
+            print(f"  {method[:45]:<46}{count:>6}")
+
+    def begin_question(self, question_num: int):
+        """开始统计一道题"""
+        self.end_question()
+        self.current_question = question_num
+
+    def end_question(self):
+        """结束当前题目的统计，并检查预算"""
+        if self.current_question is None:
+            return
+        count = sum(self.by_question.get(self.current_question, {}).values())
+        if self.budget and count > self.budget:
+            self.over_budget.append(self.current_question)
+            print(f"警告: 第 {self.current_question} 题共 {count} 次WebDriver往返，超出预算 {self.budget}")
+        self.current_question = None
+
+    def print_report(self):
+        """打印命令统计报告"""
+        self.end_question()
+        print(f"\n{'=' * 60}")
+        print(f"WebDriver命令统计: 共 {self.total} 次往返")
+        print(f"{'=' * 60}")
+        for category, count in sorted(self.by_type.items(), key=lambda x: -x[1]):
+            print(f"  {category:<20}{count:>8}")
+
+        print("\n按方法统计（前15）:")
+        rows = sorted(self.by_method.items(), key=lambda x: -sum(x[1].values()))
+        for method, categories in rows[:15]:
+            detail = ", ".join(f"{k}={v}" for k, v in sorted(categories.items(), key=lambda x: -x[1]))
+            print(f"  {method[:45]:<46}{sum(categories.values()):>6}  ({detail})")
+
+        if self.by_question:
+            counts = {num: sum(c.values()) for num, c in self.by_question.items()}
+            worst = max(counts, key=counts.get)
+            print(f"\n按题目统计: 共 {len(counts)} 题，平均每题 {sum(counts.values()) / len(counts):.1f} 次，"
+                  f"最多为第 {worst} 题 {counts[worst]} 次")
+            if self.budget:
+                if self.over_budget:
+                    print(f"超出预算 {self.budget} 的题目: {self.over_budget}")
+                else:
+                    print(f"所有题目均在预算 {self.budget} 次以内")
+        self.print_stall_report()
+        print(f"{'=' * 60}")
@@ -3,14 +3,21 @@
 """
 import json
 import os
+import unicodedata
 from typing import Dict, Any, List, Optional
 
 class Config:
     """配置管理类"""
     
+    # 否定前缀：子串匹配时去掉的前缀中含有这些字时意思相反（如"不自信的"与"自信的"），不算匹配
+    NEGATION_CHARS = "不没无非未"
+    # 含有否定字但不是否定的修饰词
+    NON_NEGATING_WORDS = ("非常",)
+    
     def __init__(self, config_file: str = "answers.json"):
         self.config_file = config_file
         self.config = self.load_config()
+        self.build_adjective_index()
     
     def load_config(self) -> Dict[str, Any]:
         """加载配置文件"""
@@ -72,10 +79,93 @@ class Config:
         """获取等待超时时间"""
         return self.get_settings().get("wait_timeout", 10)
     
-    def get_adjective_priority(self, adjective: str) -> int:
-        """获取形容词的优先级（数字越小优先级越高）"""
+    def get_transition_timeout(self) -> float:
+        """获取题目切换等待上限（秒）"""
+        return self.get_settings().get("transition_timeout", 10)
+    
+    def get_transition_poll_interval(self) -> Optional[float]:
+        """获取题目切换轮询间隔（秒），未配置时返回 None（使用具名等待 question_change 的配置）"""
+        return self.get_settings().get("transition_poll_interval")
+    
+    def get_command_budget(self) -> Optional[int]:
+        """获取单题WebDriver往返次数预算（未配置时不检查）"""
+        return self.get_settings().get("command_budget")
+    
+    @classmethod
+    def is_negated(cls, prefix: str) -> bool:
+        """子串匹配时被去掉的前缀是否含有否定词"""
+        for word in cls.NON_NEGATING_WORDS:
+            prefix = prefix.replace(word, "")
+        return any(ch in cls.NEGATION_CHARS for ch in prefix)
+    
+    @staticmethod
+    def normalize_adjective(text: str) -> str:
+        """规范化形容词文本：全半角统一、去除空白和标点、小写"""
+        text = unicodedata.normalize("NFKC", text or "")
+        return "".join(
+            ch for ch in text
+            if not unicodedata.category(ch).startswith(("P", "Z", "C"))
+        ).lower()
+    
+    def build_adjective_index(self):
+        """构建形容词优先级索引（加载配置时调用一次）"""
         ranking = self.get_adjective_ranking()
-        try:
-            return ranking.index(adjective)
-        except ValueError:
-            return len(ranking)  # 如果不在列表中，返回最低优先级
+        self._adjective_count = len(ranking)
+        self._exact_priority: Dict[str, int] = {}
+        self._normalized_priority: Dict[str, int] = {}
+        # 规范化后排序项的所有子串 -> 包含该子串的最高优先级，用于"页面文本是排序项的一部分"的情况
+        # （子串前面的部分含有否定词时不收录，避免"自信的"匹配到"不自信的"）
+        self._substring_priority: Dict[str, int] = {}
+        self._priority_cache: Dict[str, int] = {}
+        
+        for index, adjective in enumerate(ranking):
+            self._exact_priority.setdefault(adjective, index)
+            normalized = self.normalize_adjective(adjective)
+            if not normalized:
+                continue
+            self._normalized_priority.setdefault(normalized, index)
+            for start in range(len(normalized)):
+                if self.is_negated(normalized[:start]):
+                    continue
+                for end in range(start + 1, len(normalized) + 1):
+                    self._substring_priority.setdefault(normalized[start:end], index)
+    
+    def get_adjective_priority(self, adjective: str) -> int:
+        """获取形容词的优先级（数字越小优先级越高）
+        
+        依次尝试：精确匹配 → 规范化匹配 → 子串匹配（排序项包含于页面文本或页面文本包含于排序项），
+        子串匹配时多出的前缀含有否定词（不/没/无/非/未）的不算匹配，
+        结果会被缓存，同一形容词重复查询为 O(1)。
+        """
+        cached = self._priority_cache.get(adjective)
+        if cached is not None:
+            return cached
+        
+        priority = self._exact_priority.get(adjective)
+        if priority is None:
+            normalized = self.normalize_adjective(adjective)
+            priority = self._normalized_priority.get(normalized)
+            if priority is None and normalized:
+                candidates = []
+                # 页面文本是某个排序项的一部分
+                if normalized in self._substring_priority:
+                    candidates.append(self._substring_priority[normalized])
+                # 某个排序项出现在页面文本中（页面文本带有修饰，但修饰不能是否定）
+                for start in range(len(normalized)):
+                    if self.is_negated(normalized[:start]):
+                        continue
+                    for end in range(start + 1, len(normalized) + 1):
+                        index = self._normalized_priority.get(normalized[start:end])
+                        if index is not None:
+                            candidates.append(index)
+                if candidates:
+                    priority = min(candidates)
+        
+        if priority is None:
+            priority = self._adjective_count  # 如果不在列表中，返回最低优先级
+        self._priority_cache[adjective] = priority
+        return priority
+    
+    def get_adjective_priorities(self, adjectives: List[str]) -> List[int]:
+        """批量获取一组形容词的优先级"""
+        return [self.get_adjective_priority(adjective) for adjective in adjectives]
@@ -0,0 +1,78 @@
+"""
+DOM快照模块
+通过一次 execute_script 调用获取当前题目全部选项的文本、属性、可见性和位置
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from selenium.webdriver.remote.webelement import WebElement
+from profiler import profiled
+
+# 在浏览器内执行的快照脚本
+# 文本提取顺序与 extract_*_text 保持一致：元素文本 → 子元素文本 → title/data-text/value 属性
+SNAPSHOT_SCRIPT = """
+var selector = arguments[0];
+var nodes = arguments[1] || (selector ? document.querySelectorAll(selector) : []);
+var attrNames = ['title', 'data-text', 'value', 'id', 'class', 'data-cls'];
+var result = [];
+for (var i = 0; i < nodes.length; i++) {
+    var el = nodes[i];
+    var text = (el.innerText || '').trim();
+    if (!text) {
+        var children = el.querySelectorAll('span, div, p, label');
+        for (var j = 0; j < children.length; j++) {
+            var sub = (children[j].innerText || '').trim();
+            if (sub) { text = sub; break; }
+        }
+    }
+    var attributes = {};
+    for (var k = 0; k < attrNames.length; k++) {
+        attributes[attrNames[k]] = el.getAttribute(attrNames[k]);
+    }
+    if (!text) {
+        text = (attributes['title'] || attributes['data-text'] || el.value || '').trim();
+    }
+    var rect = el.getBoundingClientRect();
+    var style = window.getComputedStyle(el);
+    result.push({
+        index: i,
+        element: el,
+        text: text,
+        attributes: attributes,
+        visible: rect.width > 0 && rect.height > 0 && style.display !== 'none' && style.visibility !== 'hidden',
+        rect: {x: rect.x, y: rect.y, width: rect.width, height: rect.height}
+    });
+}
+return result;
+"""
+
+
+class DomSnapshot:
+    """DOM快照类"""
+
+    @staticmethod
+    @profiled("extract")
+    def snapshot_options(driver, selector: Optional[str] = None,
+                         elements: Optional[List[WebElement]] = None) -> List[Dict[str, Any]]:
+        """获取选项快照
+
+        传入 elements 时直接对这些元素取快照，否则按 selector 在页面中查找。
+        返回的每一项包含 index、element、text、attributes、visible、rect。
+        """
+        try:
+            snapshot = driver.execute_script(SNAPSHOT_SCRIPT, selector, elements or None)
+            return snapshot or []
+        except Exception as e:
+            print(f"获取选项快照失败: {e}")
+            return []
+
+    @staticmethod
+    def text_pairs(snapshot: List[Dict[str, Any]]) -> List[Tuple[str, WebElement]]:
+        """将快照转换为 (文本, 元素) 列表，跳过文本为空的选项"""
+        pairs = []
+        for option in snapshot:
+            text = option.get("text", "")
+            print(f"元素 {option.get('index')}: 文本='{text}'")
+            if text:
+                pairs.append((text, option.get("element")))
+            else:
+                print(f"元素 {option.get('index')} 文本为空，跳过")
+        return pairs
@@ -0,0 +1,204 @@
+"""
+ChromeDriver解析模块
+按已安装 Chrome 的主版本缓存可用的 ChromeDriver 路径，启动时只做本地版本校验，
+只有版本不一致或缓存失效时才通过 webdriver_manager 下载
+"""
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+from typing import Any, Dict, Optional
+
+from profiler import profiled
+from utils import Utils
+
+DEFAULT_CACHE_FILE = "chromedriver_cache.json"
+
+# 各系统上 Chrome 的常见可执行文件
+LINUX_CHROME_COMMANDS = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"]
+MAC_CHROME_PLIST = "/Applications/Google Chrome.app/Contents/Info.plist"
+WINDOWS_CHROME_DIRS = [
+    os.path.join(os.environ.get("PROGRAMFILES", r"C:\Program Files"), "Google", "Chrome", "Application"),
+    os.path.join(os.environ.get("PROGRAMFILES(X86)", r"C:\Program Files (x86)"), "Google", "Chrome", "Application"),
+    os.path.join(os.environ.get("LOCALAPPDATA", ""), "Google", "Chrome", "Application"),
+]
+
+_VERSION_PATTERN = re.compile(r"(\d+)\.\d+\.\d+(?:\.\d+)?")
+
+
+class ChromeDriverResolver:
+    """ChromeDriver解析类"""
+
+    def __init__(self, cache_file: str = DEFAULT_CACHE_FILE):
+        self.cache_file = cache_file
+        # Chrome 主版本 -> {"path": 驱动路径, "version": 驱动版本}
+        self.cache: Dict[str, Dict[str, Any]] = self.load()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """加载缓存文件"""
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"加载ChromeDriver缓存失败: {e}")
+            return {}
+
+    def save(self):
+        """保存缓存文件"""
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"保存ChromeDriver缓存失败: {e}")
+
+    @staticmethod
+    def parse_version(text: str) -> Optional[str]:
+        """从命令输出中提取版本号"""
+        match = _VERSION_PATTERN.search(text or "")
+        return match.group(0) if match else None
+
+    @staticmethod
+    def major(version: Optional[str]) -> Optional[str]:
+        """取主版本号"""
+        return version.split(".")[0] if version else None
+
+    @staticmethod
+    def _run_version(command: str) -> Optional[str]:
+        """执行 `<command> --version` 并解析版本号"""
+        try:
+            output = subprocess.run([command, "--version"], capture_output=True, text=True, timeout=5).stdout
+            return ChromeDriverResolver.parse_version(output)
+        except Exception:
+            return None
+
+    def detect_chrome_version(self) -> Optional[str]:
+        """检测本机 Chrome 版本（只读本地信息，不访问网络）"""
+        system = platform.system().lower()
+        try:
+            if system == "windows":
+                try:
+                    import winreg
+                    key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon")
+                    return self.parse_version(winreg.QueryValueEx(key, "version")[0])
+                except Exception:
+                    pass
+                # 安装目录下有以版本号命名的子目录
+                for directory in WINDOWS_CHROME_DIRS:
+                    if os.path.isdir(directory):
+                        versions = [name for name in os.listdir(directory) if _VERSION_PATTERN.fullmatch(name)]
+                        if versions:
+                            return max(versions, key=lambda v: [int(p) for p in v.split(".")])
+            elif system == "darwin":
+                if os.path.exists(MAC_CHROME_PLIST):
+                    import plistlib
+                    with open(MAC_CHROME_PLIST, 'rb') as f:
+                        return self.parse_version(plistlib.load(f).get("CFBundleShortVersionString", ""))
+            else:
+                for command in LINUX_CHROME_COMMANDS:
+                    if shutil.which(command):
+                        version = self._run_version(command)
+                        if version:
+                            return version
+        except Exception as e:
+            print(f"检测Chrome版本失败: {e}")
+        return None
+
+    def driver_version(self, path: Optional[str]) -> Optional[str]:
+        """本地校验驱动：文件存在且能输出版本号"""
+        if not path or not os.path.exists(path):
+            return None
+        return self._run_version(path)
+
+    def _accept(self, path: Optional[str], chrome_major: Optional[str]) -> Optional[str]:
+        """驱动可用且主版本与 Chrome 一致（Chrome 版本未知时只要求驱动可用）时返回驱动版本"""
+        version = self.driver_version(path)
+        if not version:
+            return None
+        if chrome_major and self.major(version) != chrome_major:
+            return None
+        return version
+
+    def _remember(self, key: str, path: str, version: str):
+        """记录可用的驱动"""
+        self.cache[key] = {"path": path, "version": version}
+        self.save()
+
+    def _download(self) -> Optional[str]:
+        """通过 webdriver_manager 下载与本机 Chrome 匹配的驱动"""
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            return ChromeDriverManager().install()
+        except Exception as e:
+            print(f"下载ChromeDriver失败: {e}")
+            return Utils.get_chromedriver_path()
+
+    @profiled("navigation", "resolve_chromedriver")
+    def resolve(self, force_download: bool = False) -> Optional[str]:
+        """返回可用的 ChromeDriver 路径，找不到时返回 None
+
+        顺序：缓存（本地校验）→ 系统 PATH 中的 chromedriver → 下载。
+        """
+        chrome_version = self.detect_chrome_version()
+        chrome_major = self.major(chrome_version)
+        key = chrome_major or "unknown"
+        if chrome_version:
+            print(f"检测到Chrome版本: {chrome_version}")
+
+        if not force_download:
+            entry = self.cache.get(key)
+            if entry and self._accept(entry.get("path"), chrome_major):
+                print(f"使用缓存的ChromeDriver: {entry['path']}（{entry.get('version')}）")
+                return entry["path"]
+
+            path_driver = shutil.which("chromedriver")
+            version = self._accept(path_driver, chrome_major)
+            if version:
+                print(f"使用系统PATH中的ChromeDriver: {path_driver}（{version}）")
+                self._remember(key, path_driver, version)
+                return path_driver
+
+        print("本地没有与Chrome版本匹配的ChromeDriver，开始下载...")
+        path = self._download()
+        version = self._accept(path, chrome_major)
+        if not version and path and self.driver_version(path):
+            # 下载到的驱动与 Chrome 主版本不一致，清理 webdriver_manager 缓存后重试一次
+            print("下载的ChromeDriver与Chrome版本不一致，清理缓存后重试...")
+            Utils.clear_webdriver_cache()
+            path = self._download()
+            version = self._accept(path, chrome_major)
+        if version:
+            self._remember(key, path, version)
+            return path
+        return path if self.driver_version(path) else None
+
+    def invalidate(self):
+        """作废当前 Chrome 版本的缓存（缓存的驱动无法启动浏览器时调用）"""
+        key = self.major(self.detect_chrome_version()) or "unknown"
+        if self.cache.pop(key, None) is not None:
+            self.save()
+
+    def create_chrome(self, options, retry: bool = True):
+        """用解析到的驱动启动 Chrome；缓存的驱动启动失败时作废缓存并重新下载一次（retry 为 False 时直接抛出）"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        driver_path = self.resolve()
+        if not driver_path:
+            print("无法获取ChromeDriver，交给Selenium自动查找...")
+            return webdriver.Chrome(service=Service(), options=options)
+
+        print(f"ChromeDriver路径: {driver_path}")
+        try:
+            return webdriver.Chrome(service=Service(driver_path), options=options)
+        except Exception as e:
+            if not retry:
+                raise
+            print(f"使用ChromeDriver启动浏览器失败: {e}")
+            self.invalidate()
+            driver_path = self.resolve(force_download=True)
+            service = Service(driver_path) if driver_path else Service()
+            return webdriver.Chrome(service=service, options=options)
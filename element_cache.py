@@ -0,0 +1,94 @@
+"""
+元素句柄缓存模块
+同一道题内按角色（选项、选框、确定按钮等）缓存已定位的元素句柄，重复使用时不再重新查找；
+使用缓存句柄时遇到 StaleElementReferenceException 会透明地重新定位并重试一次（点击等操作有副作用，
+只有句柄失效时才重试；结果不满足时重试只用于只读操作），
+题目指纹变化（题目切换）时自动清空
+"""
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+T = TypeVar("T")
+
+
+class ElementCache:
+    """元素句柄缓存类"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.handles: Dict[str, Any] = {}
+        self.question_key: Optional[str] = None  # 当前题目的指纹
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0  # 缓存句柄失效后重新定位的次数
+
+    @classmethod
+    def of(cls, driver) -> "ElementCache":
+        """获取 driver 上的元素缓存，没有时创建并挂到 driver 上"""
+        cache = getattr(driver, "element_cache", None)
+        if cache is None:
+            cache = cls(driver)
+            try:
+                driver.element_cache = cache
+            except Exception:
+                pass
+        return cache
+
+    @staticmethod
+    def _usable(handle: Any) -> bool:
+        """只缓存完整的定位结果：非空，元组中没有 None"""
+        if isinstance(handle, tuple):
+            return all(item is not None for item in handle)
+        return bool(handle)
+
+    def begin_question(self, key: Optional[str]):
+        """进入题目（key 为题目指纹），指纹变化时清空缓存"""
+        if key != self.question_key:
+            self.clear()
+            self.question_key = key
+
+    def clear(self):
+        self.handles.clear()
+
+    def put(self, role: str, handle: Any):
+        """保存已在别处定位到的句柄（例如整组作答脚本返回的选框）"""
+        if self._usable(handle):
+            self.handles[role] = handle
+
+    def invalidate(self, role: str):
+        self.handles.pop(role, None)
+
+    def get(self, role: str, resolve: Callable[[], T]) -> T:
+        """返回缓存的句柄，没有时调用 resolve 定位并缓存"""
+        if role in self.handles:
+            self.hits += 1
+            return self.handles[role]
+        self.misses += 1
+        handle = resolve()
+        self.put(role, handle)
+        return handle
+
+    def use(self, role: str, resolve: Callable[[], Any], action: Callable[[Any], T],
+            accept: Optional[Callable[[T], bool]] = None) -> T:
+        """用缓存句柄执行操作；句柄来自缓存且抛出 StaleElementReferenceException 时重新定位后再执行一次。
+        accept 只用于只读操作（如提取文本）：结果不被接受时同样重新定位重试；点击等有副作用的操作不要传入"""
+        cached = role in self.handles
+        handle = self.get(role, resolve)
+        try:
+            result = action(handle)
+            if not cached or accept is None or accept(result):
+                return result
+        except StaleElementReferenceException:
+            if not cached:
+                raise
+        print(f"缓存的元素已失效（{role}），重新定位")
+        self.refreshes += 1
+        self.invalidate(role)
+        return action(self.get(role, resolve))
+
+    def print_report(self):
+        """打印缓存命中统计"""
+        if not self.hits and not self.misses:
+            return
+        print(f"元素缓存: 命中 {self.hits} 次，定位 {self.misses} 次，失效后重新定位 {self.refreshes} 次")
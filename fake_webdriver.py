@@ -0,0 +1,527 @@
+"""
+基于 lxml 的内存假驱动
+实现本项目用到的 Selenium API 子集（查找元素、文本、属性、可见性、点击、滚动和点击脚本、page_source、current_url），
+不启动浏览器，直接在保存的 HTML 上运行按钮处理、选项提取和答案匹配中不依赖注入脚本的部分，供单元测试和微基准测试使用
+
+所有调用都经过 execute()，命令名与 Selenium 一致，因此 CommandCounter 可以照常统计往返次数。
+可见性只根据 hidden 属性、内联 style 和标签判断，不解析样式表。
+项目注入的脚本（快照、页面分类、题目文本等）不做模拟，调用时抛出 JavascriptException，
+需要验证这些脚本时用 micro_benchmark.py --browser 在无头 Chrome 中对模拟站点运行。
+"""
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from lxml import etree, html as lxml_html
+from selenium.common.exceptions import (InvalidSelectorException, JavascriptException,
+                                        NoSuchElementException, StaleElementReferenceException,
+                                        WebDriverException)
+from selenium.webdriver.common.by import By
+
+# 不渲染的标签
+HIDDEN_TAGS = {"head", "script", "style", "template", "noscript", "meta", "link", "title"}
+
+# 块级标签，提取文本时前后换行
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "fieldset", "figure", "footer",
+    "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+    "section", "table", "tr", "ul",
+}
+
+# CSS 复合选择器中的单个片段
+_CSS_TOKEN = re.compile(r"""
+    \s*(?P<comb>[>+~])\s*
+  | (?P<ws>\s+)
+  | (?P<tag>\*|[a-zA-Z][\w-]*)
+  | \.(?P<cls>-?[\w-]+)
+  | \#(?P<id>-?[\w-]+)
+  | \[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[*^$~|]?=)\s*(?P<val>"[^"]*"|'[^']*'|[^\]\s]+)\s*)?\]
+""", re.X)
+
+# 布尔属性，存在即为 "true"
+BOOLEAN_ATTRIBUTES = {"disabled", "checked", "selected", "hidden", "readonly", "required"}
+
+_STYLE_HIDDEN = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.I)
+
+
+def xpath_literal(value: str) -> str:
+    """把字符串转为 XPath 字面量"""
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return "concat('" + "', \"'\", '".join(value.split("'")) + "')"
+
+
+def _split_groups(selector: str) -> List[str]:
+    """按逗号拆分选择器组（忽略引号和方括号内的逗号）"""
+    groups, depth, quote, start = [], 0, None, 0
+    for i, char in enumerate(selector):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            groups.append(selector[start:i])
+            start = i + 1
+    groups.append(selector[start:])
+    return [group.strip() for group in groups]
+
+
+def _attribute_condition(name: str, op: Optional[str], value: Optional[str]) -> str:
+    """属性选择器 → XPath 条件"""
+    attr = f"@{name}"
+    if not op:
+        return attr
+    if value[0] in "'\"":
+        value = value[1:-1]
+    literal = xpath_literal(value)
+    if op == "=":
+        return f"{attr}={literal}"
+    if op == "*=":
+        return f"contains({attr}, {literal})"
+    if op == "^=":
+        return f"starts-with({attr}, {literal})"
+    if op == "$=":
+        return f"substring({attr}, string-length({attr}) - {len(value) - 1})={literal}"
+    if op == "~=":
+        return f"contains(concat(' ', normalize-space({attr}), ' '), {xpath_literal(' ' + value + ' ')})"
+    return f"({attr}={literal} or starts-with({attr}, {xpath_literal(value + '-')}))"
+
+
+def css_to_xpath(selector: str, relative: bool = False) -> str:
+    """把本项目用到的 CSS 选择器子集（标签、类、ID、属性、后代/子/兄弟组合符、逗号分组）转换为 XPath"""
+    prefix = ".//" if relative else "//"
+    paths = []
+    for group in _split_groups(selector):
+        if not group:
+            raise InvalidSelectorException(f"无效的CSS选择器: {selector}")
+        path, tag, conditions, combinator = prefix, None, [], None
+        position = 0
+
+        def flush():
+            nonlocal path, tag, conditions, combinator
+            step = (tag or "*") + "".join(f"[{c}]" for c in conditions)
+            if combinator == "+":
+                path += f"following-sibling::*[1]/self::{step}"
+            elif combinator == "~":
+                path += f"following-sibling::{step}"
+            else:
+                path += step
+            tag, conditions, combinator = None, [], None
+
+        while position < len(group):
+            match = _CSS_TOKEN.match(group, position)
+            if not match or match.end() == position:
+                raise InvalidSelectorException(f"不支持的CSS选择器: {selector}")
+            position = match.end()
+            if match.group("comb") or match.group("ws"):
+                flush()
+                comb = match.group("comb")
+                path += "/" if comb in (">", "+", "~") else "//"
+                combinator = comb
+            elif match.group("tag"):
+                tag = match.group("tag").lower()
+            elif match.group("cls"):
+                conditions.append(
+                    f"contains(concat(' ', normalize-space(@class), ' '), {xpath_literal(' ' + match.group('cls') + ' ')})")
+            elif match.group("id"):
+                conditions.append(f"@id={xpath_literal(match.group('id'))}")
+            else:
+                conditions.append(_attribute_condition(match.group("attr"), match.group("op"), match.group("val")))
+        flush()
+        paths.append(path)
+    return " | ".join(paths)
+
+
+class FakeWebElement:
+    """假元素，对应一个 lxml 节点"""
+
+    def __init__(self, parent: "FakeWebDriver", node, element_id: str):
+        self.parent = parent
+        self.node = node
+        self.id = element_id
+
+    def __eq__(self, other):
+        return isinstance(other, FakeWebElement) and other.node is self.node
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f"<FakeWebElement {self.node.tag} id={self.id}>"
+
+    def _execute(self, command: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        params = dict(params or {})
+        params["id"] = self.id
+        return self.parent.execute(command, params)["value"]
+
+    @property
+    def tag_name(self) -> str:
+        return self._execute("getElementTagName")
+
+    @property
+    def text(self) -> str:
+        return self._execute("getElementText")
+
+    @property
+    def rect(self) -> Dict[str, float]:
+        return self._execute("getElementRect")
+
+    @property
+    def location(self) -> Dict[str, float]:
+        rect = self.rect
+        return {"x": rect["x"], "y": rect["y"]}
+
+    @property
+    def size(self) -> Dict[str, float]:
+        rect = self.rect
+        return {"width": rect["width"], "height": rect["height"]}
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self.parent.execute("w3cExecuteScript", {"script": "/* getAttribute */", "args": [self, name]})["value"]
+
+    def get_property(self, name: str) -> Any:
+        return self._execute("getElementProperty", {"name": name})
+
+    def is_displayed(self) -> bool:
+        return self.parent.execute("w3cExecuteScript", {"script": "/* isDisplayed */", "args": [self]})["value"]
+
+    def is_enabled(self) -> bool:
+        return self._execute("isElementEnabled")
+
+    def is_selected(self) -> bool:
+        return self._execute("isElementSelected")
+
+    def click(self):
+        self._execute("clickElement")
+
+    def send_keys(self, *value):
+        self._execute("sendKeysToElement", {"text": "".join(str(v) for v in value)})
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> "FakeWebElement":
+        return self._execute("findChildElement", {"using": by, "value": value})
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List["FakeWebElement"]:
+        return self._execute("findChildElements", {"using": by, "value": value})
+
+
+class FakeWebDriver:
+    """基于 lxml 的假驱动"""
+
+    def __init__(self, page: Optional[str] = None, url: str = "about:blank",
+                 pages: Optional[Dict[str, str]] = None):
+        self.pages = dict(pages or {})  # URL -> HTML，get() 时优先从这里加载
+        self.current_url = url
+        self.document = None
+        self.clicks: List[FakeWebElement] = []  # 点击记录，按顺序
+        self.click_handler: Optional[Callable[["FakeWebDriver", FakeWebElement], None]] = None
+        self.script_handlers: List[Tuple[str, Callable[..., Any]]] = []
+        self._elements: Dict[str, FakeWebElement] = {}
+        self._node_ids: Dict[Any, str] = {}
+        self._register_default_scripts()
+        self.load(page or "<html><body></body></html>", url)
+
+    @classmethod
+    def from_file(cls, path: str) -> "FakeWebDriver":
+        """从保存的 HTML 文件创建"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read(), url="file://" + os.path.abspath(path))
+
+    # ------------------------------------------------------------------
+    # 文档
+    # ------------------------------------------------------------------
+
+    def load(self, page: str, url: Optional[str] = None):
+        """加载新的 HTML 文档，之前的元素全部失效"""
+        self.document = lxml_html.document_fromstring(page)
+        self._elements = {}
+        self._node_ids = {}
+        if url:
+            self.current_url = url
+
+    def _wrap(self, node) -> FakeWebElement:
+        """同一节点始终返回同一个元素对象"""
+        element_id = self._node_ids.get(node)
+        if element_id is None:
+            element_id = f"fake-{len(self._node_ids) + 1}"
+            self._node_ids[node] = element_id
+            self._elements[element_id] = FakeWebElement(self, node, element_id)
+        return self._elements[element_id]
+
+    def _node(self, element: FakeWebElement):
+        """取元素对应的节点，文档已切换时抛出 StaleElementReferenceException"""
+        if self._elements.get(element.id) is not element:
+            raise StaleElementReferenceException("元素已不在当前文档中")
+        return element.node
+
+    @staticmethod
+    def _in_template(node) -> bool:
+        """template 内容不属于文档树，查询时排除"""
+        return any(ancestor.tag == "template" for ancestor in node.iterancestors())
+
+    def _query(self, root, by: str, value: str, relative: bool) -> List[Any]:
+        """按定位方式查询节点"""
+        if by == By.CSS_SELECTOR:
+            xpath = css_to_xpath(value, relative)
+        elif by == By.XPATH:
+            xpath = value
+        elif by == By.TAG_NAME:
+            xpath = f"{'.' if relative else ''}//{value.lower()}"
+        elif by == By.ID:
+            xpath = f"{'.' if relative else ''}//*[@id={xpath_literal(value)}]"
+        elif by == By.CLASS_NAME:
+            xpath = css_to_xpath("." + value, relative)
+        elif by == By.NAME:
+            xpath = f"{'.' if relative else ''}//*[@name={xpath_literal(value)}]"
+        elif by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+            nodes = root.xpath(".//a" if relative else "//a")
+            if by == By.LINK_TEXT:
+                return [n for n in nodes if self.visible_text(n) == value]
+            return [n for n in nodes if value in self.visible_text(n)]
+        else:
+            raise InvalidSelectorException(f"不支持的定位方式: {by}")
+        try:
+            result = root.xpath(xpath)
+        except etree.XPathError as e:
+            raise InvalidSelectorException(f"无效的选择器 {value}: {e}")
+        return [node for node in result
+                if isinstance(node, etree.ElementBase) and not self._in_template(node)]
+
+    # ------------------------------------------------------------------
+    # 渲染近似
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def displayed(node) -> bool:
+        """可见性：自身及祖先没有被隐藏"""
+        current = node
+        while current is not None:
+            if not isinstance(current.tag, str):
+                return False
+            if current.tag in HIDDEN_TAGS or current.get("hidden") is not None:
+                return False
+            if current.tag == "input" and (current.get("type") or "").lower() == "hidden":
+                return False
+            if _STYLE_HIDDEN.search(current.get("style") or ""):
+                return False
+            current = current.getparent()
+        return True
+
+    @classmethod
+    def visible_text(cls, node) -> str:
+        """近似 innerText：跳过不可见节点，块级元素换行，行内空白合并"""
+        if not cls.displayed(node):
+            return ""
+        parts: List[str] = []
+
+        def walk(current):
+            tag = current.tag if isinstance(current.tag, str) else ""
+            if tag in HIDDEN_TAGS or current.get("hidden") is not None \
+                    or _STYLE_HIDDEN.search(current.get("style") or ""):
+                return
+            if tag == "br":
+                parts.append("\n")
+            block = tag in BLOCK_TAGS
+            if block:
+                parts.append("\n")
+            if current.text and tag:
+                parts.append(current.text)
+            for child in current:
+                walk(child)
+                if child.tail:
+                    parts.append(child.tail)
+            if block:
+                parts.append("\n")
+
+        walk(node)
+        lines = (re.sub(r"[ \t\r\f\v]+", " ", line).strip() for line in "".join(parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+    def get_attribute_value(self, node, name: str) -> Optional[str]:
+        """近似 Selenium get_attribute：优先属性，其次常用 DOM 属性"""
+        if name in ("textContent", "innerText"):
+            return self.visible_text(node) if name == "innerText" else "".join(node.itertext())
+        if name == "outerHTML":
+            return etree.tostring(node, encoding="unicode", method="html", with_tail=False)
+        if name == "innerHTML":
+            return (node.text or "") + "".join(
+                etree.tostring(child, encoding="unicode", method="html") for child in node)
+        if name in BOOLEAN_ATTRIBUTES:
+            return "true" if node.get(name) is not None else None
+        value = node.get(name)
+        if value is None and name == "value" and node.tag in ("textarea", "option"):
+            return node.text_content()
+        return value
+
+    # ------------------------------------------------------------------
+    # 命令分发（与 Selenium 命令名一致）
+    # ------------------------------------------------------------------
+
+    def execute(self, driver_command: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """执行一条命令，返回 {"value": 结果}"""
+        params = params or {}
+        handler = getattr(self, f"_cmd_{driver_command}", None)
+        if handler is None:
+            raise WebDriverException(f"FakeWebDriver 不支持的命令: {driver_command}")
+        return {"value": handler(params)}
+
+    def _element(self, params: Dict[str, Any]) -> FakeWebElement:
+        return self._elements[params["id"]]
+
+    def _cmd_get(self, params):
+        url = params["url"]
+        if url in self.pages:
+            self.load(self.pages[url], url)
+        elif url.startswith("file://") or os.path.exists(url):
+            path = url[len("file://"):] if url.startswith("file://") else url
+            with open(path, 'r', encoding='utf-8') as f:
+                self.load(f.read(), "file://" + os.path.abspath(path))
+        else:
+            raise WebDriverException(f"FakeWebDriver 无法加载: {url}")
+
+    def _cmd_getCurrentUrl(self, params):
+        return self.current_url
+
+    def _cmd_getTitle(self, params):
+        titles = self.document.xpath("//title")
+        return titles[0].text_content().strip() if titles else ""
+
+    def _cmd_getPageSource(self, params):
+        return etree.tostring(self.document, encoding="unicode", method="html")
+
+    def _cmd_findElements(self, params):
+        return [self._wrap(n) for n in self._query(self.document, params["using"], params["value"], False)]
+
+    def _cmd_findElement(self, params):
+        elements = self._cmd_findElements(params)
+        if not elements:
+            raise NoSuchElementException(f"找不到元素: {params['using']}={params['value']}")
+        return elements[0]
+
+    def _cmd_findChildElements(self, params):
+        node = self._node(self._element(params))
+        return [self._wrap(n) for n in self._query(node, params["using"], params["value"], True)]
+
+    def _cmd_findChildElement(self, params):
+        elements = self._cmd_findChildElements(params)
+        if not elements:
+            raise NoSuchElementException(f"找不到元素: {params['using']}={params['value']}")
+        return elements[0]
+
+    def _cmd_getElementText(self, params):
+        return self.visible_text(self._node(self._element(params)))
+
+    def _cmd_getElementTagName(self, params):
+        return self._node(self._element(params)).tag
+
+    def _cmd_getElementRect(self, params):
+        node = self._node(self._element(params))
+        shown = self.displayed(node)
+        return {"x": 0.0, "y": 0.0, "width": 100.0 if shown else 0.0, "height": 20.0 if shown else 0.0}
+
+    def _cmd_getElementProperty(self, params):
+        return self.get_attribute_value(self._node(self._element(params)), params["name"])
+
+    def _cmd_isElementEnabled(self, params):
+        node = self._node(self._element(params))
+        return node.get("disabled") is None and node.get("aria-disabled") != "true"
+
+    def _cmd_isElementSelected(self, params):
+        node = self._node(self._element(params))
+        return node.get("checked") is not None or node.get("selected") is not None
+
+    def _cmd_clickElement(self, params):
+        element = self._element(params)
+        self._node(element)
+        self.clicks.append(element)
+        if self.click_handler:
+            self.click_handler(self, element)
+
+    def _cmd_sendKeysToElement(self, params):
+        self._node(self._element(params)).set("value", params.get("text", ""))
+
+    def _cmd_w3cExecuteScript(self, params):
+        return self.run_script(params.get("script", ""), list(params.get("args", [])))
+
+    def _cmd_w3cExecuteScriptAsync(self, params):
+        return self.run_script(params.get("script", ""), list(params.get("args", [])))
+
+    # ------------------------------------------------------------------
+    # Selenium 公共接口
+    # ------------------------------------------------------------------
+
+    @property
+    def page_source(self) -> str:
+        return self.execute("getPageSource")["value"]
+
+    @property
+    def title(self) -> str:
+        return self.execute("getTitle")["value"]
+
+    def get(self, url: str):
+        self.execute("get", {"url": url})
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> FakeWebElement:
+        return self.execute("findElement", {"using": by, "value": value})["value"]
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List[FakeWebElement]:
+        return self.execute("findElements", {"using": by, "value": value})["value"]
+
+    def execute_script(self, script: str, *args) -> Any:
+        return self.execute("w3cExecuteScript", {"script": script, "args": list(args)})["value"]
+
+    def execute_async_script(self, script: str, *args) -> Any:
+        return self.execute("w3cExecuteScriptAsync", {"script": script, "args": list(args)})["value"]
+
+    def implicitly_wait(self, time_to_wait: float):
+        pass
+
+    def set_page_load_timeout(self, time_to_wait: float):
+        pass
+
+    def set_window_size(self, width: int, height: int, windowHandle: str = "current"):
+        pass
+
+    def maximize_window(self):
+        pass
+
+    def refresh(self):
+        self.execute("get", {"url": self.current_url})
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+    # ------------------------------------------------------------------
+    # 脚本
+    # ------------------------------------------------------------------
+
+    def register_script(self, marker: str, handler: Callable[..., Any]):
+        """注册脚本处理函数：脚本包含 marker 时调用 handler(driver, *args)，后注册的优先"""
+        self.script_handlers.insert(0, (marker, handler))
+
+    def run_script(self, script: str, args: List[Any]) -> Any:
+        """按注册的处理函数执行脚本，无法识别的脚本抛出 JavascriptException"""
+        for marker, handler in self.script_handlers:
+            if marker in script:
+                return handler(self, *args)
+        raise JavascriptException(f"FakeWebDriver 不支持的脚本: {script.strip()[:60]}")
+
+    def _register_default_scripts(self):
+        """注册通用脚本的处理函数（属性/可见性原子、滚动、点击、readyState）
+
+        项目自己注入的脚本不在这里模拟，需要在真实浏览器中运行（见 micro_benchmark.py --browser）"""
+        self.register_script("/* getAttribute */",
+                             lambda d, element, name: d.get_attribute_value(d._node(element), name))
+        self.register_script("/* isDisplayed */", lambda d, element: d.displayed(d._node(element)))
+        self.register_script("scrollIntoView", lambda d, *args: None)
+        self.register_script("arguments[0].click()", lambda d, element, *args: element.click())
+        self.register_script("return document.readyState", lambda d, *args: "complete")
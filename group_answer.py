@@ -0,0 +1,128 @@
+"""
+形容词整组作答模块
+一次异步脚本调用完成一道形容词题：定位最符合/最不符合选框和确定按钮，依次点击 形容词 → 选框 → 形容词 → 选框，
+在同一次调用中检查两个形容词是否已放入对应选框，检查通过后再点击确定；
+检查未通过时返回各步结果和已定位的元素，由调用方只对未完成的部分回退到逐步点击
+"""
+from typing import Any, Dict, List, Tuple
+
+from selenium.webdriver.remote.webelement import WebElement
+
+from profiler import profiled
+
+# 与 find_most_least_buttons / click_confirm_button 的查找顺序一致，以 / 开头的为 XPath
+MOST_BOX_LOCATORS = ["//div[contains(text(), '最符合')]", "div[data-cls*='most']", "div[data-cls*='suitable']"]
+LEAST_BOX_LOCATORS = ["//div[contains(text(), '最不符合')]", "div[data-cls*='least']", "div[data-cls*='unsuitable']"]
+CONFIRM_LOCATORS = [
+    "div.phoenix-button.content",
+    "div[class*='phoenix-button'][class*='content']",
+    "//div[contains(text(), '确定')]",
+]
+
+# 参数：最符合形容词元素、最不符合形容词元素、两者的文本、形容词选项选择器、
+# {"most": [...], "least": [...], "confirm": [...]} 定位列表、每步之间的间隔（毫秒）
+# 每次点击后让出事件循环，等页面框架完成渲染再进行下一步
+GROUP_ANSWER_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var mostOption = arguments[0], leastOption = arguments[1];
+var mostText = arguments[2], leastText = arguments[3];
+var optionSelector = arguments[4], locators = arguments[5], delay = arguments[6];
+
+function locate(candidates) {
+    for (var i = 0; i < candidates.length; i++) {
+        var el = candidates[i].charAt(0) === '/'
+            ? document.evaluate(candidates[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+            : document.querySelector(candidates[i]);
+        if (el) { return el; }
+    }
+    return null;
+}
+function fresh(option, text) {
+    // 页面重新渲染后原元素可能已脱离文档，按文本重新查找
+    if (option && document.contains(option)) { return option; }
+    var items = document.querySelectorAll(optionSelector);
+    for (var i = 0; i < items.length; i++) {
+        var itemText = (items[i].textContent || '').trim();
+        if (itemText && (itemText.indexOf(text) >= 0 || text.indexOf(itemText) >= 0)) { return items[i]; }
+    }
+    return null;
+}
+function placed(box, text) {
+    return !!box && (box.textContent || '').indexOf(text) >= 0;
+}
+
+var result = {
+    most_box: locate(locators.most), least_box: locate(locators.least), confirm: locate(locators.confirm),
+    most_placed: false, least_placed: false, confirmed: false, error: null
+};
+var steps = [
+    function () { var el = fresh(mostOption, mostText); if (el) { el.click(); } },
+    function () { if (result.most_box) { result.most_box.click(); } },
+    function () { var el = fresh(leastOption, leastText); if (el) { el.click(); } },
+    function () { if (result.least_box) { result.least_box.click(); } },
+    function () {
+        result.most_placed = placed(result.most_box, mostText);
+        result.least_placed = placed(result.least_box, leastText);
+        if (result.most_placed && result.least_placed && result.confirm) {
+            result.confirm.click();
+            result.confirmed = true;
+        }
+    }
+];
+function run(index) {
+    try {
+        steps[index]();
+    } catch (e) {
+        result.error = String(e);
+        done(result);
+        return;
+    }
+    if (index + 1 < steps.length) { setTimeout(function () { run(index + 1); }, delay); } else { done(result); }
+}
+run(0);
+"""
+
+
+class GroupAnswer:
+    """形容词整组作答类"""
+
+    STEP_DELAY_MS = 50  # 每步点击之间的间隔，给页面框架留出渲染时间
+
+    def __init__(self, driver, option_selector: str):
+        self.driver = driver
+        self.option_selector = option_selector
+        self.batched = 0    # 一次调用完成的题数
+        self.fallbacks = 0  # 需要回退到逐步点击的题数
+
+    @profiled("click")
+    def answer(self, most: Tuple[str, WebElement], least: Tuple[str, WebElement]) -> Dict[str, Any]:
+        """一次调用完成选择和确定，返回 {most_placed, least_placed, confirmed, most_box, least_box, confirm}；
+        脚本失败时返回空字典"""
+        locators: Dict[str, List[str]] = {
+            "most": MOST_BOX_LOCATORS,
+            "least": LEAST_BOX_LOCATORS,
+            "confirm": CONFIRM_LOCATORS,
+        }
+        try:
+            result = self.driver.execute_async_script(
+                GROUP_ANSWER_SCRIPT, most[1], least[1], most[0], least[0],
+                self.option_selector, locators, self.STEP_DELAY_MS
+            ) or {}
+        except Exception as e:
+            print(f"整组作答脚本失败: {e}")
+            result = {}
+
+        if result.get("confirmed"):
+            self.batched += 1
+        else:
+            self.fallbacks += 1
+            if result.get("error"):
+                print(f"整组作答中断: {result['error']}")
+        return result
+
+    def print_report(self):
+        """打印整组作答统计"""
+        total = self.batched + self.fallbacks
+        if not total:
+            return
+        print(f"整组作答: {self.batched}/{total} 题一次调用完成，{self.fallbacks} 题回退到逐步点击")
@@ -0,0 +1,100 @@
+"""
+定位器注册模块
+按逻辑目标（如 "confirm"、"adjective_option"）记录各选择器的命中/未命中次数，
+优先尝试上次命中的选择器，并将统计持久化到本地文件，下次运行直接走快速路径
+"""
+import atexit
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_STATS_FILE = "locator_stats.json"
+
+
+class LocatorRegistry:
+    """定位器注册类"""
+
+    _shared: Optional["LocatorRegistry"] = None
+
+    def __init__(self, stats_file: str = DEFAULT_STATS_FILE):
+        self.stats_file = stats_file
+        # 目标 -> {"last": 上次命中的选择器, "selectors": {选择器: {"hits": n, "misses": n}}}
+        self.stats: Dict[str, Dict[str, Any]] = self.load()
+        self.dirty = False
+
+    @classmethod
+    def shared(cls, stats_file: Optional[str] = None) -> "LocatorRegistry":
+        """获取全局共享实例，进程退出时自动保存"""
+        if cls._shared is None or (stats_file and cls._shared.stats_file != stats_file):
+            cls._shared = cls(stats_file or DEFAULT_STATS_FILE)
+            atexit.register(cls._shared.save)
+        return cls._shared
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """加载统计文件"""
+        if not os.path.exists(self.stats_file):
+            return {}
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"加载定位器统计失败: {e}")
+            return {}
+
+    def save(self):
+        """保存统计文件（无变化时跳过）"""
+        if not self.dirty:
+            return
+        try:
+            with open(self.stats_file, 'w', encoding='utf-8') as f:
+                json.dump(self.stats, f, ensure_ascii=False, indent=2)
+            self.dirty = False
+        except Exception as e:
+            print(f"保存定位器统计失败: {e}")
+
+    def order(self, target: str, selectors: List[str]) -> List[str]:
+        """返回排序后的选择器：上次命中的排第一，其余按命中率降序，同分保持原顺序"""
+        entry = self.stats.get(target)
+        if not entry:
+            return list(selectors)
+
+        counts = entry.get("selectors", {})
+        last = entry.get("last")
+
+        def score(item: Tuple[int, str]) -> Tuple[int, float, int]:
+            index, selector = item
+            stat = counts.get(selector, {})
+            hits, misses = stat.get("hits", 0), stat.get("misses", 0)
+            rate = hits / (hits + misses) if hits + misses else 0.0
+            return (0 if selector == last else 1, -rate, index)
+
+        return [selector for _, selector in sorted(enumerate(selectors), key=score)]
+
+    def record(self, target: str, selector: str, hit: bool):
+        """记录一次命中或未命中"""
+        entry = self.stats.setdefault(target, {"last": None, "selectors": {}})
+        stat = entry["selectors"].setdefault(selector, {"hits": 0, "misses": 0})
+        if hit:
+            stat["hits"] += 1
+            if entry["last"] != selector:
+                entry["last"] = selector
+                self.dirty = True
+                # 命中的选择器发生变化时立即落盘，避免中途崩溃丢失
+                self.save()
+        else:
+            stat["misses"] += 1
+        self.dirty = True
+
+    def find_first(self, target: str, selectors: List[str],
+                   finder: Callable[[str], Any]) -> Tuple[Optional[str], Any]:
+        """按学习到的顺序逐个尝试选择器，返回 (命中的选择器, 查找结果)"""
+        for selector in self.order(target, selectors):
+            try:
+                result = finder(selector)
+            except Exception as e:
+                print(f"选择器 {selector} 查找失败: {e}")
+                result = None
+            self.record(target, selector, bool(result))
+            if result:
+                return selector, result
+        return None, None
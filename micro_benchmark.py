@@ -0,0 +1,261 @@
+"""
+微基准测试
+反复运行选项定位、文本提取、答案匹配和按钮查找逻辑，报告每次操作耗时和 WebDriver 命令次数
+
+默认用 FakeWebDriver 加载模拟站点的静态页面，不启动浏览器；FakeWebDriver 不执行项目注入的脚本，
+依赖这些脚本的用例会被跳过。加 --browser 时在无头 Chrome 中打开模拟站点，全部用例（包括注入脚本）
+在真实 JS 引擎中运行，并校验提取结果与模拟站点的题目一致
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from fake_webdriver import FakeWebDriver
+from mock_beisen_site import ADJECTIVE, ADJECTIVE_POOL, SINGLE_CHOICE, MockBeisenSite
+
+
+# 用例格式：(名称, 函数, 是否依赖注入脚本)
+Case = Tuple[str, Callable[[], Any], bool]
+
+
+def open_first_question(site: MockBeisenSite, browser=None):
+    """打开第一题：传入 browser 时启动站点并在浏览器中打开，否则用假驱动加载静态页面"""
+    if browser is None:
+        driver = FakeWebDriver(pages=site.static_pages())
+    else:
+        site.start()
+        driver = browser
+    driver.get(f"{site.url}question/1")
+    return driver
+
+
+def wait_rendered(automation):
+    """等待模拟站点的页面渲染完成（假驱动加载的是静态页面，立即返回）"""
+    from page_state import QUESTION
+
+    automation.button_handler.page_classifier.wait_for_state_change(None, timeout=10)
+    if automation.button_handler.page_classifier.state() != QUESTION:
+        raise RuntimeError("模拟站点的题目页未能加载")
+
+
+def build_adjective(workdir: str, site: MockBeisenSite, browser=None):
+    """创建形容词自动化实例"""
+    from adjective_test_automation import AdjectiveTestAutomation
+
+    config_file = os.path.join(workdir, "answers.json")
+    with open(config_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            "test_url": site.url,
+            "adjective_ranking": ADJECTIVE_POOL,
+            "settings": {"locator_stats_file": os.path.join(workdir, "locator_stats.json")},
+        }, f, ensure_ascii=False)
+
+    automation = AdjectiveTestAutomation(config_file)
+    automation.attach_driver(open_first_question(site, browser))
+    return automation
+
+
+def build_single_choice(workdir: str, site: MockBeisenSite, browser=None):
+    """创建单选题自动化实例"""
+    from single_choice_main import SingleChoiceAutomation
+
+    answer_categories: Dict[str, List[str]] = {}
+    for question, answer in site.expected_answers.items():
+        answer_categories.setdefault(answer, []).append(question)
+    config_file = os.path.join(workdir, "single_choice_answers.json")
+    with open(config_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            "test_url": site.url,
+            "answer_categories": answer_categories,
+            "settings": {"locator_stats_file": os.path.join(workdir, "locator_stats.json")},
+        }, f, ensure_ascii=False)
+
+    return SingleChoiceAutomation(config_file, driver=open_first_question(site, browser))
+
+
+def adjective_cases(automation) -> List[Case]:
+    """形容词题的基准用例"""
+    from dom_snapshot import DomSnapshot
+
+    def locate_and_choose():
+        elements = automation.locate_adjective_elements()
+        pairs = DomSnapshot.text_pairs(DomSnapshot.snapshot_options(automation.driver, elements=elements))
+        return automation.select_most_and_least_suitable(pairs)
+
+    def read_options():
+        return [(automation.extract_adjective_text(element), element)
+                for element in automation.locate_adjective_elements()]
+
+    # 选项文本通过驱动读取一次，排序用例只计时纯 Python 的优先级比较
+    pairs = read_options()
+
+    return [
+        ("adjective/find_elements", automation.locate_adjective_elements, False),
+        ("adjective/read_options", read_options, False),
+        ("adjective/choose", lambda: automation.select_most_and_least_suitable(pairs), False),
+        ("adjective/read_and_choose", lambda: automation.select_most_and_least_suitable(read_options()), False),
+        ("adjective/locate_and_choose", locate_and_choose, True),
+        ("adjective/most_least_buttons", automation.locate_most_least_buttons, False),
+        ("adjective/fingerprint", automation.transition_waiter.fingerprint, True),
+    ]
+
+
+def single_choice_cases(automation) -> List[Case]:
+    """单选题的基准用例"""
+    from dom_snapshot import DomSnapshot
+
+    def question_and_answer():
+        text = automation.find_question_text()
+        answer = automation.find_matching_answer(text)
+        elements = automation.find_question_elements()
+        DomSnapshot.snapshot_options(automation.driver, elements=elements)
+        return answer
+
+    def read_and_match():
+        text = automation.find_question_text()
+        answer = automation.find_matching_answer(text)
+        options = [automation.extract_option_text(element) for element in automation.find_question_elements()]
+        return answer if answer in options else None
+
+    # 题目文本通过驱动读取一次，匹配用例只计时纯 Python 的题库查找
+    question_text = automation.find_question_text()
+
+    return [
+        ("single_choice/question_text", automation.find_question_text, False),
+        ("single_choice/matcher", lambda: automation.question_matcher.match(question_text), False),
+        ("single_choice/match_answer", lambda: automation.find_matching_answer(question_text), False),
+        ("single_choice/read_and_match", read_and_match, False),
+        ("single_choice/question_and_answer", question_and_answer, True),
+        ("single_choice/is_question_page", automation.is_question_page, True),
+        ("single_choice/detect_question_page", automation.detect_question_page, True),
+        ("button/find_by_text", lambda: automation.button_handler.find_button_by_text(["下一步", "确定"]), True),
+        ("page_state/classify", automation.button_handler.page_classifier.classify, True),
+    ]
+
+
+def check_adjective(automation, site: MockBeisenSite) -> Tuple[bool, str]:
+    """校验快照脚本提取的选项与模拟站点第一题一致"""
+    from dom_snapshot import DomSnapshot
+
+    elements = automation.locate_adjective_elements()
+    texts = [text for text, _ in DomSnapshot.text_pairs(DomSnapshot.snapshot_options(automation.driver,
+                                                                                     elements=elements))]
+    expected = site.adjective_groups[0]
+    return texts == expected, f"选项 {texts}，期望 {expected}"
+
+
+def check_single_choice(automation, site: MockBeisenSite) -> Tuple[bool, str]:
+    """校验题目文本脚本提取的题目和匹配的答案与模拟站点第一题一致"""
+    text = automation.find_question_text()
+    answer = automation.find_matching_answer(text)
+    expected_text = site.question_texts[0]
+    expected_answer = site.expected_answers[expected_text]
+    return (text == expected_text and answer == expected_answer,
+            f"题目 '{text}' 答案 '{answer}'，期望 '{expected_text}' 答案 '{expected_answer}'")
+
+
+def run_case(name: str, func: Callable[[], Any], counter, min_time: float) -> Dict[str, Any]:
+    """重复运行一个用例直到累计 min_time 秒，屏蔽被测代码的输出"""
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink):
+        func()  # 预热
+        commands_before = counter.total
+        iterations = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            func()
+            iterations += 1
+            elapsed = time.perf_counter() - start
+            sink.seek(0)
+            sink.truncate()
+    return {
+        "case": name,
+        "iterations": iterations,
+        "ops_per_second": iterations / elapsed,
+        "microseconds": elapsed / iterations * 1e6,
+        "commands": (counter.total - commands_before) / iterations,
+    }
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="选项定位、文本提取和按钮查找的微基准测试")
+    parser.add_argument("--min-time", type=float, default=0.5, help="每个用例的最短运行时间（秒）")
+    parser.add_argument("--questions", type=int, default=5, help="模拟站点题目数量")
+    parser.add_argument("--browser", action="store_true",
+                        help="在无头 Chrome 中对模拟站点运行全部用例（包括依赖注入脚本的用例）")
+    parser.add_argument("--output", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    skipped: List[str] = []
+    checks: List[Tuple[str, bool, str]] = []
+
+    def run_suite(automation, make_cases: Callable[[Any], List[Case]], check, site: MockBeisenSite):
+        with contextlib.redirect_stdout(io.StringIO()):
+            if browser is not None:
+                wait_rendered(automation)
+                checks.append((site.kind, *check(automation, site)))
+            # 用例在页面就绪后创建（部分用例预先通过驱动读取页面文本）
+            cases = make_cases(automation)
+        for name, func, needs_script in cases:
+            if needs_script and browser is None:
+                skipped.append(name)
+                continue
+            results.append(run_case(name, func, automation.command_counter, args.min_time))
+        # 统计文件位于临时目录，退出前落盘，避免进程退出时目录已被删除
+        automation.locators.save()
+
+    browser = None
+    sites = [MockBeisenSite(ADJECTIVE, args.questions), MockBeisenSite(SINGLE_CHOICE, args.questions)]
+    with tempfile.TemporaryDirectory(prefix="beisen_micro_") as workdir:
+        try:
+            # 浏览器模式下两种题型共用一个浏览器，依次打开各自的站点
+            with contextlib.redirect_stdout(io.StringIO()):
+                if args.browser:
+                    from browser_session import BrowserSession
+                    browser = BrowserSession.create({"headless": True}, page_load_timeout=30, implicit_wait=0)
+                adjective = build_adjective(workdir, sites[0], browser)
+            run_suite(adjective, adjective_cases, check_adjective, sites[0])
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                single_choice = build_single_choice(workdir, sites[1], browser)
+            run_suite(single_choice, single_choice_cases, check_single_choice, sites[1])
+        finally:
+            if browser is not None:
+                browser.quit()
+            for site in sites:
+                site.stop()
+
+    driver_name = "无头 Chrome（注入脚本在浏览器中执行）" if browser is not None else "FakeWebDriver（不执行注入脚本）"
+    print(f"\n驱动: {driver_name}")
+    print(f"{'用例':<36}{'次/秒':>10}{'微秒/次':>12}{'命令/次':>10}")
+    for result in results:
+        print(f"{result['case']:<36}{result['ops_per_second']:>10.0f}"
+              f"{result['microseconds']:>12.1f}{result['commands']:>10.1f}")
+    if skipped:
+        print(f"\n以下 {len(skipped)} 个用例依赖注入脚本，FakeWebDriver 无法运行，已跳过（用 --browser 在无头 Chrome 中运行）:")
+        for name in skipped:
+            print(f"  {name}")
+    for kind, ok, detail in checks:
+        print(f"与模拟站点对照 [{kind}]: {'一致' if ok else '不一致'}（{detail}）")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"browser": browser is not None, "results": results, "skipped": skipped,
+                       "checks": [{"kind": kind, "ok": ok, "detail": detail} for kind, ok, detail in checks]},
+                      f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到: {args.output}")
+
+    if any(not ok for _, ok, _ in checks):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+本地模拟北森测试站点
+复现程序依赖的页面结构（进入试卷 → 继续答题 → 答题说明 → 练习 → 正式答题 → 题目 → 完成），
+用于离线基准测试和回归测试，页面延迟和题目数量均可配置
+"""
+import html
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+ADJECTIVE = "adjective"
+SINGLE_CHOICE = "single_choice"
+
+# 形容词题库（排序即优先级）
+ADJECTIVE_POOL = [
+    "善解人意的", "有计划性的", "有领导意愿的", "乐观开朗的", "细心谨慎的", "独立自主的",
+    "富有创意的", "善于合作的", "坚持不懈的", "雷厉风行的", "谦逊低调的", "热情主动的",
+]
+
+# 单选题选项，顺序与北森页面一致
+SINGLE_CHOICE_OPTIONS = ["非常不符合", "比较不符合", "比较符合", "非常符合"]
+
+# 单选题题干模板
+SINGLE_CHOICE_STEMS = [
+    "我通常能够很好地处理压力",
+    "我喜欢与他人合作完成任务",
+    "我经常感到焦虑和不安",
+    "我愿意接受新的挑战",
+    "我很难控制自己的情绪",
+    "我相信团队成员给我的建议是中肯的",
+]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<title>北森测评（模拟）</title>
+<style>
+body {{ font-family: sans-serif; margin: 40px; }}
+.phoenix-button {{ display: inline-block; padding: 8px 24px; margin: 8px; background: #1677ff; color: #fff; cursor: pointer; }}
+.phoenix-button .phoenix-button {{ margin: 0; padding: 0; }}
+div[data-cls='outline-part-item-right'] {{ display: inline-block; padding: 8px; border: 1px solid #999; cursor: pointer; }}
+span[class*='I6Yvw'] {{ display: inline-block; padding: 8px 16px; margin: 4px; border: 1px solid #999; cursor: pointer; }}
+span.selected {{ background: #ffe58f; }}
+.box {{ display: inline-block; min-width: 160px; min-height: 40px; margin: 8px; border: 1px dashed #666; cursor: pointer; }}
+div[class*='-5frG'] {{ padding: 8px; margin: 4px 0; border: 1px solid #999; cursor: pointer; }}
+</style>
+</head>
+<body>
+<div id="app">{app}</div>
+<template id="page">{body}</template>
+<script>
+var RENDER_DELAY = {render_delay};
+var ADVANCE_DELAY = {advance_delay};
+function go(href) {{ setTimeout(function() {{ location.href = href; }}, ADVANCE_DELAY); }}
+function render() {{
+    document.getElementById('app').innerHTML = document.getElementById('page').innerHTML;
+}}
+if (RENDER_DELAY > 0) {{ setTimeout(render, RENDER_DELAY); }} else {{ render(); }}
+
+var selected = null;
+document.addEventListener('click', function(event) {{
+    var target = event.target;
+    var link = target.closest('[data-href]');
+    if (link) {{ go(link.getAttribute('data-href')); return; }}
+
+    var single = target.closest("div[class*='-5frG']");
+    if (single) {{ single.classList.add('checked'); go(single.getAttribute('data-next')); return; }}
+
+    var option = target.closest("span[class*='I6Yvw']");
+    if (option && !option.closest('.box')) {{
+        if (selected) {{ selected.classList.remove('selected'); }}
+        selected = option;
+        option.classList.add('selected');
+        return;
+    }}
+
+    var box = target.closest('.box');
+    if (box && selected) {{
+        selected.classList.remove('selected');
+        box.querySelector('.box-content').appendChild(selected);
+        selected = null;
+        return;
+    }}
+
+    var confirm = target.closest('[data-confirm]');
+    if (confirm) {{
+        var filled = document.querySelectorAll(".box span[class*='I6Yvw']").length;
+        if (filled >= 2) {{ go(confirm.getAttribute('data-confirm')); }}
+    }}
+}});
+</script>
+</body>
+</html>
+"""
+
+
+class MockBeisenSite:
+    """本地模拟北森站点"""
+
+    def __init__(self, kind: str = ADJECTIVE, questions: int = 10, page_delay: float = 0.0,
+                 render_delay: float = 0.0, advance_delay: float = 0.2, port: int = 0, seed: int = 0):
+        self.kind = kind
+        self.questions = questions
+        self.page_delay = page_delay        # 服务端响应延迟（秒），模拟网络和后端耗时
+        self.render_delay = render_delay    # 页面内容渲染延迟（秒），模拟单页应用异步渲染
+        self.advance_delay = advance_delay  # 点击后跳转延迟（秒），模拟自动跳题
+        self.port = port
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+
+        rng = random.Random(seed)
+        self.adjective_groups: List[List[str]] = [rng.sample(ADJECTIVE_POOL, 3) for _ in range(questions)]
+        self.question_texts: List[str] = [
+            f"{SINGLE_CHOICE_STEMS[i % len(SINGLE_CHOICE_STEMS)]}（第{i + 1}题）" for i in range(questions)
+        ]
+        # 单选题的期望答案，供基准脚本生成题库配置
+        self.expected_answers: Dict[str, str] = {
+            text: SINGLE_CHOICE_OPTIONS[i % len(SINGLE_CHOICE_OPTIONS)] for i, text in enumerate(self.question_texts)
+        }
+
+    @property
+    def url(self) -> str:
+        """站点首页地址"""
+        return f"http://127.0.0.1:{self.port}/"
+
+    def start(self) -> "MockBeisenSite":
+        """在后台线程中启动站点"""
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = site.render(urlparse(self.path).path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                if site.page_delay:
+                    time.sleep(site.page_delay)
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        print(f"模拟北森站点已启动: {self.url}（{self.kind}，{self.questions} 题）")
+        return self
+
+    def stop(self):
+        """停止站点"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def render(self, path: str, static: bool = False) -> Optional[str]:
+        """渲染指定路径的页面，未知路径返回 None
+
+        static 为 True 时页面内容直接写在文档中，不依赖脚本渲染（供 FakeWebDriver 等离线解析使用）
+        """
+        if path in ("/", "/index.html"):
+            body = self.render_landing()
+        elif path == "/outline":
+            body = ('<h2>测评目录</h2><div class="outline-part-item">性格测评'
+                    '<div data-cls="outline-part-item-right" data-href="/instructions">继续答题</div></div>')
+        elif path == "/instructions":
+            body = ('<h2>答题说明</h2><p>请根据自己的真实情况作答。</p>'
+                    '<div class="phoenix-button content" data-href="/practice">下一步</div>')
+        elif path == "/practice":
+            body = ('<h2>练习题</h2><p>以下为练习部分，不计入成绩。</p>'
+                    '<div class="phoenix-button content" data-href="/formal">下一步</div>')
+        elif path == "/formal":
+            body = ('<h2>练习结束</h2><p>接下来进入正式测评。</p>'
+                    '<div class="phoenix-button content" data-href="/question/1">正式答题</div>')
+        elif path.startswith("/question/"):
+            try:
+                number = int(path.rsplit("/", 1)[1])
+            except ValueError:
+                return None
+            if not 1 <= number <= self.questions:
+                return None
+            body = self.render_question(number)
+        elif path == "/finished":
+            body = "<h2>测试完成</h2><p>感谢您的参与，您的作答已提交成功。</p>"
+        else:
+            return None
+        return PAGE_TEMPLATE.format(
+            app=body if static else "",
+            body=body,
+            render_delay=int(self.render_delay * 1000),
+            advance_delay=int(self.advance_delay * 1000),
+        )
+
+    def render_landing(self) -> str:
+        """渲染进入试卷页"""
+        return ('<h2>欢迎参加测评</h2>'
+                '<div class="phoenix-button wraper wraper--primary wraper--middle" data-href="/outline">'
+                '<div class="phoenix-button content">进入试卷</div></div>')
+
+    def next_path(self, number: int) -> str:
+        """下一题的路径"""
+        return f"/question/{number + 1}" if number < self.questions else "/finished"
+
+    def render_question(self, number: int) -> str:
+        """渲染题目页"""
+        progress = f'<div class="progress-text">{number}/{self.questions}</div>'
+        if self.kind == ADJECTIVE:
+            options = "".join(
+                f'<span class="qupWj-item I6Yvw-{i}">{html.escape(text)}</span>'
+                for i, text in enumerate(self.adjective_groups[number - 1])
+            )
+            return (progress +
+                    '<p class="tip">请从下列形容词中选出最符合和最不符合你的一项</p>'
+                    f'<div class="eMsyU" data-cls="tuozhuai-content">{options}</div>'
+                    '<div class="box most">最符合<div class="box-content"></div></div>'
+                    '<div class="box least">最不符合<div class="box-content"></div></div>'
+                    f'<div class="phoenix-button content" data-confirm="{self.next_path(number)}">确定</div>')
+
+        options = "".join(
+            f'<div class="single-choice_item a1-5frG" data-value="{i + 1}" data-next="{self.next_path(number)}">'
+            f'{text}</div>'
+            for i, text in enumerate(SINGLE_CHOICE_OPTIONS)
+        )
+        return (progress +
+                '<div data-cls="single-choice">'
+                f'<div class="question-title">{html.escape(self.question_texts[number - 1])}</div>'
+                f'<div class="single-choice_options">{options}</div></div>')
+
+    def paths(self) -> List[str]:
+        """站点全部页面路径，按答题流程排序"""
+        paths = ["/", "/outline", "/instructions", "/practice", "/formal"]
+        paths += [f"/question/{i}" for i in range(1, self.questions + 1)]
+        return paths + ["/finished"]
+
+    def static_pages(self) -> Dict[str, str]:
+        """全部页面的静态HTML，键为完整URL"""
+        base = self.url.rstrip("/")
+        return {base + path: self.render(path, static=True) for path in self.paths()}
+
+    def save_pages(self, directory: str) -> List[str]:
+        """把每个页面保存为静态HTML，供离线测试使用"""
+        import os
+        os.makedirs(directory, exist_ok=True)
+        saved = []
+        for path in self.paths():
+            name = "landing" if path == "/" else path.strip("/").replace("/", "_")
+            file_path = os.path.join(directory, f"{self.kind}_{name}.html")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(self.render(path, static=True))
+            saved.append(file_path)
+        return saved
+
+
+def main():
+    """命令行启动模拟站点"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="本地模拟北森测试站点")
+    parser.add_argument("--kind", choices=[ADJECTIVE, SINGLE_CHOICE], default=ADJECTIVE, help="题型")
+    parser.add_argument("--questions", type=int, default=10, help="题目数量")
+    parser.add_argument("--port", type=int, default=8765, help="端口")
+    parser.add_argument("--page-delay", type=float, default=0.0, help="服务端响应延迟（秒）")
+    parser.add_argument("--render-delay", type=float, default=0.0, help="页面渲染延迟（秒）")
+    parser.add_argument("--advance-delay", type=float, default=0.2, help="点击后跳转延迟（秒）")
+    args = parser.parse_args()
+
+    site = MockBeisenSite(args.kind, args.questions, args.page_delay, args.render_delay,
+                          args.advance_delay, args.port).start()
+    print("按 Ctrl+C 停止")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
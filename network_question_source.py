@@ -0,0 +1,236 @@
+"""
+网络题目数据模块
+从 Chrome 性能日志中找到页面已经下载的 JSON 响应，通过 CDP 读取响应体并提取题目和选项，
+答题时可以不依赖哈希类名直接拿到题目文本；没有捕获到数据时由调用方回退到 DOM 抓取。
+捕获到的数据中可能混有练习题、形容词组等其他带选项的对象，所以页面上已经读到题目文本时按内容匹配，
+只有还读不到页面文本时才按下载顺序取第几题
+"""
+import html
+import json
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from profiler import profiled
+
+NETWORK = "network"
+
+# 题目文本、选项列表和选项文本常见的字段名（按优先级排列）
+QUESTION_TEXT_KEYS = ("title", "stem", "content", "questionText", "question", "text", "name")
+OPTION_LIST_KEYS = ("options", "optionList", "choices", "items", "answers")
+OPTION_TEXT_KEYS = ("text", "content", "title", "label", "name", "value")
+
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+# 按内容匹配时网络题目文本的最短长度，太短的文本（如"是"/"否"）容易误匹配
+MIN_MATCH_LENGTH = 4
+
+
+class NetworkQuestionSource:
+    """网络题目数据类"""
+
+    def __init__(self, driver, enabled: bool = False, url_pattern: Optional[str] = None):
+        self.driver = driver
+        self.enabled = enabled
+        self.url_pattern = url_pattern  # 只解析 URL 包含该字符串的响应，未配置时解析所有 JSON 响应
+        self.positional = True  # 页面文本还没有读到时是否按下载顺序取题（混合测评和断点续答时关闭）
+        self.questions: List[Dict[str, Any]] = []  # 按下载顺序排列的题目 {"text", "options", "url"}
+        self.pending: Dict[str, str] = {}  # 已收到响应头、尚未加载完成的请求 requestId -> url
+        self._seen: Set[Tuple[str, Tuple[str, ...]]] = set()
+        self.hits = 0
+        self.fallbacks = 0
+        self.mismatches = 0  # 页面上的题目在网络数据中找不到时计数
+
+    @classmethod
+    def install(cls, driver, settings: Dict[str, Any]) -> "NetworkQuestionSource":
+        """根据 settings.question_source 创建并挂到 driver 上"""
+        source = cls(driver, settings.get("question_source") == NETWORK, settings.get("network_url_pattern"))
+        driver.question_source = source
+        if source.enabled:
+            print("已启用网络题目数据：优先从页面下载的 JSON 中读取题目，读取不到时回退到 DOM")
+        return source
+
+    @classmethod
+    def of(cls, driver) -> "NetworkQuestionSource":
+        """获取 driver 上的题目数据源，没有时返回未启用的数据源（例如 FakeWebDriver）"""
+        source = getattr(driver, "question_source", None)
+        if source is None:
+            source = cls(driver)
+            try:
+                driver.question_source = source
+            except Exception:
+                pass
+        return source
+
+    @staticmethod
+    def enable_logging(options):
+        """开启性能日志（chromedriver 会同时开启 Network 域并把事件写入日志）"""
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    @staticmethod
+    def clean_text(value: Any) -> str:
+        """去掉 HTML 标签和多余空白"""
+        if not isinstance(value, str):
+            return ""
+        return " ".join(html.unescape(_TAG_PATTERN.sub("", value)).split())
+
+    @staticmethod
+    def option_text(option: Any) -> str:
+        """提取单个选项的文本"""
+        if isinstance(option, str):
+            return NetworkQuestionSource.clean_text(option)
+        if isinstance(option, dict):
+            for key in OPTION_TEXT_KEYS:
+                text = NetworkQuestionSource.clean_text(option.get(key))
+                if text:
+                    return text
+        return ""
+
+    @staticmethod
+    def extract_questions(payload: Any) -> List[Dict[str, Any]]:
+        """在任意结构的 JSON 中查找题目：带有选项列表（至少两个有文本的选项）的对象"""
+        questions = []
+
+        def walk(node: Any):
+            if isinstance(node, list):
+                for item in node:
+                    walk(item)
+                return
+            if not isinstance(node, dict):
+                return
+            for key in OPTION_LIST_KEYS:
+                options = node.get(key)
+                if not isinstance(options, list) or len(options) < 2:
+                    continue
+                texts = [NetworkQuestionSource.option_text(option) for option in options]
+                if all(texts):
+                    text = ""
+                    for text_key in QUESTION_TEXT_KEYS:
+                        text = NetworkQuestionSource.clean_text(node.get(text_key))
+                        if text:
+                            break
+                    questions.append({"text": text, "options": texts})
+                    return
+            for value in node.values():
+                walk(value)
+
+        walk(payload)
+        return questions
+
+    def _wanted(self, response: Dict[str, Any]) -> bool:
+        """只关心 XHR/fetch 返回的 JSON"""
+        if "json" not in (response.get("mimeType") or ""):
+            return False
+        return not self.url_pattern or self.url_pattern in (response.get("url") or "")
+
+    def _read_body(self, request_id: str, url: str) -> int:
+        """通过 CDP 读取响应体并提取题目，返回新增题目数"""
+        try:
+            result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            payload = json.loads(result.get("body") or "null")
+        except Exception:
+            return 0
+
+        added = 0
+        for question in self.extract_questions(payload):
+            key = (question["text"], tuple(question["options"]))
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            question["url"] = url
+            self.questions.append(question)
+            added += 1
+        return added
+
+    @profiled("extract")
+    def poll(self) -> int:
+        """读取新的性能日志，返回新增题目数；未启用或读取失败时返回 0"""
+        if not self.enabled:
+            return 0
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            print(f"读取性能日志失败: {e}")
+            return 0
+
+        added = 0
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except Exception:
+                continue
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.responseReceived":
+                response = params.get("response", {})
+                if params.get("type") in ("XHR", "Fetch") and self._wanted(response):
+                    self.pending[params.get("requestId")] = response.get("url", "")
+            elif method == "Network.loadingFinished" and params.get("requestId") in self.pending:
+                # 响应体在加载完成后才能完整读取
+                request_id = params["requestId"]
+                added += self._read_body(request_id, self.pending.pop(request_id))
+
+        if added:
+            print(f"从网络数据中读取到 {added} 道题目（累计 {len(self.questions)} 道）")
+        return added
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """去掉全部空白，便于比较页面文本和网络文本"""
+        return "".join(NetworkQuestionSource.clean_text(text).split())
+
+    def match(self, dom_text: str) -> Optional[Dict[str, Any]]:
+        """按内容查找页面上这道题的网络数据：文本相同，或一方包含另一方（页面文本可能带题号）"""
+        target = self._normalize(dom_text)
+        if not target:
+            return None
+        for attempt in range(2):
+            best = None
+            for question in self.questions:
+                text = self._normalize(question["text"])
+                if len(text) < MIN_MATCH_LENGTH:
+                    continue
+                if text == target:
+                    return question
+                if (text in target or target in text) and (best is None or len(text) > len(self._normalize(best["text"]))):
+                    best = question
+            if best or attempt or not self.poll():
+                return best
+        return None
+
+    def question(self, number: int) -> Optional[Dict[str, Any]]:
+        """第 number 道题（从 1 开始）的网络数据，还没有下载到时返回 None"""
+        if not self.enabled:
+            return None
+        if number > len(self.questions):
+            self.poll()
+        if 0 < number <= len(self.questions):
+            return self.questions[number - 1]
+        return None
+
+    def question_text(self, number: int, dom_text: str = "") -> Optional[str]:
+        """当前题目的网络文本：有页面文本时按内容匹配（找不到时返回 None，调用方使用页面文本），
+        没有页面文本时按顺序取第 number 道题（positional 关闭时不取）；读取不到时返回 None 并计为一次回退"""
+        if not self.enabled:
+            return None
+        if dom_text:
+            question = self.match(dom_text)
+            if not question:
+                self.mismatches += 1
+        else:
+            question = self.question(number) if self.positional else None
+        if question and question["text"]:
+            self.hits += 1
+            return question["text"]
+        self.fallbacks += 1
+        return None
+
+    def print_report(self):
+        """打印网络数据命中统计（仅启用时）"""
+        if not self.enabled:
+            return
+        print(f"\n{'=' * 60}")
+        print("网络题目数据统计")
+        print(f"{'=' * 60}")
+        print(f"捕获题目: {len(self.questions)} 道")
+        print(f"使用网络数据: {self.hits} 次，回退到DOM: {self.fallbacks} 次（其中页面题目不在网络数据中: {self.mismatches} 次）")
+        print(f"{'=' * 60}")
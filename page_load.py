@@ -0,0 +1,162 @@
+"""
+页面加载配置模块
+"lean" 配置使用 eager 加载策略（DOMContentLoaded 后即返回），并通过 CDP 屏蔽答题流程用不到的图片、字体和媒体，
+同时记录每个页面比等待 load 事件提前了多少时间
+"""
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from profiler import profiled
+from wait_engine import waits
+
+NORMAL = "normal"
+LEAN = "lean"
+
+# lean 配置下屏蔽的资源（答题流程只读取文本和按钮，不需要这些资源）
+# SVG 不屏蔽：部分按钮用 SVG 图标撑开点击区域
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.bmp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.wav", "*.ogg", "*.m4a",
+]
+
+# 读取当前文档的导航计时（毫秒，相对 timeOrigin）
+TIMING_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+return {
+    time_origin: performance.timeOrigin,
+    now: performance.now(),
+    ready_state: document.readyState,
+    dom_content_loaded: nav ? nav.domContentLoadedEventEnd : 0,
+    load_event_end: nav ? nav.loadEventEnd : 0
+};
+"""
+
+
+class PageLoadProfile:
+    """页面加载配置类"""
+
+    def __init__(self, driver, profile: str = NORMAL):
+        self.driver = driver
+        self.profile = profile if profile in (NORMAL, LEAN) else NORMAL
+        self.pages: List[Dict[str, Any]] = []  # 每次 get() 的计时记录
+
+    @classmethod
+    def install(cls, driver, settings: Dict[str, Any]) -> "PageLoadProfile":
+        """根据 settings.load_profile 创建并挂到 driver 上，lean 配置下屏蔽重资源"""
+        profile = cls(driver, settings.get("load_profile", NORMAL))
+        driver.page_load_profile = profile
+        if profile.lean:
+            print("已启用 lean 页面加载配置：eager 加载策略 + 屏蔽图片/字体/媒体")
+            profile.block_resources()
+        return profile
+
+    @classmethod
+    def of(cls, driver) -> "PageLoadProfile":
+        """获取 driver 上的加载配置，没有时返回默认配置（例如 FakeWebDriver）"""
+        profile = getattr(driver, "page_load_profile", None)
+        if profile is None:
+            profile = cls(driver)
+            try:
+                driver.page_load_profile = profile
+            except Exception:
+                pass
+        return profile
+
+    @property
+    def lean(self) -> bool:
+        return self.profile == LEAN
+
+    def block_resources(self) -> bool:
+        """通过 CDP 屏蔽重资源"""
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+            return True
+        except Exception as e:
+            print(f"屏蔽页面资源失败（将正常加载）: {e}")
+            return False
+
+    def _timing(self) -> Optional[Dict[str, Any]]:
+        """读取当前文档的导航计时"""
+        try:
+            timing = self.driver.execute_script(TIMING_SCRIPT)
+        except Exception:
+            return None
+        return timing if isinstance(timing, dict) else None
+
+    @profiled("navigation", "page_load_get")
+    def get(self, url: str):
+        """打开页面并记录计时"""
+        self.collect()
+        start = time.perf_counter()
+        self.driver.get(url)
+        elapsed = time.perf_counter() - start
+        timing = self._timing() or {}
+        self.pages.append({
+            "url": url,
+            "get_seconds": elapsed,
+            "time_origin": timing.get("time_origin"),
+            "returned_at": timing.get("now", 0.0),
+            "dom_content_loaded": timing.get("dom_content_loaded", 0.0),
+            "load_event_end": timing.get("load_event_end") or None,
+            "load_finished": bool(timing.get("load_event_end")),
+        })
+
+    def collect(self):
+        """补全上一个页面的 load 事件时间（仍停留在同一文档时才能读取）"""
+        if not self.pages or self.pages[-1]["load_finished"]:
+            return
+        page = self.pages[-1]
+        timing = self._timing()
+        if not timing or timing.get("time_origin") != page["time_origin"]:
+            return
+        if timing.get("load_event_end"):
+            page["load_event_end"] = timing["load_event_end"]
+            page["load_finished"] = True
+        else:
+            # load 事件仍未触发，记录下限
+            page["load_event_end"] = timing.get("now")
+
+    def ready_states(self) -> Tuple[str, ...]:
+        """视为加载完成的 readyState"""
+        return ("interactive", "complete") if self.lean else ("complete",)
+
+    def is_ready(self) -> bool:
+        try:
+            return self.driver.execute_script("return document.readyState") in self.ready_states()
+        except Exception:
+            return False
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """等待页面达到可操作状态"""
+        return bool(waits.until("page_ready", self.is_ready, timeout=timeout))
+
+    def settle(self):
+        """打开页面后的等待：lean 配置只等到可操作状态，默认配置保持原有的随机停顿"""
+        if self.lean:
+            self.wait_ready()
+        else:
+            waits.pause("page_open")
+
+    def print_report(self):
+        """打印每个页面比等待 load 事件提前的时间（仅 lean 配置）"""
+        if not self.lean or not self.pages:
+            return
+        self.collect()
+        print(f"\n{'=' * 60}")
+        print("页面加载统计（lean 配置）")
+        print(f"{'=' * 60}")
+        total_saved = 0.0
+        for page in self.pages:
+            load_end = page["load_event_end"]
+            if load_end is None:
+                saved_text = "未知"
+            else:
+                saved = max(0.0, (load_end - page["returned_at"]) / 1000)
+                total_saved += saved
+                saved_text = f"{saved:.2f}s" if page["load_finished"] else f"≥{saved:.2f}s"
+            print(f"{page['url'][:50]:<52}返回 {page['get_seconds']:.2f}s，"
+                  f"DOMContentLoaded {page['dom_content_loaded'] / 1000:.2f}s，节省 {saved_text}")
+        print(f"共 {len(self.pages)} 个页面，合计节省约 {total_saved:.2f} 秒（已屏蔽 {len(BLOCKED_URL_PATTERNS)} 类资源）")
+        print(f"{'=' * 60}")
@@ -0,0 +1,90 @@
+"""
+页面探测模块
+用一次小脚本调用检查页面上是否存在指定元素或文本，只返回布尔值，
+代替读取整个 page_source 做字符串查找；完整页面源码只在调试模式（settings.debug_dump_dir）下保存到文件
+"""
+import os
+import time
+from typing import Dict, List, Optional
+
+from profiler import profiled
+
+# 参数：{名称: CSS选择器}、要查找的文本列表；返回 {名称或文本: 是否存在}
+PROBE_SCRIPT = """
+var selectors = arguments[0] || {}, texts = arguments[1] || [];
+var result = {};
+for (var key in selectors) { result[key] = !!document.querySelector(selectors[key]); }
+for (var i = 0; i < texts.length; i++) { result[texts[i]] = false; }
+if (texts.length && document.body) {
+    var remaining = texts.length;
+    var walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT, null, false);
+    var node;
+    while (remaining && (node = walker.nextNode())) {
+        var tag = node.parentNode ? node.parentNode.nodeName : '';
+        if (tag === 'SCRIPT' || tag === 'STYLE') { continue; }
+        for (var i = 0; i < texts.length; i++) {
+            if (!result[texts[i]] && node.nodeValue.indexOf(texts[i]) >= 0) { result[texts[i]] = true; remaining--; }
+        }
+    }
+}
+return result;
+"""
+
+
+class PageProbe:
+    """页面探测类"""
+
+    def __init__(self, driver, dump_dir: Optional[str] = None):
+        self.driver = driver
+        self.dump_dir = dump_dir  # 调试模式下保存完整页面源码的目录
+        self.dumps = 0
+
+    @classmethod
+    def from_settings(cls, driver, settings: Dict) -> "PageProbe":
+        """根据 settings 中的 debug_dump_dir 创建，未配置时不保存页面源码"""
+        probe = cls(driver, settings.get("debug_dump_dir"))
+        if probe.debug:
+            print(f"已启用页面源码调试输出，保存目录: {probe.dump_dir}")
+        return probe
+
+    @property
+    def debug(self) -> bool:
+        return bool(self.dump_dir)
+
+    @profiled("locate")
+    def probe(self, selectors: Optional[Dict[str, str]] = None, texts: Optional[List[str]] = None) -> Dict[str, bool]:
+        """检查元素和文本是否存在；脚本失败时返回空字典"""
+        try:
+            return self.driver.execute_script(PROBE_SCRIPT, selectors or {}, list(texts or [])) or {}
+        except Exception as e:
+            print(f"页面探测失败: {e}")
+            return {}
+
+    def any_text(self, texts: List[str]) -> bool:
+        """页面上是否出现任一文本"""
+        found = self.probe(texts=texts)
+        return any(found.get(text) for text in texts)
+
+    def report(self, selectors: Optional[Dict[str, str]] = None, texts: Optional[List[str]] = None):
+        """打印探测结果，调试模式下同时保存完整页面源码"""
+        found = self.probe(selectors, texts)
+        for key in list(selectors or {}) + list(texts or []):
+            print(f"页面{'包含' if found.get(key) else '不包含'} '{key}'")
+
+    @profiled("record")
+    def dump(self, label: str) -> Optional[str]:
+        """调试模式下保存完整页面源码，返回文件路径；未启用或失败时返回 None"""
+        if not self.debug:
+            return None
+        try:
+            os.makedirs(self.dump_dir, exist_ok=True)
+            self.dumps += 1
+            path = os.path.join(self.dump_dir, f"{time.strftime('%Y%m%d_%H%M%S')}_{self.dumps:04d}_{label}.html")
+            source = self.driver.page_source
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(source)
+            print(f"已保存页面源码（{len(source)} 字符）: {path}")
+            return path
+        except Exception as e:
+            print(f"保存页面源码失败: {e}")
+            return None
@@ -0,0 +1,226 @@
+"""
+页面状态识别模块
+通过一次注入脚本识别北森当前显示的是哪个页面（进入试卷、目录、答题说明、练习、正式答题、题目、已完成）
+"""
+from typing import Any, Dict, List, Optional
+
+from profiler import profiled
+from question_text import QUESTION_TEXT_FUNCTION
+from wait_engine import waits
+
+# 页面状态
+LANDING = "landing"            # 进入试卷页
+OUTLINE = "outline"            # 试卷目录页（继续答题/去答题）
+INSTRUCTIONS = "instructions"  # 答题说明页（下一步）
+PRACTICE = "practice"          # 练习题页（下一步）
+FORMAL_START = "formal_start"  # 练习完成页（正式答题）
+QUESTION = "question"          # 正式题目页
+FINISHED = "finished"          # 测试已完成
+UNKNOWN = "unknown"            # 无法识别（通常是页面仍在加载）
+
+# 题目页的题型
+ADJECTIVE = "adjective"          # 形容词拖选（最符合/最不符合选框）
+SINGLE_CHOICE = "single_choice"  # 单选量表
+
+# 识别脚本：只读取可见元素，返回状态及用于调试的依据
+CLASSIFY_SCRIPT = """
+function visible(el) {
+    var rect = el.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden';
+}
+function visibleTexts(selector) {
+    var texts = [];
+    var nodes = document.querySelectorAll(selector);
+    for (var i = 0; i < nodes.length; i++) {
+        if (visible(nodes[i])) { texts.push((nodes[i].innerText || '').trim()); }
+    }
+    return texts;
+}
+function anyContains(texts, keywords) {
+    for (var i = 0; i < texts.length; i++) {
+        for (var j = 0; j < keywords.length; j++) {
+            if (texts[i].indexOf(keywords[j]) >= 0) { return true; }
+        }
+    }
+    return false;
+}
+function countVisible(selector) {
+    var count = 0;
+    var nodes = document.querySelectorAll(selector);
+    for (var i = 0; i < nodes.length; i++) { if (visible(nodes[i])) { count++; } }
+    return count;
+}
+
+var body = document.body ? (document.body.innerText || '') : '';
+var buttons = visibleTexts('.phoenix-button, button, a, input[type=button], input[type=submit]');
+var outline = visibleTexts("div[data-cls*='outline-part-item']");
+var adjectiveOptions = countVisible("div[data-cls='tuozhuai-content'] span[class*='I6Yvw']");
+var singleOptions = countVisible("div[class*='-5frG']");
+var state = 'unknown';
+
+if (document.readyState === 'loading' || !document.body) {
+    state = 'unknown';
+} else if (anyContains(buttons, ['进入试卷'])) {
+    state = 'landing';
+} else if (anyContains(outline, ['继续答题', '去答题'])) {
+    state = 'outline';
+} else if (anyContains(buttons, ['正式答题', '正式答題'])) {
+    state = 'formal_start';
+} else if (anyContains(buttons, ['下一步', 'Next']) && body.indexOf('练习') >= 0) {
+    state = 'practice';
+} else if (adjectiveOptions > 0 || singleOptions > 0) {
+    state = 'question';
+} else if (anyContains(buttons, ['下一步', 'Next'])) {
+    state = 'instructions';
+} else if (/测试完成|答题结束|已完成作答|提交成功|感谢您的参与/.test(body)) {
+    state = 'finished';
+}
+
+// 页面内容指纹：同一状态的页面重复出现（多页说明、多道练习题）时用于判断页面已经更新，
+// 去掉数字以忽略倒计时
+var content = location.href + '|' + body.replace(/[0-9]+/g, '');
+var hash = 5381;
+for (var i = 0; i < content.length; i++) {
+    hash = ((hash << 5) + hash + content.charCodeAt(i)) | 0;
+}
+
+return {
+    state: state,
+    fingerprint: (hash >>> 0).toString(16),
+    adjective_options: adjectiveOptions,
+    single_choice_options: singleOptions,
+    buttons: buttons.slice(0, 10)
+};
+"""
+
+# 题目页检测脚本：一次调用完成题目页判断、选项计数、题目文本提取和完成判断
+# 参数：选项选择器、题目页特征选择器、特征文本、题目文本选择器、题目文本最短长度、缓存的题目节点路径
+QUESTION_PAGE_SCRIPT = QUESTION_TEXT_FUNCTION + """
+var optionSelector = arguments[0], indicatorSelectors = arguments[1], indicatorTexts = arguments[2];
+var textSelectors = arguments[3], minLength = arguments[4], cachedPath = arguments[5];
+function visible(el) {
+    var rect = el.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden';
+}
+
+var options = [];
+var nodes = document.querySelectorAll(optionSelector);
+for (var i = 0; i < nodes.length; i++) { if (visible(nodes[i])) { options.push(nodes[i]); } }
+var optionCount = options.length;
+
+var indicator = optionCount > 0 ? optionSelector : null;
+for (var i = 0; !indicator && i < indicatorSelectors.length; i++) {
+    if (document.querySelector(indicatorSelectors[i])) { indicator = indicatorSelectors[i]; }
+}
+if (!indicator && document.body) {
+    // 等价于 //*[contains(text(), ...)]，但只遍历一次文本节点
+    var walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT, null, false);
+    var node;
+    while (!indicator && (node = walker.nextNode())) {
+        var tag = node.parentNode ? node.parentNode.nodeName : '';
+        if (tag === 'SCRIPT' || tag === 'STYLE') { continue; }
+        for (var j = 0; j < indicatorTexts.length; j++) {
+            if (node.nodeValue.indexOf(indicatorTexts[j]) >= 0) { indicator = 'text:' + indicatorTexts[j]; break; }
+        }
+    }
+}
+
+// 优先按结构定位（选项组上方最近的文本块），定位不到时按题目文本选择器查找
+var resolved = optionCount ? resolveQuestionText(options, cachedPath, minLength) : {text: '', path: null, cached: false};
+var questionText = resolved.text;
+for (var i = 0; indicator && !questionText && i < textSelectors.length; i++) {
+    var nodes = document.querySelectorAll(textSelectors[i]);
+    for (var j = 0; j < nodes.length; j++) {
+        var text = visible(nodes[j]) ? (nodes[j].innerText || '').trim() : '';
+        if (text.length > minLength) { questionText = text; break; }
+    }
+}
+
+var body = document.body ? (document.body.innerText || '') : '';
+return {
+    question_present: !!indicator,
+    option_count: optionCount,
+    question_text: questionText,
+    path: resolved.path,
+    cached: resolved.cached,
+    finished: !indicator && /测试完成|答题结束|已完成作答|提交成功|感谢您的参与/.test(body),
+    indicator: indicator
+};
+"""
+
+
+class PageStateClassifier:
+    """页面状态识别类"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    @profiled("locate")
+    def classify(self) -> Dict[str, Any]:
+        """识别当前页面，返回包含 state 字段的字典"""
+        try:
+            result = self.driver.execute_script(CLASSIFY_SCRIPT) or {}
+        except Exception as e:
+            print(f"识别页面状态失败: {e}")
+            result = {}
+        result.setdefault("state", UNKNOWN)
+        return result
+
+    @profiled("locate")
+    def question_page(self, option_selector: str, indicator_selectors: List[str], indicator_texts: List[str],
+                      text_selectors: List[str], min_text_length: int = 10,
+                      question_path: Optional[List[int]] = None) -> Dict[str, Any]:
+        """一次脚本调用检测题目页，返回 question_present / option_count / question_text / finished，
+        以及按结构定位到的题目节点路径 path（传入 question_path 时优先按该路径读取）"""
+        try:
+            result = self.driver.execute_script(
+                QUESTION_PAGE_SCRIPT, option_selector, indicator_selectors, indicator_texts,
+                text_selectors, min_text_length, question_path
+            ) or {}
+        except Exception as e:
+            print(f"检测题目页面失败: {e}")
+            result = {}
+        result.setdefault("question_present", False)
+        result.setdefault("option_count", 0)
+        result.setdefault("question_text", "")
+        result.setdefault("finished", False)
+        return result
+
+    def state(self) -> str:
+        """只返回页面状态"""
+        return self.classify()["state"]
+
+    @staticmethod
+    def question_type(result: Dict[str, Any]) -> Optional[str]:
+        """根据 classify() 的结果判断题型，不是题目页时返回 None"""
+        if result.get("state") != QUESTION:
+            return None
+        if result.get("adjective_options", 0) > 0:
+            return ADJECTIVE
+        if result.get("single_choice_options", 0) > 0:
+            return SINGLE_CHOICE
+        return None
+
+    def wait_for_state_change(self, previous: Optional[str], timeout: Optional[float] = None,
+                              poll_interval: Optional[float] = None,
+                              previous_fingerprint: Optional[str] = None) -> Dict[str, Any]:
+        """等待页面状态离开 previous 且不再是 unknown，超时返回最后一次识别结果；
+        传入 previous_fingerprint 时页面内容更新（状态相同的下一页）也立即返回。
+        上限和轮询间隔未指定时取具名等待 state_change 的配置"""
+        latest: Dict[str, Any] = {}
+
+        def changed() -> Optional[Dict[str, Any]]:
+            result = latest["result"] = self.classify()
+            if result["state"] not in (previous, UNKNOWN):
+                return result
+            if previous_fingerprint and result["state"] != UNKNOWN \
+                    and result.get("fingerprint") not in (None, previous_fingerprint):
+                return result
+            return None
+
+        return waits.until("state_change", changed, timeout=timeout, poll_interval=poll_interval) \
+            or latest.get("result") or self.classify()
@@ -0,0 +1,223 @@
+"""
+性能分析模块
+记录各阶段（导航、定位、文本提取、匹配、点击、等待）耗时，导出 Chrome trace-event 文件并打印汇总表
+"""
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class _NullPhase:
+    """未启用时使用的空阶段，不做任何记录"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """一次阶段计时"""
+
+    __slots__ = ("profiler", "category", "name", "start", "child_time")
+
+    def __init__(self, profiler: "Profiler", category: str, name: str):
+        self.profiler = profiler
+        self.category = category
+        self.name = name
+        self.start = 0.0
+        self.child_time = 0.0
+
+    def __enter__(self):
+        self.profiler._stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.profiler._finish(self, end)
+        return False
+
+
+class Profiler:
+    """阶段耗时分析类
+
+    未启用时 phase() 返回共享的空对象，@profiled 装饰的函数只多一次属性判断。
+    阶段可以嵌套，汇总表按自身耗时（扣除子阶段）统计，避免重复计算。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_file = "trace.json"
+        self.events: List[Dict[str, Any]] = []
+        # (类别, 名称) -> [调用次数, 总耗时, 自身耗时]
+        self.phase_totals: Dict[tuple, List[float]] = {}
+        # 题号 -> {类别: 自身耗时}
+        self.question_totals: Dict[int, Dict[str, float]] = {}
+        self.current_question: Optional[int] = None
+        self.finished = False
+        self._question_start = 0.0
+        self._origin = time.perf_counter()
+        self._stack: List[_Phase] = []
+
+    def enable(self, trace_file: Optional[str] = None):
+        """启用性能分析"""
+        self.enabled = True
+        if trace_file:
+            self.trace_file = trace_file
+        self.reset()
+
+    def configure(self, settings: Dict[str, Any]):
+        """根据 settings 中的 profile / trace_file 配置启用"""
+        if settings.get("profile", False):
+            self.enable(settings.get("trace_file", "trace.json"))
+            print(f"已启用性能分析，trace 文件: {self.trace_file}")
+
+    def reset(self):
+        """清空已记录的数据"""
+        self.events = []
+        self.phase_totals = {}
+        self.question_totals = {}
+        self.current_question = None
+        self.finished = False
+        self._origin = time.perf_counter()
+        self._stack = []
+
+    def phase(self, category: str, name: Optional[str] = None):
+        """返回阶段计时上下文"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, category, name or category)
+
+    def _finish(self, phase: _Phase, end: float):
+        """结束一个阶段并记录"""
+        if self._stack and self._stack[-1] is phase:
+            self._stack.pop()
+        duration = end - phase.start
+        self_time = duration - phase.child_time
+        if self._stack:
+            self._stack[-1].child_time += duration
+
+        totals = self.phase_totals.setdefault((phase.category, phase.name), [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += duration
+        totals[2] += self_time
+
+        if self.current_question is not None:
+            question = self.question_totals.setdefault(self.current_question, {})
+            question[phase.category] = question.get(phase.category, 0.0) + self_time
+
+        self.events.append({
+            "name": phase.name,
+            "cat": phase.category,
+            "ph": "X",
+            "ts": (phase.start - self._origin) * 1e6,
+            "dur": duration * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {"question": self.current_question} if self.current_question is not None else {},
+        })
+
+    def begin_question(self, question_num: int):
+        """开始统计一道题"""
+        if not self.enabled:
+            return
+        self.end_question()
+        self.current_question = question_num
+        self._question_start = time.perf_counter()
+
+    def end_question(self):
+        """结束当前题目的统计"""
+        if not self.enabled or self.current_question is None:
+            return
+        end = time.perf_counter()
+        question = self.question_totals.setdefault(self.current_question, {})
+        question["total"] = end - self._question_start
+        self.events.append({
+            "name": f"第 {self.current_question} 题",
+            "cat": "question",
+            "ph": "X",
+            "ts": (self._question_start - self._origin) * 1e6,
+            "dur": (end - self._question_start) * 1e6,
+            "pid": os.getpid(),
+            "tid": 0,
+            "args": {},
+        })
+        self.current_question = None
+
+    def export_trace(self, path: Optional[str] = None) -> Optional[str]:
+        """导出 Chrome trace-event JSON（可在 chrome://tracing 或 Perfetto 中打开）"""
+        if not self.enabled:
+            return None
+        path = path or self.trace_file
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+            print(f"已导出性能 trace 文件: {path}")
+            return path
+        except Exception as e:
+            print(f"导出性能 trace 文件失败: {e}")
+            return None
+
+    def print_summary(self):
+        """打印阶段耗时汇总表"""
+        if not self.enabled:
+            return
+        print(f"\n{'=' * 60}")
+        print("性能分析汇总（自身耗时，已扣除子阶段）")
+        print(f"{'=' * 60}")
+
+        category_totals: Dict[str, float] = {}
+        for (category, _), (_, _, self_time) in self.phase_totals.items():
+            category_totals[category] = category_totals.get(category, 0.0) + self_time
+        grand_total = sum(category_totals.values()) or 1.0
+        print(f"{'阶段':<12}{'耗时(秒)':>12}{'占比':>10}")
+        for category, seconds in sorted(category_totals.items(), key=lambda x: -x[1]):
+            print(f"{category:<12}{seconds:>12.2f}{seconds / grand_total * 100:>9.1f}%")
+
+        print(f"\n{'方法':<36}{'次数':>6}{'总耗时':>10}{'自身耗时':>10}")
+        rows = sorted(self.phase_totals.items(), key=lambda x: -x[1][2])
+        for (category, name), (count, total, self_time) in rows[:20]:
+            print(f"{(category + '/' + name)[:35]:<36}{int(count):>6}{total:>10.2f}{self_time:>10.2f}")
+
+        if self.question_totals:
+            totals = [q.get("total", 0.0) for q in self.question_totals.values() if "total" in q]
+            if totals:
+                print(f"\n共统计 {len(totals)} 道题，平均每题 {sum(totals) / len(totals):.2f} 秒，"
+                      f"最慢 {max(totals):.2f} 秒，最快 {min(totals):.2f} 秒")
+        print(f"{'=' * 60}")
+
+    def finish(self):
+        """结束统计，导出 trace 并打印汇总（重复调用只生效一次）"""
+        if not self.enabled or self.finished:
+            return
+        self.finished = True
+        self.end_question()
+        self.export_trace()
+        self.print_summary()
+
+
+# 全局分析器实例
+profiler = Profiler()
+
+
+def profiled(category: str, name: Optional[str] = None) -> Callable:
+    """阶段计时装饰器，未启用时直接调用原函数"""
+    def decorator(func: Callable) -> Callable:
+        phase_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with _Phase(profiler, category, phase_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,161 @@
+"""
+题目匹配模块
+基于字符二元组倒排索引的题库匹配，替代逐题线性扫描
+"""
+from typing import Dict, List, Optional, Set, Tuple
+
+# 答案类别的匹配优先级（与原线性扫描的顺序一致）
+ANSWER_PRIORITY = ["非常符合", "比较符合", "比较不符合", "非常不符合"]
+
+
+class QuestionMatcher:
+    """题库倒排索引匹配类
+
+    中文题目没有空格，``str.split()`` 无法切分关键词，因此按字符二元组建立倒排索引。
+    匹配规则与原实现保持一致，命中以下任一条件即视为匹配：
+
+    1. 页面题目是配置题目的子串
+    2. 配置题目是页面题目的子串
+    3. 配置题目按空白切分后，某个长度大于2的关键词出现在页面题目中
+
+    多个条目同时命中时，返回原扫描顺序中最靠前的条目（先按类别优先级，再按配置顺序）。
+    """
+
+    def __init__(self):
+        # 条目列表: (配置题目, 答案)，下标即扫描顺序
+        self.entries: List[Tuple[str, str]] = []
+        # 二元组 -> 包含该二元组的条目下标（升序）
+        self.postings: Dict[str, List[int]] = {}
+        # 条目的二元组集合，用于挑选锚点
+        self.entry_grams: List[Set[str]] = []
+        # 长度不足2、无法建立二元组的条目
+        self.short_entries: List[int] = []
+        # 关键词列表: (关键词, 所属条目下标)
+        self.keywords: List[Tuple[str, int]] = []
+        # 锚点索引: 每个条目/关键词只挂在其全局最稀有的二元组下，首次匹配时构建
+        self.entry_anchors: Optional[Dict[str, List[int]]] = None
+        self.keyword_anchors: Optional[Dict[str, List[int]]] = None
+
+    @staticmethod
+    def _grams(text: str) -> Set[str]:
+        """提取文本的字符二元组集合"""
+        return {text[i:i + 2] for i in range(len(text) - 1)}
+
+    @classmethod
+    def from_categories(cls, answer_categories: Dict[str, List[str]],
+                        answer_priority: Optional[List[str]] = None) -> "QuestionMatcher":
+        """根据分类存储结构构建索引"""
+        matcher = cls()
+        for answer_type in answer_priority or ANSWER_PRIORITY:
+            for config_question in answer_categories.get(answer_type, []):
+                matcher.add(config_question, answer_type)
+        matcher.build()
+        return matcher
+
+    @classmethod
+    def from_question_answers(cls, question_answers: List[Dict[str, str]]) -> "QuestionMatcher":
+        """根据旧格式的题目答案数组构建索引"""
+        matcher = cls()
+        for question_data in question_answers:
+            matcher.add(question_data.get('question_text', ''), question_data.get('answer', '非常不符合'))
+        matcher.build()
+        return matcher
+
+    def add(self, config_question: str, answer: str):
+        """按扫描顺序追加一个条目"""
+        if not config_question:
+            return
+
+        entry_id = len(self.entries)
+        self.entries.append((config_question, answer))
+
+        grams = self._grams(config_question)
+        self.entry_grams.append(grams)
+        if grams:
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(entry_id)
+        else:
+            self.short_entries.append(entry_id)
+
+        # 关键词长度大于2，必然至少包含一个二元组
+        for keyword in config_question.split():
+            if len(keyword) > 2:
+                self.keywords.append((keyword, entry_id))
+
+        self.entry_anchors = None
+        self.keyword_anchors = None
+
+    def build(self):
+        """构建锚点索引"""
+        def rarest(grams: Set[str]) -> str:
+            return min(grams, key=lambda gram: (len(self.postings.get(gram, ())), gram))
+
+        self.entry_anchors = {}
+        for entry_id, grams in enumerate(self.entry_grams):
+            if grams:
+                self.entry_anchors.setdefault(rarest(grams), []).append(entry_id)
+
+        self.keyword_anchors = {}
+        for keyword_id, (keyword, _) in enumerate(self.keywords):
+            self.keyword_anchors.setdefault(rarest(self._grams(keyword)), []).append(keyword_id)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def match(self, question_text: str) -> Optional[Tuple[str, str]]:
+        """查找匹配的条目，返回 (配置题目, 答案)，未命中返回 None"""
+        if not question_text or not self.entries:
+            return None
+
+        query_grams = self._grams(question_text)
+        if not query_grams:
+            # 单字题目无法走索引，退回线性判断
+            return self._linear_match(question_text)
+
+        if self.entry_anchors is None:
+            self.build()
+
+        best = None
+
+        # 条件1: 页面题目是配置题目的子串 -> 候选只需取页面题目最稀有二元组的倒排表
+        candidates = min((self.postings.get(gram, []) for gram in query_grams), key=len)
+        for entry_id in candidates:
+            if question_text in self.entries[entry_id][0]:
+                best = entry_id
+                break
+
+        # 条件2: 配置题目是页面题目的子串 -> 配置题目的锚点必然出现在页面题目中
+        for gram in query_grams:
+            for entry_id in self.entry_anchors.get(gram, ()):
+                if best is not None and entry_id >= best:
+                    break
+                if self.entries[entry_id][0] in question_text:
+                    best = entry_id
+                    break
+        for entry_id in self.short_entries:
+            if best is not None and entry_id >= best:
+                break
+            if self.entries[entry_id][0] in question_text:
+                best = entry_id
+                break
+
+        # 条件3: 关键词出现在页面题目中 -> 关键词的锚点必然出现在页面题目中
+        for gram in query_grams:
+            for keyword_id in self.keyword_anchors.get(gram, ()):
+                keyword, entry_id = self.keywords[keyword_id]
+                if best is not None and entry_id >= best:
+                    break
+                if keyword in question_text:
+                    best = entry_id
+                    break
+
+        return self.entries[best] if best is not None else None
+
+    def _linear_match(self, question_text: str) -> Optional[Tuple[str, str]]:
+        """线性匹配（仅用于无法提取二元组的极短题目）"""
+        for config_question, answer in self.entries:
+            if question_text in config_question or config_question in question_text:
+                return config_question, answer
+            if any(keyword in question_text for keyword in config_question.split() if len(keyword) > 2):
+                return config_question, answer
+        return None
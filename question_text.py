@@ -0,0 +1,123 @@
+"""
+题目文本提取模块
+按页面结构定位题目节点：从选项组向上逐层查找，取选项组上方最近的文本块，
+一次脚本调用完成，并缓存题目节点的路径（从 body 开始的子元素下标），后续题目直接按路径读取
+"""
+from typing import Any, Dict, List, Optional
+
+from profiler import profiled
+
+# 结构化定位函数，同时被 page_state.QUESTION_PAGE_SCRIPT 内嵌使用
+# options 为选项元素数组，cachedPath 为上次解析出的路径（可为 null），minLength 为题目文本最短长度
+QUESTION_TEXT_FUNCTION = """
+function resolveQuestionText(options, cachedPath, minLength) {
+    function shown(el) {
+        var rect = el.getBoundingClientRect();
+        if (rect.width === 0 || rect.height === 0) { return false; }
+        var style = window.getComputedStyle(el);
+        return style.display !== 'none' && style.visibility !== 'hidden';
+    }
+    function ownText(el) {
+        for (var i = 0; i < el.childNodes.length; i++) {
+            var child = el.childNodes[i];
+            if (child.nodeType === 3 && child.nodeValue.trim()) { return true; }
+        }
+        return false;
+    }
+    function pathOf(el) {
+        var path = [];
+        while (el && el !== document.body) {
+            var parent = el.parentElement;
+            if (!parent) { return null; }
+            path.unshift(Array.prototype.indexOf.call(parent.children, el));
+            el = parent;
+        }
+        return el === document.body ? path : null;
+    }
+    function byPath(path) {
+        var el = document.body;
+        for (var i = 0; el && i < path.length; i++) { el = el.children[path[i]]; }
+        return el || null;
+    }
+    function accept(el) {
+        // 题目节点必须可见、文本足够长，并且位于选项组之前且不包含选项
+        if (!el || !shown(el) || el.contains(options[0])) { return ''; }
+        if (!(el.compareDocumentPosition(options[0]) & Node.DOCUMENT_POSITION_FOLLOWING)) { return ''; }
+        var text = (el.innerText || '').trim();
+        return text.length > minLength ? text : '';
+    }
+
+    if (!options.length) { return {text: '', path: null, cached: false}; }
+    if (cachedPath) {
+        var text = accept(byPath(cachedPath));
+        if (text) { return {text: text, path: cachedPath, cached: true}; }
+    }
+
+    // 选项组：包含所有选项的最近公共祖先
+    var group = options[0].parentElement;
+    while (group && group !== document.body) {
+        var all = true;
+        for (var i = 1; i < options.length; i++) {
+            if (!group.contains(options[i])) { all = false; break; }
+        }
+        if (all) { break; }
+        group = group.parentElement;
+    }
+
+    // 从选项组逐层向上，在前面的兄弟节点中（由近及远）找最后一个带文本的块
+    for (var node = group; node && node !== document.body; node = node.parentElement) {
+        for (var sibling = node.previousElementSibling; sibling; sibling = sibling.previousElementSibling) {
+            var blocks = [sibling].concat(Array.prototype.slice.call(sibling.querySelectorAll('*')));
+            for (var k = blocks.length - 1; k >= 0; k--) {
+                if (!ownText(blocks[k])) { continue; }
+                var found = accept(blocks[k]);
+                if (found) { return {text: found, path: pathOf(blocks[k]), cached: false}; }
+            }
+        }
+    }
+    return {text: '', path: null, cached: false};
+}
+"""
+
+# 参数：选项选择器或选项元素数组、缓存路径、题目文本最短长度
+QUESTION_TEXT_SCRIPT = QUESTION_TEXT_FUNCTION + """
+var options = typeof arguments[0] === 'string'
+    ? Array.prototype.slice.call(document.querySelectorAll(arguments[0]))
+    : arguments[0];
+return resolveQuestionText(options, arguments[1], arguments[2]);
+"""
+
+
+class QuestionTextExtractor:
+    """题目文本提取类"""
+
+    def __init__(self, driver, min_length: int = 10):
+        self.driver = driver
+        self.min_length = min_length
+        self.path: Optional[List[int]] = None  # 缓存的题目节点路径
+        self.cache_hits = 0
+        self.resolves = 0
+
+    def remember(self, result: Dict[str, Any]):
+        """记录脚本返回的解析结果（也用于题目页检测脚本的返回值）"""
+        if result.get("cached"):
+            self.cache_hits += 1
+        elif result.get("path"):
+            if self.path != result["path"]:
+                print(f"题目节点路径: {result['path']}")
+            self.path = result["path"]
+            self.resolves += 1
+
+    @profiled("extract")
+    def extract(self, option_selector: Optional[str] = None, elements: Optional[List[Any]] = None) -> str:
+        """按结构定位题目文本，传入 find_question_elements 返回的选项元素或选项选择器；找不到时返回空字符串"""
+        options = elements if elements is not None else option_selector
+        if not options:
+            return ""
+        try:
+            result = self.driver.execute_script(QUESTION_TEXT_SCRIPT, options, self.path, self.min_length) or {}
+        except Exception as e:
+            print(f"按结构定位题目文本失败: {e}")
+            return ""
+        self.remember(result)
+        return result.get("text") or ""
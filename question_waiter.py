@@ -0,0 +1,137 @@
+"""
+题目切换检测模块
+通过题目指纹（题干文本哈希 + 选项标识）判断页面是否已切换到下一题，替代固定时长的等待
+"""
+import time
+from typing import Optional
+
+from element_cache import ElementCache
+from profiler import profiled
+from wait_engine import waits
+
+# 计算指纹的公共函数：选项所在题目块的文本哈希 + 各选项的标识
+# 没有找到选项时返回空字符串
+FINGERPRINT_FUNCTION = """
+function beisenFingerprint(selector) {
+    var options = document.querySelectorAll(selector);
+    if (!options.length) { return ''; }
+    var optionText = '';
+    var ids = [];
+    for (var i = 0; i < options.length; i++) {
+        var text = (options[i].innerText || '').trim();
+        optionText += text;
+        ids.push(options[i].id || options[i].getAttribute('data-id') || options[i].getAttribute('data-value') || text);
+    }
+    // 从选项向上查找第一个包含选项以外文本的祖先节点，视为题目块
+    var block = options[0].parentElement;
+    while (block && block.parentElement && (block.innerText || '').trim().length <= optionText.length) {
+        block = block.parentElement;
+    }
+    var source = (block ? block.innerText : '') + '|' + optionText;
+    var hash = 5381;
+    for (var j = 0; j < source.length; j++) {
+        hash = ((hash << 5) + hash + source.charCodeAt(j)) | 0;
+    }
+    return (hash >>> 0).toString(16) + ':' + ids.join(',');
+}
+"""
+
+FINGERPRINT_SCRIPT = FINGERPRINT_FUNCTION + "return beisenFingerprint(arguments[0]);"
+
+# 注入 MutationObserver，指纹变化（且新题目已渲染出选项）时立即回调，超时回调 null
+OBSERVER_SCRIPT = FINGERPRINT_FUNCTION + """
+var previous = arguments[0], selector = arguments[1], timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var current = beisenFingerprint(selector);
+if (current && current !== previous) { done(current); return; }
+var finished = false;
+var timer = null;
+var observer = new MutationObserver(function() {
+    if (finished) { return; }
+    var latest = beisenFingerprint(selector);
+    if (latest && latest !== previous) {
+        finished = true;
+        observer.disconnect();
+        clearTimeout(timer);
+        done(latest);
+    }
+});
+observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true, attributes: true});
+timer = setTimeout(function() {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    done(null);
+}, timeoutMs);
+"""
+
+
+class QuestionTransitionWaiter:
+    """题目切换等待类"""
+
+    def __init__(self, driver, option_selector: str, timeout: float = 10, poll_interval: Optional[float] = None):
+        self.driver = driver
+        self.option_selector = option_selector
+        self.timeout = timeout  # 等待上限（秒）
+        self.poll_interval = poll_interval  # 轮询间隔（秒），None 时取具名等待 question_change 的配置
+
+    @profiled("locate")
+    def fingerprint(self) -> str:
+        """获取当前题目指纹，页面上没有选项时返回空字符串"""
+        try:
+            return self.driver.execute_script(FINGERPRINT_SCRIPT, self.option_selector) or ""
+        except Exception as e:
+            print(f"获取题目指纹失败: {e}")
+            return ""
+
+    @profiled("wait")
+    def wait_for_change(self, previous: str, timeout: Optional[float] = None) -> Optional[str]:
+        """等待题目指纹变化，返回新指纹（同时清空上一题的元素缓存）；超时返回 None"""
+        current = self._wait_for_change(previous, timeout)
+        if current:
+            ElementCache.of(self.driver).begin_question(current)
+        return current
+
+    def _wait_for_change(self, previous: str, timeout: Optional[float]) -> Optional[str]:
+        """优先用页面监听等待指纹变化，监听中断时改为轮询"""
+        timeout = waits.scaled(self.timeout if timeout is None else timeout)
+        start = time.time()
+
+        # 优先使用页面内的 MutationObserver，一次调用即可在变化发生时返回
+        previous_script_timeout = None
+        try:
+            # 脚本超时是会话级设置，等待结束后恢复，避免影响其他异步脚本（如整组作答）
+            previous_script_timeout = self.driver.timeouts.script
+            self.driver.set_script_timeout(timeout + 5)
+            current = self.driver.execute_async_script(
+                OBSERVER_SCRIPT, previous, self.option_selector, int(timeout * 1000)
+            )
+            if current:
+                print(f"检测到题目切换，用时 {time.time() - start:.2f} 秒")
+                return current
+            if time.time() - start >= timeout:
+                print(f"等待题目切换超时 ({timeout} 秒)")
+                return None
+        except Exception as e:
+            # 整页跳转会中断脚本，改为轮询
+            print(f"页面监听中断，改为轮询检测: {e}")
+        finally:
+            if previous_script_timeout is not None:
+                try:
+                    self.driver.set_script_timeout(previous_script_timeout)
+                except Exception as e:
+                    print(f"恢复脚本超时失败: {e}")
+
+        def changed() -> Optional[str]:
+            current = self.fingerprint()
+            return current if current and current != previous else None
+
+        # 上限已按速度配置缩放，这里换算回未缩放的剩余时间
+        remaining = max(timeout - (time.time() - start), 0) / waits.ceiling_scale
+        current = waits.until("question_change", changed, timeout=remaining, poll_interval=self.poll_interval)
+        if current:
+            print(f"检测到题目切换，用时 {time.time() - start:.2f} 秒")
+            return current
+
+        print(f"等待题目切换超时 ({timeout} 秒)")
+        return None
@@ -0,0 +1,188 @@
+"""
+DOM快照回放工具
+把 snapshot_recorder 录制的页面逐个加载到驱动中，重新运行选项定位和答案匹配逻辑，
+与录制时的选择对比，用于衡量选择器或匹配逻辑改动的影响
+
+默认使用 FakeWebDriver，不启动浏览器；它不执行项目注入的脚本，形容词题（依赖快照脚本）会被跳过，
+单选题只走选择器回退路径。加 --browser 时在无头 Chrome 中加载页面，全部逻辑在真实 JS 引擎中运行
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from fake_webdriver import FakeWebDriver
+from snapshot_recorder import SnapshotRecorder
+
+# 回放结果分类
+SAME = "same"          # 与录制时一致
+CHANGED = "changed"    # 选择发生变化
+FIXED = "fixed"        # 录制时失败，现在成功
+BROKEN = "broken"      # 录制时成功，现在失败
+FAILED = "failed"      # 录制时和现在都失败
+SKIPPED = "skipped"    # 依赖注入脚本，假驱动无法回放
+
+
+class SnapshotReplayer:
+    """快照回放类"""
+
+    def __init__(self, adjective_config: str = "answers.json",
+                 single_choice_config: str = "single_choice_answers.json", driver=None):
+        self.adjective_config = adjective_config
+        self.single_choice_config = single_choice_config
+        self.driver = driver or FakeWebDriver()
+        # 假驱动不执行注入脚本
+        self.runs_scripts = not isinstance(self.driver, FakeWebDriver)
+        self.page_dir = tempfile.mkdtemp(prefix="beisen_replay_")
+        self.runners: Dict[str, Any] = {}
+
+    def runner(self, kind: str):
+        """按题型创建运行在当前驱动上的自动化实例（只创建一次）"""
+        if kind not in self.runners:
+            if kind == "adjective":
+                from adjective_test_automation import AdjectiveTestAutomation
+                automation = AdjectiveTestAutomation(self.adjective_config)
+                automation.attach_driver(self.driver)
+            elif kind == "single_choice":
+                from single_choice_main import SingleChoiceAutomation
+                automation = SingleChoiceAutomation(self.single_choice_config, driver=self.driver)
+            else:
+                raise ValueError(f"未知的题型: {kind}")
+            self.runners[kind] = automation
+        return self.runners[kind]
+
+    def decide(self, kind: str, question_num: int) -> Dict[str, Any]:
+        """在当前页面上重新运行定位和匹配逻辑，返回与录制格式相同的选择"""
+        automation = self.runner(kind)
+        if kind == "adjective":
+            plan = automation.plan_adjective_answer(question_num)
+            if not plan:
+                return {"failed": True}
+            page_texts, most_suitable, least_suitable = plan
+            return {"options": page_texts, "most": most_suitable[0], "least": least_suitable[0]}
+
+        question_text = automation.find_question_text()
+        answer = automation.find_matching_answer(question_text)
+        options = [automation.extract_option_text(element) for element in automation.find_question_elements()]
+        if answer not in options:
+            return {"failed": True, "question_text": question_text, "answer": answer}
+        return {"question_text": question_text, "answer": answer}
+
+    @staticmethod
+    def compare(recorded: Dict[str, Any], replayed: Dict[str, Any]) -> str:
+        """比较录制和回放的选择"""
+        recorded_failed = recorded.get("failed", False)
+        replayed_failed = replayed.get("failed", False)
+        if recorded_failed and replayed_failed:
+            return FAILED
+        if recorded_failed:
+            return FIXED
+        if replayed_failed:
+            return BROKEN
+        keys = [key for key in recorded if key != "failed"]
+        return SAME if all(recorded.get(key) == replayed.get(key) for key in keys) else CHANGED
+
+    def replay(self, path: str) -> Dict[str, Any]:
+        """回放一个快照文件"""
+        data = SnapshotRecorder.load(path)
+        if data["kind"] == "adjective" and not self.runs_scripts:
+            return {"file": path, "kind": data["kind"], "question": data["question"],
+                    "recorded": data["action"], "replayed": {}, "result": SKIPPED, "seconds": 0.0}
+        self.load_page(data["html"], data.get("url"))
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            replayed = self.decide(data["kind"], data["question"])
+        elapsed = time.perf_counter() - start
+        return {
+            "file": path,
+            "kind": data["kind"],
+            "question": data["question"],
+            "recorded": data["action"],
+            "replayed": replayed,
+            "result": self.compare(data["action"], replayed),
+            "seconds": elapsed,
+        }
+
+    def load_page(self, page: str, url: Optional[str]):
+        """加载录制的页面：假驱动直接解析，浏览器通过临时文件打开"""
+        if isinstance(self.driver, FakeWebDriver):
+            self.driver.load(page, url)
+            return
+        path = os.path.join(self.page_dir, "page.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(page)
+        self.driver.get("file://" + path)
+
+    def close(self):
+        """删除临时页面目录"""
+        shutil.rmtree(self.page_dir, ignore_errors=True)
+
+
+def print_report(results: List[Dict[str, Any]], verbose: bool):
+    """打印回放结果"""
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result["result"]] = counts.get(result["result"], 0) + 1
+        if verbose or result["result"] in (CHANGED, BROKEN, FIXED):
+            print(f"[{result['result']}] {result['file']}")
+            print(f"    录制: {json.dumps(result['recorded'], ensure_ascii=False)}")
+            print(f"    回放: {json.dumps(result['replayed'], ensure_ascii=False)}")
+
+    total_time = sum(result["seconds"] for result in results)
+    print(f"\n{'=' * 60}")
+    print(f"共回放 {len(results)} 个页面，耗时 {total_time:.3f} 秒"
+          f"（平均每页 {total_time / len(results) * 1000:.2f} 毫秒）" if results else "没有找到快照文件")
+    labels = {SAME: "一致", CHANGED: "选择变化", FIXED: "已修复", BROKEN: "新失败", FAILED: "仍失败",
+              SKIPPED: "已跳过（依赖注入脚本，用 --browser 回放）"}
+    for key, label in labels.items():
+        if counts.get(key):
+            print(f"  {label}: {counts[key]}")
+    print(f"{'=' * 60}")
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="回放录制的DOM快照，对比定位和匹配结果")
+    parser.add_argument("directory", help="快照目录（settings.record_dir）")
+    parser.add_argument("--adjective-config", default="answers.json", help="形容词题配置文件")
+    parser.add_argument("--single-choice-config", default="single_choice_answers.json", help="单选题配置文件")
+    parser.add_argument("--browser", action="store_true", help="在无头 Chrome 中回放（运行注入脚本）")
+    parser.add_argument("--verbose", action="store_true", help="显示每个页面的对比结果")
+    parser.add_argument("--output", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    driver = None
+    if args.browser:
+        from browser_session import BrowserSession
+        driver = BrowserSession.create({"headless": True}, page_load_timeout=30, implicit_wait=0)
+    replayer = SnapshotReplayer(args.adjective_config, args.single_choice_config, driver)
+    results = []
+    try:
+        for path in SnapshotRecorder.find_snapshots(args.directory):
+            try:
+                results.append(replayer.replay(path))
+            except Exception as e:
+                print(f"回放 {path} 失败: {e}")
+    finally:
+        replayer.close()
+        if driver is not None:
+            driver.quit()
+
+    print(f"驱动: {'无头 Chrome（注入脚本在浏览器中执行）' if args.browser else 'FakeWebDriver（不执行注入脚本）'}")
+    print_report(results, args.verbose)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到: {args.output}")
+
+    if any(result["result"] in (CHANGED, BROKEN) for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,14 +8,25 @@
 import json
 import time
 from typing import List, Dict, Any, Optional, Tuple
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from browser_session import BrowserSession
+from page_load import PageLoadProfile
+from network_question_source import NetworkQuestionSource
 from button_handler import ButtonHandler
+from dom_snapshot import DomSnapshot
+from question_matcher import QuestionMatcher
+from question_waiter import QuestionTransitionWaiter
+from page_state import PageStateClassifier
+from question_text import QuestionTextExtractor
+from command_counter import CommandCounter
+from locator_registry import LocatorRegistry
+from snapshot_recorder import SnapshotRecorder
+from checkpoint import Checkpoint
+from profiler import profiler, profiled
+from wait_engine import waits
 from utils import Utils
 from colorama import init, Fore, Style
 
@@ -25,16 +36,43 @@ init(autoreset=True)
 class SingleChoiceAutomation:
     """单选题自动化测试类"""
     
-    def __init__(self, config_file: str = "single_choice_answers.json"):
-        """初始化自动化测试"""
+    # 单选题选项选择器（实际有效的选择器）
+    OPTION_SELECTOR = "div[class*='-5frG']"
+    
+    # 题目页面特征：选择器和选项文本
+    QUESTION_INDICATORS = ["div[data-cls*='single-choice']", "div[class*='single-choice_item']"]
+    SCALE_TEXTS = ["非常不符合", "比较不符合", "比较符合", "非常符合"]
+    
+    # 题目文本选择器（按顺序尝试），题目文本通常比较长
+    QUESTION_TEXT_SELECTORS = [
+        "div[class*='question']",
+        "div[class*='title']",
+        "h1, h2, h3, h4, h5, h6",
+        "div[data-cls*='question']",
+        "div[data-cls*='title']"
+    ]
+    MIN_QUESTION_TEXT_LENGTH = 10
+    
+    def __init__(self, config_file: str = "single_choice_answers.json", driver=None):
+        """初始化自动化测试，传入 driver 时不再启动浏览器"""
         self.config_file = config_file
         self.driver = None
+        self.command_counter = None
         self.button_handler = None
+        self.transition_waiter = None
+        self.page_classifier = None
+        self.question_text_extractor = None
+        self.question_source = None
+        self.locators = None
         self.question_answers = []
         self.answer_categories = None
+        self.question_matcher = None  # 题库倒排索引，在 load_config 中构建
         self.default_answer = "非常不符合"
         self.settings = {}
+        self.test_url = ""
+        self.last_answer = {}  # 最近一道题的题目文本和答案，写入检查点
         self.wait_timeout = 10
+        self.lookup_timeout = 5
         
         # 未匹配问题记录功能
         self.unmatched_questions = []  # 存储未匹配的问题
@@ -42,9 +80,15 @@ class SingleChoiceAutomation:
         
         # 加载配置
         self.load_config()
+        waits.configure(self.settings)
+        self.recorder = SnapshotRecorder.from_settings(self.settings, "single_choice")
+        self.checkpoint = Checkpoint.from_settings(self.settings, "single_choice", self.test_url)
         
         # 设置浏览器选项
-        self.setup_driver()
+        if driver is not None:
+            self.attach_driver(driver)
+        else:
+            self.setup_driver()
     
     def load_config(self):
         """加载配置文件"""
@@ -58,6 +102,7 @@ class SingleChoiceAutomation:
                 self.default_answer = config.get('default_answer', '非常不符合')
                 # 计算总题目数
                 total_questions = sum(len(questions) for questions in self.answer_categories.values())
+                self.question_matcher = QuestionMatcher.from_categories(self.answer_categories)
                 print(f"{Fore.GREEN}成功加载新格式配置文件: {self.config_file}")
                 print(f"{Fore.CYAN}共加载 {total_questions} 道题目，分为 {len(self.answer_categories)} 个答案类别")
             else:
@@ -65,11 +110,15 @@ class SingleChoiceAutomation:
                 self.question_answers = config.get('question_answers', [])
                 self.answer_categories = None
                 self.default_answer = '非常不符合'
+                self.question_matcher = QuestionMatcher.from_question_answers(self.question_answers)
                 print(f"{Fore.GREEN}成功加载旧格式配置文件: {self.config_file}")
                 print(f"{Fore.CYAN}共加载 {len(self.question_answers)} 道题目")
             
             self.settings = config.get('settings', {})
+            self.test_url = config.get('test_url', '')
             self.wait_timeout = self.settings.get('wait_timeout', 10)
+            self.lookup_timeout = self.settings.get('lookup_timeout', self.settings.get('implicit_wait', 5))
+            self.locators = LocatorRegistry.shared(self.settings.get('locator_stats_file'))
             
         except FileNotFoundError:
             print(f"{Fore.RED}配置文件不存在: {self.config_file}")
@@ -84,23 +133,15 @@ class SingleChoiceAutomation:
     def setup_driver(self):
         """设置浏览器驱动"""
         try:
-            chrome_options = Options()
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
+            # 创建浏览器会话（配置了 debugger_address 时连接已打开的浏览器）
+            self.driver = BrowserSession.create(
+                self.settings,
+                page_load_timeout=self.settings.get('page_load_timeout', 30),
+                implicit_wait=self.settings.get('implicit_wait', 5)
+            )
             
-            # 设置页面加载超时
-            page_load_timeout = self.settings.get('page_load_timeout', 30)
-            implicit_wait = self.settings.get('implicit_wait', 5)
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.set_page_load_timeout(page_load_timeout)
-            self.driver.implicitly_wait(implicit_wait)
-            
-            # 初始化按钮处理器
-            self.button_handler = ButtonHandler(self.driver)
+            # 初始化依赖浏览器驱动的组件
+            self.attach_driver(self.driver)
             
             print(f"{Fore.GREEN}浏览器驱动初始化成功")
             
@@ -108,6 +149,33 @@ class SingleChoiceAutomation:
             print(f"{Fore.RED}浏览器驱动初始化失败: {e}")
             raise
     
+    def attach_driver(self, driver):
+        """使用已创建的浏览器驱动初始化按钮处理器等组件（也可以传入 FakeWebDriver 离线运行）"""
+        self.driver = driver
+        
+        # 统计WebDriver命令往返次数
+        self.command_counter = CommandCounter.install(driver, self.settings.get('command_budget'))
+        
+        # 初始化按钮处理器
+        self.button_handler = ButtonHandler(driver, {"locator_registry": self.locators, "lookup_timeout": self.lookup_timeout})
+        
+        # 初始化题目切换检测器
+        self.transition_waiter = QuestionTransitionWaiter(
+            driver,
+            self.OPTION_SELECTOR,
+            timeout=self.settings.get('transition_timeout', 10),
+            poll_interval=self.settings.get('transition_poll_interval')
+        )
+        
+        # 题目页检测（一次脚本调用）
+        self.page_classifier = PageStateClassifier(driver)
+        
+        # 按结构定位题目文本，缓存题目节点路径供后续题目使用
+        self.question_text_extractor = QuestionTextExtractor(driver, self.MIN_QUESTION_TEXT_LENGTH)
+        
+        # 网络题目数据（未启用时 question_text 直接返回 None）
+        self.question_source = NetworkQuestionSource.of(driver)
+    
     def navigate_to_test_area(self) -> bool:
         """导航到测试区域"""
         if not self.button_handler:
@@ -116,34 +184,31 @@ class SingleChoiceAutomation:
         
         return self.button_handler.navigate_to_test_area()
     
+    @profiled("locate")
     def find_question_elements(self) -> List[Any]:
         """查找单选题选项元素"""
         try:
             print("正在查找单选题选项...")
             
-            # 等待页面加载
-            time.sleep(2)
-            
             # 根据实际测试结果优化选择器
             option_selectors = [
-                "div[class*='-5frG']",  # 实际有效的选择器
+                self.OPTION_SELECTOR,  # 实际有效的选择器
                 # 以下选择器暂时注释，根据测试结果它们无效
                 # "div[data-cls*='single-choice'] div[class*='single-choice_item']",  # 根据截图的class结构
                 # "div[class*='single-choice_item']",  # 根据截图的class
                 # "div[data-cls*='single-choice item']",  # 根据截图的data-cls
             ]
             
-            for selector in option_selectors:
-                try:
-                    items = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    print(f"选择器 {selector} 找到 {len(items)} 个元素")
-                    
-                    if items:
-                        print(f"找到 {len(items)} 个单选题选项")
-                        return items
-                except Exception as e:
-                    print(f"选择器 {selector} 查找失败: {e}")
-                    continue
+            def find_options(selector: str) -> List[Any]:
+                # 选项是预期存在的元素，显式等待模式下最多等待 lookup_timeout 秒
+                items = Utils.find_elements(self.driver, selector, timeout=self.lookup_timeout)
+                print(f"选择器 {selector} 找到 {len(items)} 个元素")
+                return items
+            
+            _, items = self.locators.find_first("single_choice_option", option_selectors, find_options)
+            if items:
+                print(f"找到 {len(items)} 个单选题选项")
+                return items
             
             print("未找到单选题选项元素")
             return []
@@ -152,6 +217,7 @@ class SingleChoiceAutomation:
             print(f"查找单选题选项失败: {e}")
             return []
     
+    @profiled("extract")
     def extract_option_text(self, element) -> str:
         """提取选项文本"""
         try:
@@ -163,7 +229,7 @@ class SingleChoiceAutomation:
                 return text
             
             # 尝试从子元素获取文本
-            text_elements = element.find_elements(By.CSS_SELECTOR, "span, div, p, label")
+            text_elements = Utils.find_elements(element, "span, div, p, label", timeout=0)
             print(f"找到 {len(text_elements)} 个子元素")
             
             for i, text_elem in enumerate(text_elements):
@@ -191,13 +257,14 @@ class SingleChoiceAutomation:
             print(f"提取选项文本失败: {e}")
             return ""
     
+    @profiled("locate")
     def find_confirm_button(self) -> Optional[Any]:
         """查找确定按钮"""
         try:
             print("正在查找确定按钮...")
             
-            # 等待一下，让按钮完全加载
-            time.sleep(1)
+            # 等待按钮渲染出来（已存在时立即继续）
+            waits.until("confirm_ready", lambda: self.driver.find_elements(By.CSS_SELECTOR, "div[class*='phoenix-button']"))
             
             # 根据之前的经验，确定按钮的选择器
             confirm_selectors = [
@@ -213,28 +280,24 @@ class SingleChoiceAutomation:
                 "div:contains('下一步')"
             ]
             
-            for selector in confirm_selectors:
-                try:
-                    if ":contains" in selector:
-                        # 使用XPath查找包含文本的元素
-                        text = selector.split("'")[1]  # 提取文本内容
-                        xpath = f"//*[contains(text(), '{text}')]"
-                        elements = self.driver.find_elements(By.XPATH, xpath)
-                        if elements:
-                            confirm_button = elements[0]
-                            print(f"找到确定按钮: {xpath}")
-                            return confirm_button
-                    else:
-                        confirm_button = Utils.wait_for_element(self.driver, selector, timeout=2)
-                        if confirm_button:
-                            print(f"找到确定按钮: {selector}")
-                            return confirm_button
-                except:
-                    continue
+            def find_confirm(selector: str) -> Optional[Any]:
+                if ":contains" in selector:
+                    # 使用XPath查找包含文本的元素
+                    text = selector.split("'")[1]  # 提取文本内容
+                    xpath = f"//*[contains(text(), '{text}')]"
+                    elements = Utils.find_elements(self.driver, xpath, timeout=0, by=By.XPATH)
+                    return elements[0] if elements else None
+                return Utils.wait_for_element(self.driver, selector, timeout=2)
+            
+            # 按学习到的顺序尝试，上次命中的选择器最先尝试
+            selector, confirm_button = self.locators.find_first("confirm", confirm_selectors, find_confirm)
+            if confirm_button:
+                print(f"找到确定按钮: {selector}")
+                return confirm_button
             
             # 尝试查找所有包含"确定"文本的元素
             try:
-                all_elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), '确定')]")
+                all_elements = Utils.find_elements(self.driver, "//*[contains(text(), '确定')]", timeout=0, by=By.XPATH)
                 if all_elements:
                     confirm_button = all_elements[0]
                     print(f"通过XPath找到确定按钮")
@@ -249,6 +312,7 @@ class SingleChoiceAutomation:
             print(f"查找确定按钮失败: {e}")
             return None
     
+    @profiled("click")
     def click_confirm_button(self) -> bool:
         """点击确定按钮"""
         try:
@@ -256,11 +320,17 @@ class SingleChoiceAutomation:
             if not confirm_button:
                 return False
             
+            def left_page() -> bool:
+                try:
+                    return not confirm_button.is_displayed()
+                except StaleElementReferenceException:
+                    return True
+            
             # 点击确定按钮
             try:
                 confirm_button.click()
                 print("成功点击确定按钮")
-                time.sleep(2)  # 等待页面跳转
+                waits.until("confirm_navigation", left_page)  # 等待页面跳转
                 return True
             except Exception as e:
                 print(f"点击确定按钮失败: {e}")
@@ -268,7 +338,7 @@ class SingleChoiceAutomation:
                 try:
                     self.driver.execute_script("arguments[0].click();", confirm_button)
                     print("使用JavaScript成功点击确定按钮")
-                    time.sleep(2)
+                    waits.until("confirm_navigation", left_page)
                     return True
                 except Exception as e2:
                     print(f"JavaScript点击确定按钮也失败: {e2}")
@@ -278,24 +348,23 @@ class SingleChoiceAutomation:
             print(f"点击确定按钮失败: {e}")
             return False
     
+    @profiled("extract")
     def find_question_text(self) -> str:
         """查找当前题目的文本"""
         try:
-            # 尝试多种选择器查找题目文本
-            question_selectors = [
-                "div[class*='question']",
-                "div[class*='title']",
-                "h1, h2, h3, h4, h5, h6",
-                "div[data-cls*='question']",
-                "div[data-cls*='title']"
-            ]
+            # 按结构定位：选项组上方最近的文本块（一次脚本调用，路径会被缓存）
+            text = self.question_text_extractor.extract(option_selector=self.OPTION_SELECTOR)
+            if text:
+                print(f"找到题目文本: {text}")
+                return text
             
-            for selector in question_selectors:
+            # 尝试多种选择器查找题目文本
+            for selector in self.QUESTION_TEXT_SELECTORS:
                 try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    elements = Utils.find_elements(self.driver, selector, timeout=0)
                     for element in elements:
                         text = element.text.strip()
-                        if text and len(text) > 10:  # 题目文本通常比较长
+                        if len(text) > self.MIN_QUESTION_TEXT_LENGTH:
                             print(f"找到题目文本: {text}")
                             return text
                 except:
@@ -308,6 +377,40 @@ class SingleChoiceAutomation:
             print(f"查找题目文本失败: {e}")
             return ""
     
+    def read_question_text(self, question_num: int, detected_text: str = "") -> str:
+        """读取当前题目文本：题目页检测脚本已读到文本时只用网络数据核对（不一致时以页面文本为准），
+        还没有读到时才按顺序使用网络数据，最后回退到 DOM 抓取"""
+        text = self.question_source.question_text(question_num, detected_text) if self.question_source else None
+        if text:
+            print(f"从网络数据读取题目文本: {text}")
+            return text
+        if detected_text:
+            print(f"找到题目文本: {detected_text}")
+            return detected_text
+        return self.find_question_text()
+    
+    def answer_current_question(self, question_num: int, detected_text: str = "") -> bool:
+        """回答当前页面上的题目：读取题目文本、匹配答案、录制快照并选择答案"""
+        # 查找当前题目文本（启用网络数据时无需等待题目渲染）
+        current_question_text = self.read_question_text(question_num, detected_text)
+        print(f"当前题目: {current_question_text}")
+        
+        # 根据题目文本查找匹配的答案（恢复时检查点中已有的题目直接使用记录的答案）
+        answered = self.checkpoint.find("question_text", current_question_text) if self.checkpoint.resuming else None
+        if answered:
+            target_answer = answered["answer"]
+            print(f"使用检查点中的答案: {target_answer}")
+        else:
+            target_answer = self.find_matching_answer(current_question_text)
+            print(f"匹配的答案: {target_answer}")
+        
+        # 录制页面快照和选择结果（未启用时不做任何事）
+        self.last_answer = {"question_text": current_question_text, "answer": target_answer}
+        self.recorder.record(self.driver, question_num, self.last_answer)
+        
+        return self.answer_single_choice_question(question_num, target_answer)
+    
+    @profiled("match")
     def find_matching_answer(self, question_text: str) -> str:
         """根据题目文本查找匹配的答案"""
         try:
@@ -334,24 +437,12 @@ class SingleChoiceAutomation:
     
     def _find_answer_by_categories(self, question_text: str) -> str:
         """使用新的分类存储结构查找答案"""
-        # 按优先级顺序检查答案类别（可以根据需要调整优先级）
-        answer_priority = ["非常符合", "比较符合", "比较不符合", "非常不符合"]
-        
-        for answer_type in answer_priority:
-            if answer_type in self.answer_categories:
-                questions = self.answer_categories[answer_type]
-                for config_question in questions:
-                    # 完全匹配
-                    if config_question and question_text in config_question:
-                        print(f"找到匹配的题目配置 ({answer_type}): {config_question}")
-                        return answer_type
-                    elif config_question and config_question in question_text:
-                        print(f"找到匹配的题目配置 ({answer_type}): {config_question}")
-                        return answer_type
-                    # 关键词匹配
-                    elif config_question and any(keyword in question_text for keyword in config_question.split() if len(keyword) > 2):
-                        print(f"通过关键词找到匹配的题目配置 ({answer_type}): {config_question}")
-                        return answer_type
+        # 倒排索引内部已按 非常符合 → 非常不符合 的优先级排列
+        match = self.question_matcher.match(question_text)
+        if match:
+            config_question, answer_type = match
+            print(f"找到匹配的题目配置 ({answer_type}): {config_question}")
+            return answer_type
         
         # 记录未匹配的问题
         self._record_unmatched_question(question_text)
@@ -360,22 +451,11 @@ class SingleChoiceAutomation:
     
     def _find_answer_by_old_format(self, question_text: str) -> str:
         """使用旧格式查找答案（兼容性方法）"""
-        # 在配置中查找匹配的题目
-        for i, question_data in enumerate(self.question_answers):
-            config_question = question_data.get('question_text', '')
-            print(f"配置题目 {i+1}: {config_question}")
-            
-            # 尝试多种匹配方式
-            if config_question and question_text in config_question:
-                print(f"找到匹配的题目配置: {config_question}")
-                return question_data.get('answer', '非常不符合')
-            elif config_question and config_question in question_text:
-                print(f"找到匹配的题目配置: {config_question}")
-                return question_data.get('answer', '非常不符合')
-            # 尝试关键词匹配
-            elif config_question and any(keyword in question_text for keyword in config_question.split() if len(keyword) > 2):
-                print(f"通过关键词找到匹配的题目配置: {config_question}")
-                return question_data.get('answer', '非常不符合')
+        match = self.question_matcher.match(question_text)
+        if match:
+            config_question, answer = match
+            print(f"找到匹配的题目配置: {config_question}")
+            return answer
         
         # 记录未匹配的问题
         self._record_unmatched_question(question_text)
@@ -474,6 +554,7 @@ class SingleChoiceAutomation:
         except Exception as e:
             print(f"{Fore.RED}显示未匹配问题统计失败: {e}")
 
+    @profiled("answer")
     def answer_single_choice_question(self, question_num: int, target_answer: str) -> bool:
         """回答一道单选题"""
         try:
@@ -486,15 +567,9 @@ class SingleChoiceAutomation:
                 print(f"未找到第 {question_num} 题的选项元素")
                 return False
             
-            # 提取页面上的选项
-            page_options = []
-            for i, elem in enumerate(elements):
-                text = self.extract_option_text(elem)
-                print(f"元素 {i}: 文本='{text}'")
-                if text:
-                    page_options.append((text, elem))
-                else:
-                    print(f"元素 {i} 文本为空，跳过")
+            # 一次脚本调用提取页面上的选项
+            snapshot = DomSnapshot.snapshot_options(self.driver, elements=elements)
+            page_options = DomSnapshot.text_pairs(snapshot)
             
             print(f"提取到的选项: {[opt[0] for opt in page_options]}")
             
@@ -519,21 +594,18 @@ class SingleChoiceAutomation:
                 print(f"正在点击选项: {target_answer}")
                 target_element.click()
                 print(f"成功点击选项: {target_answer}")
-                time.sleep(1)
             except Exception as e:
                 print(f"点击选项失败: {e}")
                 # 尝试JavaScript点击
                 try:
                     self.driver.execute_script("arguments[0].click();", target_element)
                     print(f"使用JavaScript成功点击选项: {target_answer}")
-                    time.sleep(1)
                 except Exception as e2:
                     print(f"JavaScript点击选项也失败: {e2}")
                     return False
             
-            # 点击选项后自动跳转，无需点击确定按钮
+            # 点击选项后自动跳转，无需点击确定按钮，由 run_automation 等待题目切换
             print("选项已选择，等待自动跳转到下一题...")
-            time.sleep(2)  # 等待自动跳转
             
             print(f"第 {question_num} 题回答完成")
             return True
@@ -542,47 +614,34 @@ class SingleChoiceAutomation:
             print(f"回答第 {question_num} 题失败: {e}")
             return False
     
+    def detect_question_page(self) -> Dict[str, Any]:
+        """一次脚本调用识别当前页面：是否有题目、选项数量、题目文本以及测试是否已完成"""
+        page = self.page_classifier.question_page(
+            self.OPTION_SELECTOR,
+            self.QUESTION_INDICATORS,
+            self.SCALE_TEXTS,
+            self.QUESTION_TEXT_SELECTORS,
+            self.MIN_QUESTION_TEXT_LENGTH,
+            self.question_text_extractor.path
+        )
+        self.question_text_extractor.remember(page)
+        return page
+    
     def is_question_page(self) -> bool:
         """检查当前页面是否为题目页面"""
-        try:
-            # 检查页面是否包含单选题特征元素
-            question_indicators = [
-                "div[data-cls*='single-choice']",
-                "div[class*='single-choice_item']",
-                "非常不符合",
-                "比较不符合",
-                "比较符合",
-                "非常符合"
-            ]
-            
-            for indicator in question_indicators:
-                try:
-                    if ":contains" in indicator or any(text in indicator for text in ["非常不符合", "比较不符合", "比较符合", "非常符合"]):
-                        # 使用XPath查找包含文本的元素
-                        xpath = f"//*[contains(text(), '{indicator}')]"
-                        elements = self.driver.find_elements(By.XPATH, xpath)
-                        if elements:
-                            print(f"检测到题目页面特征元素: {xpath}")
-                            return True
-                    else:
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, indicator)
-                        if elements:
-                            print(f"检测到题目页面特征元素: {indicator}")
-                            return True
-                except:
-                    continue
-            
-            return False
-            
-        except Exception as e:
-            print(f"检查题目页面失败: {e}")
-            return False
+        page = self.detect_question_page()
+        if page["question_present"]:
+            print(f"检测到题目页面特征元素: {page.get('indicator')}")
+        return page["question_present"]
     
     def run_automation(self) -> bool:
         """运行自动化测试"""
         try:
             print("开始北森单选题自动化测试...")
             
+            # 根据配置启用性能分析
+            profiler.configure(self.settings)
+            
             # 打开测试URL
             test_url = self.settings.get('test_url') or 'https://your-test-url-here.com'
             
@@ -595,17 +654,26 @@ class SingleChoiceAutomation:
                 print(f"读取配置文件中的test_url失败: {e}")
                 pass
             
-            print(f"正在打开测试URL: {test_url}")
-            self.driver.get(test_url)
-            time.sleep(3)  # 等待页面加载
-            
-            # 导航到测试区域
-            if not self.navigate_to_test_area():
-                print("导航到测试区域失败")
-                return False
+            # 恢复模式下已经停在题目页时不再打开链接和导航
+            if not self.checkpoint.resume_here(self.page_classifier):
+                print(f"正在打开测试URL: {test_url}")
+                with profiler.phase("navigation", "open_test_page"):
+                    page_load = PageLoadProfile.of(self.driver)
+                    page_load.get(test_url)
+                    page_load.settle()  # 等待页面加载（lean 配置只等到页面可操作）
+                
+                # 导航到测试区域
+                with profiler.phase("navigation", "navigate_to_test_area"):
+                    navigated = self.navigate_to_test_area()
+                if not navigated:
+                    print("导航到测试区域失败")
+                    return False
             
-            # 开始答题
-            question_count = 0
+            # 开始答题（恢复时从检查点的下一题继续编号）
+            question_count = self.checkpoint.last_number
+            if self.checkpoint.resuming and self.question_source:
+                # 新会话捕获的网络数据不一定从第 1 题开始，恢复后只按题目内容匹配
+                self.question_source.positional = False
             
             # 计算最大题目数量（支持新旧格式）
             if hasattr(self, 'answer_categories') and self.answer_categories:
@@ -622,8 +690,14 @@ class SingleChoiceAutomation:
             max_no_question_attempts = 3  # 连续3次检测不到题目就停止
             
             while question_count < max_questions:
-                # 检查是否为题目页面
-                if not self.is_question_page():
+                # 一次脚本调用检查是否为题目页面，同时读取题目文本和完成状态
+                page = self.detect_question_page()
+                if not page["question_present"]:
+                    if page["finished"]:
+                        print(f"\n{Fore.GREEN}检测到测试已完成")
+                        self.checkpoint.finish()
+                        break
+                    
                     no_question_count += 1
                     print(f"未检测到题目页面... ({no_question_count}/{max_no_question_attempts})")
                     
@@ -632,7 +706,8 @@ class SingleChoiceAutomation:
                         print(f"{Fore.YELLOW}程序将停止自动答题，浏览器保持打开状态等待用户操作")
                         break
                     
-                    time.sleep(2)
+                    # 等待题目出现（出现后立即继续）
+                    waits.until("question_retry", self.is_question_page)
                     continue
                 
                 # 重置计数器
@@ -640,36 +715,43 @@ class SingleChoiceAutomation:
                 question_count += 1
                 print(f"\n{'='*60}")
                 print(f"当前进度: 第 {question_count} 题")
+                profiler.begin_question(question_count)
+                self.command_counter.begin_question(question_count)
                 
-                # 查找当前题目文本
-                current_question_text = self.find_question_text()
-                print(f"当前题目: {current_question_text}")
-                
-                # 根据题目文本查找匹配的答案
-                target_answer = self.find_matching_answer(current_question_text)
-                print(f"匹配的答案: {target_answer}")
+                # 记录答题前的题目指纹，用于检测题目切换
+                previous_fingerprint = self.transition_waiter.fingerprint()
                 
-                # 回答题目
-                if not self.answer_single_choice_question(question_count, target_answer):
+                # 读取题目、匹配答案并作答
+                if not self.answer_current_question(question_count, page["question_text"]):
                     print(f"第 {question_count} 题回答失败")
                     print(f"{Fore.YELLOW}程序将停止自动答题，浏览器保持打开状态等待用户操作")
                     break
                 
-                # 等待页面跳转到下一题
+                # 等待页面跳转到下一题（指纹变化即返回），并写入检查点
                 print("等待页面跳转到下一题...")
-                time.sleep(3)
+                next_fingerprint = self.transition_waiter.wait_for_change(previous_fingerprint)
+                self.checkpoint.record(question_count, previous_fingerprint, self.last_answer, next_fingerprint)
+            
+            # 答题结束，导出性能 trace 并打印汇总（未启用时不做任何事）
+            profiler.finish()
+            self.command_counter.print_report()
             
             if question_count >= max_questions:
                 print(f"\n{Fore.GREEN}已达到最大题目数量限制 ({max_questions})，停止答题")
             
             print(f"\n{Fore.GREEN}自动答题完成！共回答了 {question_count} 道题目")
+            
+            # 基准测试等无人值守场景不需要保持浏览器打开
+            if not self.settings.get('keep_browser_open', True):
+                return True
+            
             print(f"{Fore.CYAN}浏览器将保持打开状态，您可以手动进行后续操作")
             print(f"{Fore.CYAN}按 Ctrl+C 可退出程序并关闭浏览器")
             
             # 保持程序运行，等待用户操作
             try:
                 while True:
-                    time.sleep(1)
+                    waits.pause("keep_alive")
             except KeyboardInterrupt:
                 print(f"\n{Fore.YELLOW}用户选择退出程序")
                 return True
@@ -681,13 +763,17 @@ class SingleChoiceAutomation:
             return False
         
         finally:
+            profiler.finish()
+            
             # 保存未匹配问题并显示统计信息
             self._show_unmatched_summary()
             self.save_unmatched_questions()
             
+            if self.question_source:
+                self.question_source.print_report()
             if self.driver:
-                print("关闭浏览器...")
-                self.driver.quit()
+                PageLoadProfile.of(self.driver).print_report()
+            BrowserSession.release(self.driver)
 
 def main():
     """主函数"""
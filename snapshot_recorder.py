@@ -0,0 +1,67 @@
+"""
+DOM快照录制模块
+在答题循环中保存每道题的页面 HTML（gzip 压缩）和程序选择的答案，
+运行中途失败时可以用 replay_snapshots.py 离线复现，也可以用来衡量选择器和匹配逻辑改动的影响
+"""
+import glob
+import gzip
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from profiler import profiled
+
+
+class SnapshotRecorder:
+    """DOM快照录制类"""
+
+    def __init__(self, record_dir: Optional[str], kind: str):
+        self.enabled = bool(record_dir)
+        self.kind = kind  # adjective / single_choice
+        # 每次运行单独一个子目录，避免覆盖之前的录制
+        self.run_dir = os.path.join(record_dir, time.strftime("%Y%m%d_%H%M%S")) if record_dir else None
+        self.count = 0
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], kind: str) -> "SnapshotRecorder":
+        """根据 settings 中的 record_dir 创建，未配置时不录制"""
+        recorder = cls(settings.get("record_dir"), kind)
+        if recorder.enabled:
+            print(f"已启用DOM快照录制，保存目录: {recorder.run_dir}")
+        return recorder
+
+    @profiled("record")
+    def record(self, driver, question_num: int, action: Dict[str, Any]) -> Optional[str]:
+        """保存当前页面和选择的答案，返回文件路径；未启用或失败时返回 None"""
+        if not self.enabled:
+            return None
+        try:
+            os.makedirs(self.run_dir, exist_ok=True)
+            path = os.path.join(self.run_dir, f"{self.kind}_{question_num:04d}.json.gz")
+            data = {
+                "kind": self.kind,
+                "question": question_num,
+                "url": driver.current_url,
+                "timestamp": time.time(),
+                "action": action,
+                "html": driver.page_source,
+            }
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            self.count += 1
+            return path
+        except Exception as e:
+            print(f"保存DOM快照失败: {e}")
+            return None
+
+    @staticmethod
+    def load(path: str) -> Dict[str, Any]:
+        """读取一个快照文件"""
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def find_snapshots(directory: str) -> List[str]:
+        """递归查找目录下的全部快照文件，按路径排序（即按运行和题号排序）"""
+        return sorted(glob.glob(os.path.join(directory, "**", "*.json.gz"), recursive=True))
@@ -1,8 +1,6 @@
 """
 工具函数模块
 """
-import time
-import random
 import os
 import shutil
 import platform
@@ -11,25 +9,23 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from command_counter import CommandCounter
+from profiler import profiled
+from wait_engine import waits
 
 class Utils:
     """工具函数类"""
     
     @staticmethod
-    def random_delay(min_seconds: float = 0.5, max_seconds: float = 2.0):
-        """随机延迟，模拟人类操作"""
-        delay = random.uniform(min_seconds, max_seconds)
-        time.sleep(delay)
-    
-    @staticmethod
-    def safe_click(driver, element: WebElement, retry_count: int = 3):
-        """安全点击元素"""
+    @profiled("click")
+    def safe_click(driver, element: WebElement, retry_count: int = 3, raise_stale: bool = False):
+        """安全点击元素；raise_stale 为 True 时元素失效的异常交给调用方（由元素缓存重新定位后重试）"""
         for attempt in range(retry_count):
             try:
                 # 滚动到元素可见
                 driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                Utils.random_delay(0.5, 1.0)
+                waits.pause("after_scroll")
                 
                 # 等待元素可点击
                 WebDriverWait(driver, 5).until(EC.element_to_be_clickable(element))
@@ -37,39 +33,78 @@ class Utils:
                 # 点击元素
                 element.click()
                 return True
+            except StaleElementReferenceException as e:
+                # 元素已不在页面中，重试同一个句柄不会成功，交给调用方重新定位
+                print(f"点击失败，元素已失效: {e}")
+                if raise_stale:
+                    raise
+                return False
             except Exception as e:
                 print(f"点击失败，尝试 {attempt + 1}/{retry_count}: {e}")
                 if attempt < retry_count - 1:
-                    Utils.random_delay(1, 2)
+                    waits.pause("click_retry")
                 else:
                     return False
         return False
     
     @staticmethod
+    def is_gone(element: WebElement) -> bool:
+        """元素已从页面移除或不再显示（点击后页面已跳转或重新渲染），用作等待条件"""
+        try:
+            return not element.is_displayed()
+        except StaleElementReferenceException:
+            return True
+        except Exception:
+            return False
+    
+    @staticmethod
+    def has_text(element: WebElement, text: str) -> bool:
+        """元素文本中包含 text（例如形容词已放入选框），用作等待条件"""
+        try:
+            return text in (element.text or "")
+        except Exception:
+            return False
+    
+    @staticmethod
+    def find_elements(driver, selector: str, timeout: float = 0, by: str = By.CSS_SELECTOR) -> List[WebElement]:
+        """查找元素并明确等待上限：timeout 为 0 时只查一次；driver 设置了隐式等待时由隐式等待负责"""
+        if timeout <= 0 or getattr(driver, "implicit_wait_seconds", 0) > 0:
+            return driver.find_elements(by, selector)
+        # 带等待上限的查找不计为避免的隐式等待阻塞，实际等待时间单独统计
+        with CommandCounter.timed_lookup(driver):
+            return waits.until("lookup", lambda: driver.find_elements(by, selector), timeout=timeout) or []
+    
+    @staticmethod
+    @profiled("locate")
     def wait_for_element(driver, selector: str, timeout: int = 10) -> Optional[WebElement]:
         """等待元素出现"""
         try:
-            element = WebDriverWait(driver, timeout).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-            )
+            # WebDriverWait 每次轮询为空都会抛出 NoSuchElementException，按一次带上限的查找统计
+            with CommandCounter.timed_lookup(driver):
+                element = WebDriverWait(driver, timeout).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+                )
             return element
         except TimeoutException:
             print(f"等待元素超时: {selector}")
             return None
     
     @staticmethod
+    @profiled("locate")
     def wait_for_elements(driver, selector: str, timeout: int = 10) -> List[WebElement]:
         """等待多个元素出现"""
         try:
-            elements = WebDriverWait(driver, timeout).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-            )
+            with CommandCounter.timed_lookup(driver):
+                elements = WebDriverWait(driver, timeout).until(
+                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
+                )
             return elements
         except TimeoutException:
             print(f"等待元素超时: {selector}")
             return []
     
     @staticmethod
+    @profiled("locate")
     def find_element_by_text(driver, text: str, tag: str = "*") -> Optional[WebElement]:
         """根据文本内容查找元素"""
         try:
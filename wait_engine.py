@@ -0,0 +1,153 @@
+"""
+等待引擎模块
+所有停顿都是一个具名等待：有条件时轮询条件、条件满足立即返回、最长等到上限；
+没有可等待的条件时按范围随机停顿，模拟人类操作。
+settings.timing_profile（fast / normal / safe）统一缩放所有等待，无需修改代码即可调整速度
+"""
+import random
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from profiler import profiler
+
+FAST = "fast"
+NORMAL = "normal"
+SAFE = "safe"
+
+
+class WaitSpec(NamedTuple):
+    """具名等待的参数（秒）"""
+    low: float                 # 无条件停顿的最短时间
+    high: float                # 无条件停顿的最长时间
+    ceiling: Optional[float]   # 条件等待的上限，None 表示使用 settings.wait_time
+    poll: float                # 条件轮询间隔
+
+
+# 速度配置 -> (停顿缩放, 上限缩放)
+# fast 只缩短模拟人类的停顿，不缩短条件等待的上限，避免页面稍慢时提前放弃
+TIMING_PROFILES = {
+    FAST: (0.2, 1.0),
+    NORMAL: (1.0, 1.0),
+    SAFE: (1.5, 2.0),
+}
+
+# 默认值与原先散落在各处的固定和随机停顿保持一致；
+# 上限为 None 的等待都有可判断的条件（按钮消失、选框更新等），上限取 settings.wait_time
+WAITS: Dict[str, WaitSpec] = {
+    "page_open": WaitSpec(2.0, 4.0, 10.0, 0.1),          # 打开测试页面后
+    "page_ready": WaitSpec(0.0, 0.0, 10.0, 0.1),         # 等待 document.readyState
+    "dynamic_content": WaitSpec(0.0, 0.0, None, 0.2),    # 页面加载完成后等待页面状态可识别
+    "after_scroll": WaitSpec(0.5, 1.0, 1.0, 0.1),        # 滚动到元素后、点击前
+    "after_click": WaitSpec(0.0, 0.0, None, 0.2),        # 点击按钮后等待按钮消失（页面已响应）
+    "click_retry": WaitSpec(1.0, 2.0, 2.0, 0.2),         # 点击失败后重试前
+    "between_selections": WaitSpec(0.5, 1.0, 1.0, 0.1),  # 形容词和选框两次点击之间
+    "after_selection": WaitSpec(0.0, 0.0, None, 0.2),    # 点击选框后等待选框内出现该形容词
+    "after_answer": WaitSpec(0.0, 0.0, None, 0.2),       # 选择答案后等待选项被选中或页面跳转
+    "after_next": WaitSpec(0.0, 0.0, None, 0.2),         # 点击下一题后等待按钮消失或页面跳转
+    "after_submit": WaitSpec(3.0, 5.0, 10.0, 0.5),       # 点击提交后
+    "between_questions": WaitSpec(0.0, 0.0, None, 0.2),  # 两道题之间等待下一题的题目元素
+    "button_clickable": WaitSpec(0.0, 0.0, 10.0, 0.5),   # 等待按钮变为可点击
+    "lookup": WaitSpec(0.0, 0.0, 5.0, 0.1),              # 显式等待模式下查找预期存在的元素
+    "find_button": WaitSpec(0.0, 0.0, 0.0, 0.2),         # 按文本查找按钮的重试
+    "confirm_ready": WaitSpec(1.0, 1.0, 1.0, 0.1),       # 查找确定按钮前等待按钮渲染
+    "confirm_navigation": WaitSpec(2.0, 2.0, 2.0, 0.2),  # 点击确定按钮后等待按钮消失
+    "question_retry": WaitSpec(2.0, 2.0, 2.0, 0.5),      # 未检测到题目页面时重试前
+    "dismiss_modal": WaitSpec(0.0, 0.0, None, 0.2),      # 关闭对话框后等待对话框消失
+    "state_change": WaitSpec(0.0, 0.0, 10.0, 0.3),       # 等待页面状态或页面内容指纹变化
+    "question_change": WaitSpec(0.0, 0.0, 10.0, 0.2),    # 页面监听中断后轮询题目指纹变化
+    "keep_alive": WaitSpec(1.0, 1.0, 1.0, 1.0),          # 保持浏览器打开时的主循环
+}
+
+
+class WaitEngine:
+    """等待引擎类"""
+
+    def __init__(self, profile: str = NORMAL, wait_time: float = 3.0,
+                 overrides: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.profile = NORMAL
+        self.pause_scale = 1.0
+        self.ceiling_scale = 1.0
+        self.wait_time = wait_time
+        self.specs: Dict[str, WaitSpec] = dict(WAITS)
+        self.set_profile(profile)
+        self.override(overrides or {})
+
+    def configure(self, settings: Dict[str, Any]):
+        """根据 settings 中的 timing_profile / wait_time / waits 配置"""
+        self.specs = dict(WAITS)
+        self.wait_time = settings.get("wait_time", 3)
+        self.set_profile(settings.get("timing_profile", NORMAL))
+        self.override(settings.get("waits", {}))
+        if self.profile != NORMAL:
+            print(f"等待速度配置: {self.profile}（停顿 ×{self.pause_scale}，等待上限 ×{self.ceiling_scale}）")
+
+    def set_profile(self, profile: str):
+        """切换速度配置，未知的配置按 normal 处理"""
+        if profile not in TIMING_PROFILES:
+            print(f"未知的等待速度配置: {profile}，使用 {NORMAL}")
+            profile = NORMAL
+        self.profile = profile
+        self.pause_scale, self.ceiling_scale = TIMING_PROFILES[profile]
+
+    def override(self, overrides: Dict[str, Dict[str, Any]]):
+        """覆盖单个具名等待的参数，例如 {"after_next": {"low": 1, "high": 2}}"""
+        for name, values in overrides.items():
+            spec = self.specs.get(name)
+            if spec is None:
+                print(f"未知的等待名称: {name}")
+                continue
+            self.specs[name] = spec._replace(**{key: value for key, value in values.items() if key in WaitSpec._fields})
+
+    def spec(self, name: str) -> WaitSpec:
+        """获取具名等待的参数，未知名称按 after_click 处理"""
+        return self.specs.get(name) or self.specs["after_click"]
+
+    def ceiling(self, name: str, timeout: Optional[float] = None) -> float:
+        """条件等待的上限（已缩放）"""
+        spec = self.spec(name)
+        if timeout is None:
+            timeout = self.wait_time if spec.ceiling is None else spec.ceiling
+        return timeout * self.ceiling_scale
+
+    def scaled(self, timeout: float) -> float:
+        """按速度配置缩放调用方自行管理的等待上限（题目切换、页面状态识别等）"""
+        return timeout * self.ceiling_scale
+
+    def pause(self, name: str):
+        """没有可等待的条件时按范围随机停顿"""
+        spec = self.spec(name)
+        delay = random.uniform(spec.low, spec.high) * self.pause_scale
+        if delay <= 0:
+            return
+        with profiler.phase("sleep", name):
+            time.sleep(delay)
+
+    def until(self, name: str, condition: Callable[[], Any], timeout: Optional[float] = None,
+              poll_interval: Optional[float] = None) -> Any:
+        """轮询条件直到返回真值（返回该值）或达到上限（返回 None）；条件抛出的异常视为未满足"""
+        spec = self.spec(name)
+        interval = spec.poll if poll_interval is None else poll_interval
+        deadline = time.perf_counter() + self.ceiling(name, timeout)
+        with profiler.phase("wait", name):
+            while True:
+                try:
+                    result = condition()
+                    if result:
+                        return result
+                except Exception:
+                    pass
+                if time.perf_counter() >= deadline:
+                    return None
+                time.sleep(interval)
+
+    def wait(self, name: str, condition: Optional[Callable[[], Any]] = None,
+             timeout: Optional[float] = None) -> Any:
+        """具名等待：有条件时等待条件，没有条件时停顿"""
+        if condition is None:
+            self.pause(name)
+            return True
+        return self.until(name, condition, timeout)
+
+
+# 全局等待引擎实例
+waits = WaitEngine()